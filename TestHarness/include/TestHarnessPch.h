@@ -0,0 +1,18 @@
+/*
+ * The header precompiled for the test sources. (See "precompiled_header" in README.md)
+ * This includes the headers of "CppUTest/TestHarness.h" except "MemoryLeakWarningPlugin.h",
+ * which defines 'new' to detect the memory leaks. So, the sources including the standard
+ * headers (e.g. <vector>) before "CppUTest/TestHarness.h" are compiled with it as they are.
+ */
+#ifndef D_TestHarnessPch_h
+#define D_TestHarnessPch_h
+
+#include "CppUTest/CppUTestConfig.h"
+#include "CppUTest/Utest.h"
+#include "CppUTest/UtestMacros.h"
+#include "CppUTest/SimpleString.h"
+#include "CppUTest/TestResult.h"
+#include "CppUTest/TestFailure.h"
+#include "CppUTest/TestPlugin.h"
+
+#endif
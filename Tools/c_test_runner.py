@@ -1,14 +1,40 @@
 ''' This script runs the c code test.
 '''
 import os
+import re
 import sys
+import time
+import json
+import codecs
+import threading
+import fnmatch
+import argparse
+import dataclasses
+import tempfile
 import subprocess
-from c_test_runner_gui import CTestRunnerGui
-from c_test_runner_gui import RunTestParam
+from contextlib import nullcontext
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from c_test_runner_common import get_all_module_under_folder
+from c_test_runner_common import parse_cpputest_result
+from c_test_runner_common import merge_sharded_test_counts
 from c_test_runner_common import TEST_CODE_CONFIG_FILE
 from c_test_runner_common import TEST_HARNESS_CONFIG_FILE
-from py_module.timestamp_comp import TimestampComp
+from c_test_runner_common import DEFAULT_TEST_CODE_PATH
+from c_test_runner_common import DEFAULT_TEST_HARNESS_PATH
+from c_test_runner_common import DEFAULT_GLOBAL_CONFIG_PATH
+from c_test_runner_common import RunTestParam
+from c_test_runner_common import ModuleResult
+from c_test_runner_common import TestCounts
+from py_module.shard_plan import parse_test_list, plan_shards
+from py_module.junit_report import CaseResult, parse_junit_reports
+from py_module.result_history import ResultHistory
+from py_module.execution_cache import ExecutionCache, CachedExecution
+from py_module.impact_index import ImpactIndex
+from py_module.file_watcher import FileWatcher, create_file_watcher
+from py_module.build_trace import BuildTrace, trace_span
+from py_module.make_config import MakeConfigCache, get_shared_config_cache
 from py_module.make import MakeFile, ExecutableStatus, MakeConfigLoadError
 
 def get_harness_config_path(harness_path) -> str:
@@ -75,23 +101,297 @@ def execute_makefile_process(in_make_file:MakeFile, run_type_in:str):
     # Returns the status
     return is_exe_valid_tmp
 
+@dataclasses.dataclass
+class TestExecutionOption:
+    """ Option of execute_test_with_message
+    """
+    test_timeout:float     = 0     # Seconds a test is allowed to take. 0 means no timeout.
+    test_shards:int        = 1     # Processes the tests are split into. 0 means the cores.
+    collect_junit:bool     = False # True to read the results of the test cases from JUnit
+    # Seconds taken by the test cases before. The keys are 'group.name'. Used to split the tests.
+    durations:Optional[dict[str, float]] = None
+    # Cache of the result of the executable. None not to replay the result.
+    execution_cache:Optional[ExecutionCache] = None
+
+@dataclasses.dataclass
+class TestExecutionResult:
+    """ Result of execute_test_with_message
+    """
+    is_passed:bool         = False # True if the test passed (or the run type is 'Clear')
+    timed_out_test:str     = ''    # Test killed by the timeout. e.g. 'TEST(group, name)'
+    test_counts:Optional[TestCounts] = None # Counts in the result line of CppUTest
+    # Results of the test cases read from JUnit. Empty if not collected.
+    case_results:list[CaseResult] = dataclasses.field(default_factory = list)
+    is_cached:bool         = False # True if the result has been replayed from the cache
+
+# Line printed by CppUTest with '-v' when a test starts. e.g. 'TEST(LedDriver, TurnOn)'
+_TEST_START_PATTERN = re.compile(r'(?:IGNORE_)?TEST\(\w+, \w+\)')
+
+# Size of the chunk read from the pipe at once
+_READ_CHUNK_SIZE = 4096
+
+# A line longer than this is output before its end, so that the memory is bounded.
+_MAX_LINE_LENGTH = 64 * 1024
+
+# The result of the test which outputs more lines than this is not cached.
+_MAX_CACHED_OUTPUT_LINES = 100 * 1000
+
+class _TestWatchdog:
+    """ This class kills the test process if a test does not finish in the timeout.
+        The timer restarts whenever a test starts.
+    """
+    def __init__(self, process:subprocess.Popen, test_timeout:float):
+        self.__process = process
+        self.__test_timeout = test_timeout
+        self.__lock = threading.Lock()
+        self.__deadline = time.monotonic() + test_timeout
+        self.__current_test = ''
+        self.__timed_out_test = ''
+        self.__finished = threading.Event()
+        self.__thread = threading.Thread(target = self.__watch, daemon = True)
+
+    def start(self):
+        """ This function starts watching the process.
+        """
+        self.__thread.start()
+
+    def stop(self) -> str:
+        """ This function stops watching the process and returns the test killed by the timeout.
+            Returns empty string if the process has not been killed.
+        """
+        self.__finished.set()
+        self.__thread.join()
+        return self.__timed_out_test
+
+    def notify_test_start(self, test_name:str):
+        """ This function restarts the timer for the test started.
+        """
+        with self.__lock:
+            self.__current_test = test_name
+            self.__deadline = time.monotonic() + self.__test_timeout
+
+    def __watch(self):
+        while self.__finished.is_set() is False:
+            with self.__lock:
+                remaining = self.__deadline - time.monotonic()
+                if remaining <= 0:
+                    # Name the test, or the process if no test has started yet.
+                    self.__timed_out_test = self.__current_test or '(before the first test)'
+                    self.__process.kill()
+                    return
+            self.__finished.wait(min(remaining, 0.1))
+
+def stream_test_output(cmd:list[str], string_out = print, test_timeout:float = 0,
+                       cwd:Optional[str] = None) -> tuple[int, str, Optional[TestCounts]]:
+    """ This function executes the test and outputs its output line by line while it runs.
+        Only the line being output is kept in the memory.
+
+    Args:
+        cmd (list[str]): Command to execute the test
+        string_out: Function which outputs a line
+        test_timeout (float): Seconds a test is allowed to take. 0 means no timeout.
+                              'cmd' must make CppUTest print the test names (i.e. '-v').
+        cwd (Optional[str]): Directory where the test is executed. None means the current one.
+
+    Returns:
+        tuple[int, str, Optional[TestCounts]]:
+            [Exit code, test killed by the timeout or empty string, counts reported by CppUTest]
+    """
+    # stderr is sent to the same pipe as stdout, so that the messages keep their order.
+    with subprocess.Popen(cmd, stdout = subprocess.PIPE, stderr = subprocess.STDOUT,
+                          cwd = cwd) as process:
+        watchdog = None
+        if test_timeout > 0:
+            watchdog = _TestWatchdog(process, test_timeout)
+            watchdog.start()
+
+        decoder = codecs.getincrementaldecoder('utf-8')(errors = 'replace')
+        pending_line = ''
+        # End of the last test name found in 'pending_line'
+        notified_end = 0
+        test_counts = None
+
+        def output_line(line:str):
+            nonlocal test_counts
+            string_out(line)
+            line_counts = parse_cpputest_result([line])
+            if line_counts is not None:
+                test_counts = line_counts
+
+        while True:
+            chunk = process.stdout.read1(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending_line += decoder.decode(chunk)
+
+            if watchdog is not None:
+                # CppUTest prints the name when a test starts, and the line ends when the test
+                # finishes. Thus, the name is searched also in the line not finished yet.
+                for test_start in _TEST_START_PATTERN.finditer(pending_line):
+                    if test_start.end() > notified_end:
+                        watchdog.notify_test_start(test_start.group(0))
+                        notified_end = test_start.end()
+
+            *lines, last_line = pending_line.split('\n')
+            notified_end = max(0, notified_end - (len(pending_line) - len(last_line)))
+            pending_line = last_line
+            if len(pending_line) > _MAX_LINE_LENGTH:
+                lines.append(pending_line)
+                pending_line = ''
+                notified_end = 0
+            for line in lines:
+                output_line(line.rstrip('\r'))
+
+        pending_line += decoder.decode(b'', final = True)
+        if pending_line != '':
+            output_line(pending_line.rstrip('\r'))
+
+        process.wait()
+        timed_out_test = watchdog.stop() if watchdog is not None else ''
+
+    return (process.returncode, timed_out_test, test_counts)
+
+def get_test_shard_count(test_shards:int) -> int:
+    """ This function returns the number of the processes a test executable is split into.
+    """
+    if test_shards > 0:
+        return test_shards
+
+    # Not specified, then use all the cores.
+    return os.cpu_count() or 1
+
+def get_junit_directory(target_path:str, collect_junit:bool):
+    """ This function returns the context of the temporary directory where the executable is
+        executed to write the JUnit reports. CppUTest writes them into the current directory.
+        The context gives None if the reports are not collected.
+
+    Args:
+        target_path (str): Path to the executable
+        collect_junit (bool): True if the JUnit reports are collected
+    """
+    if collect_junit is False:
+        return nullcontext(None)
+    return tempfile.TemporaryDirectory(prefix = 'junit_',
+                                       dir = os.path.dirname(os.path.abspath(target_path)))
+
+def execute_sharded_test(cmd:list[str], shard_count:int, string_out = print,
+                         option:Optional[TestExecutionOption] = None) \
+        -> Optional[TestExecutionResult]:
+    """ This function splits the tests of the executable into shards, and executes the shards
+        in parallel processes. The output of each shard is output at once when all the shards
+        have finished, then the merged result is output.
+
+    Args:
+        cmd (list[str]): Command to execute the test
+        shard_count (int): The maximum number of the shards
+        option (TestExecutionOption): Option of the execution
+
+    Returns:
+        Optional[TestExecutionResult]: Merged result of the shards.
+                                       None if the tests cannot be split.
+    """
+    if option is None:
+        option = TestExecutionOption()
+
+    # List the tests in the executable. e.g. 'LedDriver.LedOff LedDriver.LedOn'
+    try:
+        list_process = subprocess.run([cmd[0], '-ln'], stdout = subprocess.PIPE,
+                                      stderr = subprocess.DEVNULL, check = True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    shards = plan_shards(parse_test_list(list_process.stdout.decode(errors = 'replace')),
+                         shard_count, option.durations)
+    if len(shards) <= 1:
+        return None
+
+    def execute_shard(shard_cmd:list[str]) \
+            -> tuple[int, str, Optional[TestCounts], list[str], list[CaseResult]]:
+        messages:list[str] = []
+        with get_junit_directory(cmd[0], option.collect_junit) as junit_dir:
+            stream_result = stream_test_output(shard_cmd, messages.append, option.test_timeout,
+                                               cwd = junit_dir)
+            case_results = parse_junit_reports(junit_dir) if junit_dir is not None else []
+        return stream_result + (messages, case_results)
+
+    with ThreadPoolExecutor(max_workers = len(shards)) as executor:
+        shard_jobs = [executor.submit(execute_shard, cmd + shard.get_arguments())
+                        for shard in shards]
+        shard_results = [shard_job.result() for shard_job in shard_jobs]
+
+    execution_result = TestExecutionResult(is_passed = True)
+    for shard_index, (shard, shard_result) in enumerate(zip(shards, shard_results)):
+        exit_code, timed_out_test, _, messages, case_results = shard_result
+        string_out(f'\n----- Shard {shard_index + 1}/{len(shards)}: '
+                   f'{" ".join(shard.get_arguments())} -----\n')
+        for message in messages:
+            string_out(message)
+
+        if exit_code != 0 or timed_out_test != '':
+            execution_result.is_passed = False
+        if execution_result.timed_out_test == '':
+            execution_result.timed_out_test = timed_out_test
+        execution_result.case_results += case_results
+
+    shard_counts = [shard_result[2] for shard_result in shard_results]
+    if all(counts is not None for counts in shard_counts):
+        execution_result.test_counts = merge_sharded_test_counts(shard_counts)
+        counts = execution_result.test_counts
+        string_out(f'\n***** Merged result of {len(shards)} shards: '
+                   f'{"OK" if counts.failures == 0 else "Errors"} ('
+                   f'{counts.failures} failures, {counts.tests} tests, {counts.ran} ran, '
+                   f'{counts.checks} checks, {counts.ignored} ignored, '
+                   f'{counts.filtered_out} filtered out) *****\n')
+
+    return execution_result
+
+def replay_cached_execution(cached_execution:CachedExecution, string_out = print) \
+        -> TestExecutionResult:
+    """ This function outputs the lines saved in the cache instead of executing the test,
+        and returns the result saved.
+    """
+    string_out('***** The executable has not changed. The result is replayed from the cache. '
+               '*****\n')
+    for line in cached_execution.output:
+        string_out(line)
+
+    test_counts = None
+    if cached_execution.test_counts is not None:
+        test_counts = TestCounts(**cached_execution.test_counts)
+    return TestExecutionResult(is_passed = cached_execution.is_passed, test_counts = test_counts,
+                               case_results = cached_execution.case_results, is_cached = True)
+
 def execute_test_with_message(target_path:str, test_module_in:str, is_exe_valid_in:bool,
-                              run_type_in:str, string_out = print):
+                              run_type_in:str, string_out = print,
+                              option:Optional[TestExecutionOption] = None) \
+        -> TestExecutionResult:
     '''This function executes the generate executable file
         according to the result of compilation.
+        The output of the executable is output line by line while it runs.
 
     Args:
         in_target_path (str): Path to the executable object to be generated
         in_test_module (str): The module to be tested
         is_exe_valid (bool): True if the executable is ready
         run_type (str): 'Clear', 'Build', 'Make'
-        log_file: Path to the log file where the result will be saved
+        option (TestExecutionOption): Option of the execution. e.g. The executable is killed
+                                      if a test takes longer than 'test_timeout'.
+                                      The result is replayed if 'execution_cache' has the one
+                                      of the same executable, arguments and environment.
+
+    Returns:
+        TestExecutionResult: Result of the execution
     '''
+    if option is None:
+        option = TestExecutionOption()
+
+    execution_result = TestExecutionResult()
 
     # The object files cleared?
     if run_type_in == 'Clear':
         # Then, it can't execute it. Just output message.
         string_out("\n***** Clear Done  *****\n\n")
+        execution_result.is_passed = True
     else:
         # object files has been not cleared.
         # Check the compilation finished without or with error.
@@ -99,36 +399,85 @@ def execute_test_with_message(target_path:str, test_module_in:str, is_exe_valid_
             # The valid executable file is exists, then execute it!
             string_out(f'\n***** Now execute {test_module_in} test code! *****\n\n')
 
-            # Adding '2>&1' means send stderr(2) to the same place as stdout (&1))
-            cmd = target_path.replace('/', '\\')
+            # The executable is not searched in the PATH, even if it is in the current directory.
+            cmd = [os.path.abspath(target_path)]
+            if option.test_timeout > 0 or option.collect_junit is True:
+                # Print the name of each test when it starts, to find the test timed out.
+                # This is also required to output to the console together with JUnit.
+                cmd.append('-v')
+            if option.collect_junit is True:
+                cmd.append('-ojunit')
 
             # Display the command
-            string_out(cmd)
-            try:
-                whole_msg_byte = subprocess.check_output(cmd,
-                                                         stderr=subprocess.STDOUT,
-                                                         shell=True)
-                # Convert the binary into string
-                whole_msg = whole_msg_byte.decode()
-            except subprocess.CalledProcessError as error_process:
-                whole_msg = error_process.output.decode()
-
-            whole_msg_lines = whole_msg.splitlines()
-
-            # Output result
-            for line in whole_msg_lines:
+            string_out(' '.join([os.path.normpath(target_path)] + cmd[1:]))
+            shard_count = get_test_shard_count(option.test_shards)
+
+            cache_key = None
+            if option.execution_cache is not None:
+                # The shards and the timeout change the output or the status of the same test.
+                cache_key = option.execution_cache.get_key(
+                    cmd[1:] + [f'shards={shard_count}', f'timeout={option.test_timeout}'])
+            if cache_key is not None:
+                cached_execution = option.execution_cache.load(cache_key)
+                if cached_execution is not None:
+                    return replay_cached_execution(cached_execution, string_out)
+
+            # The lines output are kept to be saved in the cache.
+            output_lines:list[str] = []
+            def output_and_keep(line:str):
                 string_out(line)
+                if len(output_lines) <= _MAX_CACHED_OUTPUT_LINES:
+                    output_lines.append(line)
+            test_out = output_and_keep if cache_key is not None else string_out
+
+            try:
+                sharded_result = None
+                if shard_count > 1:
+                    sharded_result = execute_sharded_test(cmd, shard_count, test_out, option)
+
+                if sharded_result is not None:
+                    execution_result = sharded_result
+                else:
+                    with get_junit_directory(target_path, option.collect_junit) as junit_dir:
+                        exit_code, execution_result.timed_out_test, \
+                            execution_result.test_counts = \
+                            stream_test_output(cmd, test_out, option.test_timeout,
+                                               cwd = junit_dir)
+                        if junit_dir is not None:
+                            execution_result.case_results = parse_junit_reports(junit_dir)
+                    execution_result.is_passed = (exit_code == 0 and
+                                                  execution_result.timed_out_test == '')
+
+                # The result of the test timed out is not saved, since it depends on the time.
+                if cache_key is not None and execution_result.timed_out_test == '' and \
+                   len(output_lines) <= _MAX_CACHED_OUTPUT_LINES:
+                    test_counts = execution_result.test_counts
+                    option.execution_cache.save(cache_key, CachedExecution(
+                        is_passed = execution_result.is_passed,
+                        output = output_lines,
+                        test_counts = (None if test_counts is None
+                                       else dataclasses.asdict(test_counts)),
+                        case_results = execution_result.case_results))
+            except OSError as os_error:
+                string_out(f'Failed to execute {target_path}: {os_error.strerror}')
+
+            if execution_result.timed_out_test != '':
+                string_out(f'\n***** {execution_result.timed_out_test} did not finish in '
+                           f'{option.test_timeout} seconds. The executable was killed. *****\n\n')
         else:
             # The Compilation finished with error. Just output message.
             string_out('\n***** Some Errors detected...  *****\n\n')
 
+    return execution_result
+
 def get_all_test_modules(test_code_base_path:str, test_module_in:str)->list[str]:
     """ This function returns all module to be tested as a list
 
     Args:
         test_code_base_path (str): Path to the folder which contains all test modules
         test_module (str): Name of the test module. if it is 'All' this function returns all test
-                           module in the 'test_code_base_path'
+                           module in the 'test_code_base_path'. A glob pattern (e.g. 'Led*')
+                           returns the matched modules in the 'test_code_base_path'.
 
     Returns:
         list[str]: list of module to be tested
@@ -139,105 +488,759 @@ def get_all_test_modules(test_code_base_path:str, test_module_in:str)->list[str]
 
     if test_module_in == 'All':
         module_list_tmp = get_all_module_under_folder(test_code_base_path)
+    elif any(wildcard in test_module_in for wildcard in '*?['):
+        module_list_tmp = sorted(fnmatch.filter(get_all_module_under_folder(test_code_base_path),
+                                                test_module_in))
     else:
         module_list_tmp.append(test_module_in)
 
     return module_list_tmp
 
-def get_command_line_arguments(test_code_base_path:str)->tuple[str, list[str], str]:
-    """ This function analyzes command line arguments and returns input test module name,
-        list of modules to be tested, and run type.
+def get_command_line_arguments(argv:list[str])->argparse.Namespace:
+    """ This function analyzes command line arguments of the headless runner.
 
     Args:
-        test_code_base_path (str): Path to the folder which contains modules to be tested
+        argv (list[str]): Command line arguments except the script name
 
     Returns:
-        tuple[str, list[str], str]: [input module name, modules to be tested, run type]
+        argparse.Namespace: Analyzed arguments
     """
-    # Check the number of input command line arguments.
-    if len(sys.argv) < 2:
-        # No arguments. Then, exit with messages
-        print("Please input the test module as the first parameter.\n")
-        sys.exit(1)
-    else:
-        # Two arguments.
-        # Get test module name from the first parameter.
-        test_module_tmp = sys.argv[1]
-        module_list_tmp = get_all_test_modules(test_code_base_path, test_module_tmp)
-
-        if len(sys.argv) < 3:
-            # Assume the second parameter is 'Make'
-            run_type_tmp    = 'Make'
-        else:
-            # Get run type from the second parameter.
-            run_type_tmp    = sys.argv[2]
-
-    return (test_module_tmp, module_list_tmp, run_type_tmp)
+    parser = argparse.ArgumentParser(
+        description = 'Make and run the test modules without the GUI. '
+                      'The GUI is launched if no argument is given.')
+    parser.add_argument('module', nargs = '?', default = 'All',
+                        help = "Test module name, a glob pattern (e.g. 'Led*') or 'All' "
+                               "(default)")
+    parser.add_argument('run_type', nargs = '?', default = 'Make',
+                        choices = ('Make', 'Build', 'Clear'),
+                        help = 'Make (default), Build or Clear')
+    parser.add_argument('-j', '--jobs', type = int, default = 0,
+                        help = 'Number of modules tested in parallel. 0 means the cores.')
+    parser.add_argument('--compile-jobs', type = int, default = 0, metavar = 'N',
+                        help = 'Number of files compiled in parallel by each module. 0 (default) '
+                               "means 'jobs' in the configuration files, or the cores divided "
+                               'by the modules tested in parallel.')
+    parser.add_argument('--test-timeout', type = float, default = 0, metavar = 'SECONDS',
+                        help = 'Kill the test executable if a test takes longer than this. '
+                               '0 (default) means no timeout.')
+    parser.add_argument('--shards', type = int, default = 1, metavar = 'N',
+                        help = 'Split the tests of each executable into N processes run in '
+                               'parallel. 1 (default) means no split. 0 means the cores.')
+    parser.add_argument('--history', action = 'store_true',
+                        help = 'Keep the results of the test cases read from JUnit in '
+                               f'<test dir>/{ResultHistory.DATABASE_FILE_NAME}, to test the slow '
+                               'ones first and to report the ones which have become slower.')
+    parser.add_argument('--result-cache', action = 'store_true',
+                        help = 'Replay the results of the last executions instead of executing '
+                               'the test executables which have not changed. The executables '
+                               'built with the coverage options are always executed.')
+    parser.add_argument('--history-report', action = 'store_true',
+                        help = 'Output the latest results in the history without testing.')
+    parser.add_argument('--changed', nargs = '+', metavar = 'FILE',
+                        help = 'Test only the modules affected by these files')
+    parser.add_argument('--git-diff', metavar = 'RANGE',
+                        help = "Test only the modules affected by the files changed in the git "
+                               "revision range. e.g. 'main...HEAD', or 'HEAD' for the changes "
+                               "not committed.")
+    parser.add_argument('--watch', action = 'store_true',
+                        help = 'Make and test the modules again whenever the files they depend '
+                               'on change. Stop with Ctrl+C.')
+    parser.add_argument('--trace', metavar = 'PATH',
+                        help = 'Write the time taken by each phase (loading the configuration '
+                               'files, checking the dependencies, each compilation, linking, '
+                               'executing the tests) into the Chrome trace file, and output '
+                               'the slowest translation units.')
+    parser.add_argument('--slowest', type = int, default = 10, metavar = 'N',
+                        help = 'Number of the slowest translation units output with --trace')
+    parser.add_argument('--config-cache', metavar = 'PATH',
+                        help = 'Save the parsed configuration files into the file, so that the '
+                               'next runs do not parse them again unless they are modified.')
+    parser.add_argument('--test-dir', default = DEFAULT_TEST_CODE_PATH,
+                        help = 'Directory where the test modules are located')
+    parser.add_argument('--harness-dir', default = DEFAULT_TEST_HARNESS_PATH,
+                        help = 'Directory where the test harness is located')
+    parser.add_argument('--global-config', default = DEFAULT_GLOBAL_CONFIG_PATH,
+                        help = 'Path to the global configuration file')
+    parser.add_argument('--json', metavar = 'PATH',
+                        help = "Write the summary as JSON into PATH. '-' means stdout, "
+                               "then the other messages are output to stderr.")
+    return parser.parse_args(argv)
 
 def prepare_module_block(make_obj:MakeFile, config_file_path:str):
     """ This function makes module folder ready to be proceed test process.
-        e.g. remove object files if one of them is older than the configuration file
+        i.e. loads the configuration file into the make file object.
+        Objects are not removed even if the configuration file has been updated, because
+        the make file object compiles again only the objects whose compile command changed.
 
     Args:
         make_obj (MakeFile): Make file object
         config_file_path (str): Path to the configuration file
     """
+    make_obj.load_json_makefile(config_file_path)
+
+def get_config_cache(run_test_param:RunTestParam) -> MakeConfigCache:
+    """ This function returns the cache of the configuration files shared by the make file
+        objects. So, each configuration file is parsed once, even if it is loaded for all
+        the modules. (e.g. The global configuration file)
+    """
+    if run_test_param.config_cache_path == '':
+        return get_shared_config_cache()
+    return get_shared_config_cache(run_test_param.config_cache_path)
+
+def load_harness_make_file(run_test_param:RunTestParam, string_out = None) -> MakeFile:
+    """ This function returns the make file object of the test harness library loaded from
+        the configuration files.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        string_out: Function which outputs the messages of the make file object.
+                    None means run_test_param.text_out.
+    """
+    if string_out is None:
+        string_out = run_test_param.text_out
+
+    harness_make_file = MakeFile(string_out = string_out)
+    harness_make_file.set_build_trace(run_test_param.build_trace)
+    harness_make_file.set_config_cache(get_config_cache(run_test_param))
+
+    harness_make_file.load_json_makefile(run_test_param.global_config_path)
+
+    prepare_module_block(harness_make_file,
+                         get_harness_config_path(run_test_param.test_harness_directory))
+
+    # The test harness is made alone, before the modules.
+    harness_make_file.set_jobs(get_compile_job_count(run_test_param, harness_make_file.get_jobs(),
+                                                     module_job_count = 1))
+
+    return harness_make_file
+
+def load_module_make_file(run_test_param:RunTestParam, harness_make_file:MakeFile,
+                          test_module:str, string_out = print) -> MakeFile:
+    """ This function returns the make file object of the test module loaded from
+        the configuration files.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        harness_make_file (MakeFile): Make file object of the test harness library
+        test_module (str): Name of the test module
+        string_out: Function which outputs the messages of the make file object
+    """
+    test_module_path = f'{run_test_param.test_directory}/{test_module}'
+
+    make_file = MakeFile(string_out = string_out)
+    make_file.set_build_trace(run_test_param.build_trace)
+    make_file.set_config_cache(get_config_cache(run_test_param))
+
+    make_file.load_json_makefile(run_test_param.global_config_path)
+
+    # Compile with the harness headers, and link with the harness library
+    make_file.add_include_path(harness_make_file.get_include_path_list())
+    make_file.add_library(harness_make_file.get_target_path())
+
+    # The test sources use the precompiled header declared by the harness, if any.
+    make_file.set_precompiled_header(harness_make_file.get_precompiled_header(),
+                                     harness_make_file.get_include_path_list())
+
+    # The time stamps are read once in the run. The harness clears them when it is made.
+    make_file.set_timestamp_cache(harness_make_file.get_timestamp_cache())
+
+    prepare_module_block(make_file,
+                         get_the_test_config_path(test_module_path))
+
+    make_file.set_jobs(get_compile_job_count(run_test_param, make_file.get_jobs(),
+                                             get_module_job_count(run_test_param)))
+
+    return make_file
+
+def create_impact_index(run_test_param:RunTestParam, harness_make_file:MakeFile,
+                        make_file_dict:dict[str, MakeFile]) -> ImpactIndex:
+    """ This function returns the index from the files to the modules depending on them.
+        i.e. The files in the dependency files (.d) made by the last make, and the configuration
+        files. The test harness and the global configuration affect all the modules.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        harness_make_file (MakeFile): Make file object of the test harness library
+        make_file_dict (dict[str, MakeFile]): Make file objects of the modules
+    """
+    impact_index = ImpactIndex()
+
+    impact_index.add_global_file(run_test_param.global_config_path)
+    impact_index.add_global_file(get_harness_config_path(run_test_param.test_harness_directory))
+    for file_path in harness_make_file.get_dependency_list() or []:
+        impact_index.add_global_file(file_path)
+
+    for test_module, make_file in make_file_dict.items():
+        dependency_list = make_file.get_dependency_list()
+        if dependency_list is not None:
+            dependency_list.append(get_the_test_config_path(
+                f'{run_test_param.test_directory}/{test_module}'))
+        impact_index.add_module(test_module, dependency_list)
+
+    return impact_index
+
+def select_affected_modules(run_test_param:RunTestParam, changed_file_list:list[str]) \
+        -> list[str]:
+    """ This function returns the modules in run_test_param.modules which are affected by
+        the changed files. See create_impact_index for the dependencies of the modules.
+        The modules which have not been made yet are always affected.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        changed_file_list (list[str]): The files changed
+    """
+    # The messages of the make file objects are not output, since nothing is made here.
+    harness_make_file = load_harness_make_file(run_test_param, string_out = lambda _: None)
+    make_file_dict = {test_module: load_module_make_file(run_test_param, harness_make_file,
+                                                         test_module, string_out = lambda _: None)
+                        for test_module in run_test_param.modules}
+
+    impact_index = create_impact_index(run_test_param, harness_make_file, make_file_dict)
+    return impact_index.get_affected_modules(changed_file_list)
+
+def get_changed_files_from_git(revision_range:str, path:str) -> list[str]:
+    """ This function returns the files changed in the revision range of the git repository.
+        The paths are relative to the current directory, as the other paths of this script.
+
+    Args:
+        revision_range (str): Revision range given to 'git diff'. e.g. 'main...HEAD'
+                              A revision (e.g. 'HEAD') compares it with the working tree.
+        path (str): A path in the git repository. e.g. The test directory
+    """
+    top_level = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd = path,
+                               stdout = subprocess.PIPE, check = True).stdout.decode().strip()
+    diff_output = subprocess.run(['git', 'diff', '--name-only', revision_range], cwd = top_level,
+                                 stdout = subprocess.PIPE, check = True).stdout.decode()
+    return [os.path.join(top_level, file_path) for file_path in diff_output.splitlines()
+                if file_path != '']
+
+def make_harness_library(run_test_param:RunTestParam) -> tuple[MakeFile, bool]:
+    """ This function makes/builds/clears the test harness as a static library.
+        This is done once per run, then the library is linked with all the test modules.
+        Only the objects whose compile command changed are compiled again.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+
+    Returns:
+        tuple[MakeFile, bool]: [Make file object of the harness, True if the library is ready]
+    """
+    harness_make_file = load_harness_make_file(run_test_param)
+
+    run_test_param.text_out('\n***** Prepare the test harness library *****\n\n')
+    is_lib_valid = execute_makefile_process(harness_make_file, run_test_param.run_type)
+
+    return (harness_make_file, is_lib_valid)
+
+def get_result_history(run_test_param:RunTestParam) -> Optional[ResultHistory]:
+    """ This function returns the history of the results in the test directory.
+        Returns None if the history is not used.
+    """
+    if run_test_param.use_result_history is False:
+        return None
+    return ResultHistory(f'{run_test_param.test_directory}/{ResultHistory.DATABASE_FILE_NAME}')
+
+def get_execution_cache(run_test_param:RunTestParam, make_file:MakeFile) \
+        -> Optional[ExecutionCache]:
+    """ This function returns the cache of the result of the test executable of the module.
+        Returns None if the result is not replayed. i.e. The cache is not enabled by the option,
+        or is disabled by 'test_result_cache' in the configuration file of the module. (e.g.
+        A flaky test) The executable built with the coverage options is always executed, so that
+        the coverage data files (.gcda) are written by the run.
+    """
+    if run_test_param.use_result_cache is False or make_file.is_test_result_cached() is False \
+       or make_file.is_coverage_instrumented() is True:
+        return None
+    return ExecutionCache(make_file.get_target_path())
+
+def record_result_history(result_history:ResultHistory, module_result:ModuleResult,
+                          case_results:list[CaseResult], string_out = print):
+    """ This function saves the results of the test cases into the history, and outputs the test
+        cases which have become slower than the previous runs.
+    """
+    result_history.record_run(module_result.module, case_results)
+
+    regressions = result_history.find_regressions(module_result.module)
+    if len(regressions) > 0:
+        string_out(f'\n***** {module_result.module}: Test cases slower than before *****\n')
+    for regression in regressions:
+        string_out(f'{regression.full_name}: {regression.previous_duration:.3f} s -> '
+                   f'{regression.latest_duration:.3f} s')
+        module_result.timing_regressions.append(regression.full_name)
+
+def output_history_report(result_history:ResultHistory, string_out = print):
+    """ This function outputs the latest results of all the modules saved in the history,
+        without executing the tests.
+    """
+    string_out('\n***** Latest results in the history *****\n')
+    for summary in result_history.get_latest_summaries():
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(summary.started))
+        string_out(f'{summary.module}: {summary.tests} tests, {summary.failures} failures, '
+                   f'{summary.skipped} skipped, {summary.duration:.3f} s ({started})')
+
+def run_test_module(run_test_param:RunTestParam, harness_make_file:MakeFile,
+                    test_module:str, string_out = None,
+                    result_history:Optional[ResultHistory] = None,
+                    make_file:Optional[MakeFile] = None) \
+        -> tuple[ModuleResult, list[str]]:
+    """ This function makes/builds/clears a test module and executes it.
+        This can be called from the worker threads. Then, all the messages are stored
+        in the list instead of being output directly, unless 'string_out' is given.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        harness_make_file (MakeFile): Make file object of the test harness library
+        test_module (str): Name of the test module
+        string_out: Function which outputs the messages directly. None to store them.
+        result_history (ResultHistory): History of the results. None if it is not used.
+        make_file (MakeFile): Make file object of the module loaded before. None to load it.
+
+    Returns:
+        tuple[ModuleResult, list[str]]: [Result of the module, messages to be output]
+    """
+    messages:list[str] = []
+    module_result = ModuleResult(module = test_module)
+
+    if string_out is None:
+        string_out = messages.append
+
     try:
-        objs = make_obj.load_json_makefile(config_file_path)
-    except MakeConfigLoadError as make_config_error:
-        raise make_config_error
-
-    objs_exists = [obj_file for obj_file in objs
-                            if os.path.exists(obj_file)]
-    if TimestampComp.is_the_file_oldest(config_file_path, objs_exists) is False:
-        # Remove objs if config file is not oldest among object files
-        for obj_exists in objs_exists:
-            os.remove(obj_exists)
-
-def run_test(run_test_param:RunTestParam):
+        if make_file is None:
+            make_file = load_module_make_file(run_test_param, harness_make_file, test_module,
+                                              string_out = string_out)
+
+        if run_test_param.run_type in ('Build', 'Clear'):
+            # The result saved is discarded, even if the executable is made the same again.
+            ExecutionCache(make_file.get_target_path()).clear()
+
+        module_result.is_exe_valid = execute_makefile_process(make_file,
+                                                              run_test_param.run_type)
+
+        build_times = make_file.get_build_times()
+        module_result.compile_time = build_times.compile_time
+        module_result.link_time    = build_times.link_time
+
+        execution_option = TestExecutionOption(test_timeout = run_test_param.test_timeout,
+                                               test_shards = run_test_param.test_shards,
+                                               collect_junit = result_history is not None,
+                                               execution_cache = get_execution_cache(
+                                                   run_test_param, make_file))
+        if result_history is not None:
+            # Split the tests by the durations in the history.
+            execution_option.durations = result_history.get_case_durations(test_module)
+
+        start_time = time.perf_counter()
+        with trace_span(run_test_param.build_trace, test_module, BuildTrace.TEST):
+            execution_result = execute_test_with_message(make_file.get_target_path(),
+                                                         test_module,
+                                                         module_result.is_exe_valid,
+                                                         run_test_param.run_type,
+                                                         string_out = string_out,
+                                                         option = execution_option)
+        module_result.run_time       = time.perf_counter() - start_time
+        module_result.is_passed      = execution_result.is_passed
+        module_result.timed_out_test = execution_result.timed_out_test
+        module_result.test_counts    = execution_result.test_counts
+        module_result.is_result_cached = execution_result.is_cached
+
+        # The result replayed is not recorded again, since the tests have not been executed.
+        if result_history is not None and len(execution_result.case_results) > 0 and \
+           execution_result.is_cached is False:
+            record_result_history(result_history, module_result, execution_result.case_results,
+                                  string_out = string_out)
+    except MakeConfigLoadError:
+        string_out('Program aborted by MakeConfigLoadError')
+
+    return (module_result, messages)
+
+def get_module_job_count(run_test_param:RunTestParam) -> int:
+    """ This function returns the number of the modules tested in parallel.
+    """
+    if run_test_param.module_jobs > 0:
+        return run_test_param.module_jobs
+
+    # Not specified, then use all the cores.
+    return os.cpu_count() or 1
+
+def get_compile_job_count(run_test_param:RunTestParam, configured_jobs:int,
+                          module_job_count:int) -> int:
+    """ This function returns the number of the files compiled in parallel by a module.
+        The command line option is used first, then the 'jobs' in the configuration files.
+        If neither is given, the cores are shared by the modules made in parallel, so that
+        the compilers started at once do not exceed the cores.
+
+    Args:
+        run_test_param: The contents are defined in RunTestParam
+        configured_jobs (int): 'jobs' in the configuration files. 0 if not given.
+        module_job_count (int): Number of the modules made in parallel
+    """
+    if run_test_param.compile_jobs > 0:
+        return run_test_param.compile_jobs
+    if configured_jobs > 0:
+        return configured_jobs
+
+    parallel_count = max(min(module_job_count, len(run_test_param.modules)), 1)
+    return max((os.cpu_count() or 1) // parallel_count, 1)
+
+def output_summary(module_results:list[ModuleResult], string_out = print):
+    """ This function outputs the combined pass/fail summary of all the tested modules.
+
+    Args:
+        module_results (list[ModuleResult]): Results of all the tested modules
+    """
+    passed_count = len([result for result in module_results if result.is_passed])
+    failed_count = len(module_results) - passed_count
+
+    string_out('\n***** Summary *****\n')
+    for result in module_results:
+        replayed = ' (replayed from the cache)' if result.is_result_cached is True else ''
+        if result.is_passed is True:
+            string_out(f'{result.module}: PASSED{replayed}')
+        elif result.timed_out_test != '':
+            string_out(f'{result.module}: TIMEOUT in {result.timed_out_test}')
+        elif result.is_exe_valid is True:
+            string_out(f'{result.module}: FAILED{replayed}')
+        else:
+            string_out(f'{result.module}: BUILD ERROR')
+    string_out(f'\n{passed_count} passed, {failed_count} failed\n')
+
+def output_build_trace(run_test_param:RunTestParam):
+    """ This function writes the events of the run into the Chrome trace file, and outputs
+        the slowest translation units compiled.
+    """
+    build_trace:BuildTrace = run_test_param.build_trace
+    build_trace.write_chrome_trace(run_test_param.trace_path)
+
+    slowest_summary = build_trace.get_slowest_summary(run_test_param.slowest_count)
+    if len(slowest_summary) > 0:
+        run_test_param.text_out('\n***** Slowest translation units *****\n')
+        for line in slowest_summary:
+            run_test_param.text_out(line)
+    run_test_param.text_out(f'\nTrace written to {run_test_param.trace_path}\n')
+
+def run_test(run_test_param:RunTestParam) -> list[ModuleResult]:
     """ This function runs the test according to the input parameter which is defined in
     c_test_runner.gui.py.
+    The test modules are made and executed in parallel. The messages of each module are output
+    at once when the module has finished, so that the messages of the modules are not mixed.
+    If the modules are tested one by one, the messages are output as soon as they are generated.
+    If run_test_param.trace_path is given, the time taken by each phase is recorded and written
+    into it. See output_build_trace.
     Args:
         run_test_param: The contents are defined in RunTestParam
+
+    Returns:
+        list[ModuleResult]: Results of the tested modules in the order of the input modules
     """
     if check_input_run_type(run_test_param.run_type) is False:
-        return
+        return []
 
-    for test_module in run_test_param.modules:
+    try:
+        if run_test_param.trace_path == '':
+            return run_test_modules(run_test_param)
 
+        run_test_param.build_trace = BuildTrace()
         try:
-            test_module_path = f'{run_test_param.test_directory}/{test_module}'
+            return run_test_modules(run_test_param)
+        finally:
+            output_build_trace(run_test_param)
+            run_test_param.build_trace = None
+    finally:
+        # The configuration files parsed are used by the next run.
+        get_config_cache(run_test_param).save()
+
+def run_test_modules(run_test_param:RunTestParam) -> list[ModuleResult]:
+    """ This function is the body of run_test. See it for the details.
+    """
+
+    # Make/Build/Clean Harness Codes
+    try:
+        harness_make_file, is_lib_valid = make_harness_library(run_test_param)
+    except MakeConfigLoadError:
+        run_test_param.text_out('Program aborted by MakeConfigLoadError')
+        return []
+
+    if run_test_param.run_type != 'Clear' and is_lib_valid is False:
+        run_test_param.text_out('\n***** Failed to make the test harness library *****\n\n')
+        return []
+
+    module_results:dict[str, ModuleResult] = {}
+
+    result_history = get_result_history(run_test_param)
+    modules_to_test = run_test_param.modules
+    if result_history is not None:
+        # Start the slow modules first, so that they do not finish last.
+        # The modules not in the history are regarded as the slowest.
+        modules_to_test = sorted(modules_to_test,
+            key = lambda module: -(result_history.get_module_duration(module) or float('inf')))
+
+    module_job_count = get_module_job_count(run_test_param)
+    if module_job_count == 1 or len(run_test_param.modules) == 1:
+        # The modules are tested one by one. Then, the messages are output while the module
+        # is made and executed, instead of being stored until the module finishes.
+        for test_module in modules_to_test:
+            module_result, _ = run_test_module(run_test_param, harness_make_file, test_module,
+                                               string_out = run_test_param.text_out,
+                                               result_history = result_history)
+            module_results[module_result.module] = module_result
+    else:
+        with ThreadPoolExecutor(max_workers = module_job_count) as executor:
+            module_jobs = [executor.submit(run_test_module, run_test_param, harness_make_file,
+                                           test_module, result_history = result_history)
+                            for test_module in modules_to_test]
+
+            # Output the messages of the modules in the order of completion.
+            # Only this thread outputs, then the messages of a module are output atomically.
+            for module_job in as_completed(module_jobs):
+                module_result, messages = module_job.result()
+                for message in messages:
+                    run_test_param.text_out(message)
+                module_results[module_result.module] = module_result
+
+    results = [module_results[test_module] for test_module in run_test_param.modules]
+
+    if run_test_param.run_type != 'Clear':
+        output_summary(results, string_out = run_test_param.text_out)
 
-            # Make/Build/Clean Harness Codes
-            make_file = MakeFile(string_out = run_test_param.text_out)
+    return results
 
-            make_file.load_json_makefile(run_test_param.global_config_path)
+class TestWatchSession:
+    """ This class makes and tests the modules again whenever the files they depend on change.
+        The make file objects are kept between the iterations, so that the build databases and
+        the dependencies are not loaded again.
+    """
+    def __init__(self, run_test_param:RunTestParam):
+        self.__param = run_test_param
+        self.__harness_make_file:Optional[MakeFile] = None
+        self.__make_file_dict:dict[str, MakeFile] = {}
+        self.__result_history = get_result_history(run_test_param)
+
+    def __load_make_files(self, test_modules:list[str]):
+        """ This function loads the configuration files of the modules.
+            The test harness is loaded as well if it has not been loaded yet.
+        """
+        if self.__harness_make_file is None:
+            self.__harness_make_file = load_harness_make_file(self.__param)
+        for test_module in test_modules:
+            self.__make_file_dict[test_module] = load_module_make_file(
+                self.__param, self.__harness_make_file, test_module,
+                string_out = self.__param.text_out)
+
+    def __reload_changed_configs(self, changed_files:list[str]):
+        """ This function loads again the configuration files changed.
+            If the global or the harness configuration file changed, all the modules are loaded
+            again, since they take over the settings of them. Otherwise, only the modules whose
+            configuration file changed are loaded again. The make file objects of the others
+            are kept. (e.g. A source or a header changed)
+
+        Args:
+            changed_files (list[str]): The files changed, normalized by FileWatcher.normalize
+        """
+        changed_file_set = set(changed_files)
+        global_config_list = [self.__param.global_config_path,
+                              get_harness_config_path(self.__param.test_harness_directory)]
+        if any(FileWatcher.normalize(config_path) in changed_file_set
+                   for config_path in global_config_list):
+            self.__harness_make_file = None
+            self.__load_make_files(self.__param.modules)
+            return
+
+        self.__load_make_files([test_module for test_module in self.__param.modules
+                                    if FileWatcher.normalize(get_the_test_config_path(
+                                        f'{self.__param.test_directory}/{test_module}'))
+                                        in changed_file_set])
+
+    def __make_harness_library(self) -> bool:
+        self.__param.text_out('\n***** Prepare the test harness library *****\n\n')
+        is_lib_valid = execute_makefile_process(self.__harness_make_file, 'Make')
+        if is_lib_valid is False:
+            self.__param.text_out('\n***** Failed to make the test harness library *****\n\n')
+        return is_lib_valid
+
+    def __test_modules(self, test_modules:list[str]):
+        module_results = []
+        for test_module in test_modules:
+            module_result, _ = run_test_module(self.__param, self.__harness_make_file,
+                                               test_module,
+                                               string_out = self.__param.text_out,
+                                               result_history = self.__result_history,
+                                               make_file = self.__make_file_dict[test_module])
+            module_results.append(module_result)
+        output_summary(module_results, string_out = self.__param.text_out)
 
-            prepare_module_block(make_file,
-                                 get_harness_config_path(run_test_param.test_harness_directory))
+    def run(self, stop_event:Optional[threading.Event] = None, debounce:float = 0.3):
+        """ This function makes and tests all the modules, then waits for the changes of
+            the files and tests the affected modules again until 'stop_event' is set.
 
-            prepare_module_block(make_file,
-                                 get_the_test_config_path(test_module_path))
+        Args:
+            stop_event (threading.Event): Event to stop watching. None means forever.
+            debounce (float): Seconds to wait for the next change after a change
+        """
+        text_out = self.__param.text_out
+        file_watcher = create_file_watcher()
+        try:
+            self.__load_make_files(self.__param.modules)
+            if self.__make_harness_library() is True:
+                self.__test_modules(self.__param.modules)
+
+            while stop_event is None or stop_event.is_set() is False:
+                impact_index = create_impact_index(self.__param, self.__harness_make_file,
+                                                   self.__make_file_dict)
+                file_watcher.set_files(impact_index.get_file_list())
+                text_out(f'\n***** Watching {len(impact_index.get_file_list())} files. '
+                         f'Waiting for changes... *****\n')
+
+                changed_files = sorted(file_watcher.wait_for_changes(debounce,
+                                                                     stop_event = stop_event))
+                if len(changed_files) == 0:
+                    # Stopped
+                    break
+
+                for changed_file in changed_files:
+                    text_out(f'Changed: {changed_file}')
 
-            is_exe_valid = execute_makefile_process(make_file, run_test_param.run_type)
+                affected_modules = impact_index.get_affected_modules(changed_files)
+                self.__reload_changed_configs(changed_files)
 
-            execute_test_with_message(make_file.get_target_path(),
-                                      test_module,
-                                      is_exe_valid,
-                                      run_test_param.run_type,
-                                      string_out = run_test_param.text_out)
+                if self.__make_harness_library() is True:
+                    self.__test_modules(affected_modules)
         except MakeConfigLoadError:
-            run_test_param.text_out('Program aborted by MakeConfigLoadError')
+            text_out('Program aborted by MakeConfigLoadError')
+        finally:
+            file_watcher.close()
+            get_config_cache(self.__param).save()
+            text_out('\n***** Watch mode finished *****\n')
 
-def generate_coveratge_report(in_path, out_path):
+def watch_test(run_test_param:RunTestParam, stop_event:Optional[threading.Event] = None):
+    """ This function makes and tests the modules, and tests them again whenever the files they
+        depend on change, until 'stop_event' is set. See TestWatchSession.
+    """
+    TestWatchSession(run_test_param).run(stop_event)
+
+def generate_coveratge_report(in_path, out_path, build_trace:Optional[BuildTrace] = None):
     """ This function invokes a command that generates a coverage reporting html files.
     Args:
          out_path: Path to the folder in which the generated files are going to be stored.
+         build_trace (BuildTrace): Recorder of the time taken. None not to record it.
     """
-    cmd = f"gcovr -r {in_path} --html-details --output={out_path}/coverage.html"
-    subprocess.check_output(cmd,stderr=subprocess.STDOUT,shell=True)
+    cmd = ['gcovr', '-r', in_path, '--html-details', f'--output={out_path}/coverage.html']
+    with trace_span(build_trace, in_path, BuildTrace.COVERAGE):
+        subprocess.check_output(cmd,stderr=subprocess.STDOUT)
+
 
+def get_json_summary(run_type:str, module_results:list[ModuleResult]) -> dict:
+    """ This function returns the summary of the test written by the headless runner.
+
+    Args:
+        run_type (str): 'Clear', 'Build', 'Make'
+        module_results (list[ModuleResult]): Results of all the tested modules
+    """
+    return {
+        'run_type': run_type,
+        'passed': len(module_results) > 0 and all(result.is_passed for result in module_results),
+        'modules': [dataclasses.asdict(result) for result in module_results]
+    }
+
+def write_json_summary(json_path:Optional[str], summary:dict):
+    """ This function writes the summary into the file. '-' means stdout.
+        Nothing is written if the path is None.
+    """
+    if json_path == '-':
+        json.dump(summary, sys.stdout, indent = 4)
+        sys.stdout.write('\n')
+    elif json_path is not None:
+        with open(json_path, 'w', encoding = 'UTF-8') as json_file:
+            json.dump(summary, json_file, indent = 4)
+
+def main_headless(argv:list[str]) -> int:
+    """ This function runs the test without the GUI according to the command line arguments.
+
+    Args:
+        argv (list[str]): Command line arguments except the script name
+
+    Returns:
+        int: Exit code. 0 if all the modules passed, otherwise 1.
+    """
+    arguments = get_command_line_arguments(argv)
+
+    # Keep stdout for the JSON summary.
+    text_file = sys.stderr if arguments.json == '-' else sys.stdout
+    def text_out(text:str):
+        print(text, file = text_file, flush = True)
+
+    if arguments.history_report is True:
+        history_path = f'{arguments.test_dir}/{ResultHistory.DATABASE_FILE_NAME}'
+        if os.path.exists(history_path) is False:
+            text_out(f'No history in {arguments.test_dir}')
+            return 1
+        output_history_report(ResultHistory(history_path), string_out = text_out)
+        return 0
+
+    run_test_param = RunTestParam()
+    run_test_param.modules                = get_all_test_modules(arguments.test_dir,
+                                                                 arguments.module)
+    run_test_param.run_type               = arguments.run_type
+    run_test_param.global_config_path     = arguments.global_config
+    run_test_param.test_directory         = arguments.test_dir
+    run_test_param.test_harness_directory = arguments.harness_dir
+    run_test_param.module_jobs            = arguments.jobs
+    run_test_param.compile_jobs           = arguments.compile_jobs
+    run_test_param.test_timeout           = arguments.test_timeout
+    run_test_param.test_shards            = arguments.shards
+    run_test_param.use_result_history     = arguments.history
+    run_test_param.use_result_cache       = arguments.result_cache
+    run_test_param.trace_path             = arguments.trace or ''
+    run_test_param.slowest_count          = arguments.slowest
+    run_test_param.config_cache_path      = arguments.config_cache or ''
+    run_test_param.text_out               = text_out
+
+    if len(run_test_param.modules) == 0:
+        text_out(f'No test module matches {arguments.module} in {arguments.test_dir}')
+        return 1
+
+    if arguments.watch is True:
+        try:
+            watch_test(run_test_param)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if arguments.changed is not None or arguments.git_diff is not None:
+        changed_file_list = arguments.changed or []
+        try:
+            if arguments.git_diff is not None:
+                changed_file_list += get_changed_files_from_git(arguments.git_diff,
+                                                                arguments.test_dir)
+            affected_modules = select_affected_modules(run_test_param, changed_file_list)
+        except (OSError, subprocess.CalledProcessError, MakeConfigLoadError) as error:
+            text_out(f'Failed to find the modules affected by the changes: {error}')
+            return 1
+
+        text_out(f'\n***** {len(affected_modules)} of {len(run_test_param.modules)} modules '
+                 f'are affected by {len(changed_file_list)} changed files *****\n')
+        for test_module in affected_modules:
+            text_out(test_module)
+
+        if len(affected_modules) == 0:
+            # Nothing to test. It is not a failure.
+            write_json_summary(arguments.json, {'run_type': arguments.run_type,
+                                                'passed': True, 'modules': []})
+            return 0
+        run_test_param.modules = affected_modules
+
+    module_results = run_test(run_test_param)
+
+    summary = get_json_summary(arguments.run_type, module_results)
+    write_json_summary(arguments.json, summary)
+
+    return 0 if summary['passed'] is True else 1
 
 if __name__ == "__main__":
-    gui = CTestRunnerGui()
-    gui.create(run_test, generate_coveratge_report)
+    if len(sys.argv) < 2:
+        # Import tkinter only when the GUI is used, so that the headless runner works on
+        # the hosts without display.
+        from c_test_runner_gui import CTestRunnerGui # pylint: disable=import-outside-toplevel
+        gui = CTestRunnerGui()
+        gui.create(run_test, generate_coveratge_report, watch_test)
+    else:
+        sys.exit(main_headless(sys.argv[1:]))
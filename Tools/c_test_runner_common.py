@@ -1,8 +1,11 @@
 ''' This script provides the common parameters and APIs to c_test_runner.py and c_test_runner_gui.py
 '''
 import os
+import re
 import glob
+from dataclasses import dataclass, field
 from typing import Final
+from typing import Optional
 
 TEST_CODE_CONFIG_FILE:Final[str]      = 'MakeConfig.jsonc'
 TEST_HARNESS_CONFIG_FILE:Final[str]   = 'MakeConfig.jsonc'
@@ -10,6 +13,101 @@ DEFAULT_TEST_CODE_PATH:Final[str]     = '../Example/TestCode'
 DEFAULT_TEST_HARNESS_PATH:Final[str]  = '../TestHarness'
 DEFAULT_GLOBAL_CONFIG_PATH:Final[str] = '../GlobalMakeConfig.jsonc'
 
+@dataclass
+class RunTestParam:
+    """ Input parameter of run_test of c_test_runner.py
+    """
+    modules:list[str]          = field(default_factory = list) # List of modules to be tested
+    run_type:str               = '' # clear or make or build
+    global_config_path:str     = '' # Path to the global configuration file.
+    test_directory:str         = '' # Path to the directory where test modules are located
+    test_harness_directory:str = '' # Path to the directory where the test harness are located
+    module_jobs:int            = 0  # Number of modules tested in parallel. 0 means the cores.
+    compile_jobs:int           = 0  # Files compiled in parallel per module. 0: Config or shared
+    test_timeout:float         = 0  # Seconds a test is allowed to take. 0 means no timeout.
+    test_shards:int            = 1  # Processes a test executable is split into. 0 means the cores.
+    use_result_history:bool    = False # True to keep the results of the test cases in the history
+    use_result_cache:bool      = False # True to replay the results of the executables not changed
+    trace_path:str             = '' # Path to the Chrome trace file written. Empty not to trace.
+    slowest_count:int          = 10 # Number of the slowest translation units output when traced
+    config_cache_path:str      = '' # File caching the parsed configuration files. Empty: memory
+    text_out                   = print # Function which output text string (e.g. print)
+    build_trace                = None  # BuildTrace recording the run. Set by run_test.
+
+@dataclass
+class TestCounts:
+    """ Counts printed by CppUTest at the end of the test
+        e.g. 'Errors (1 failures, 3 tests, 3 ran, 5 checks, 0 ignored, 0 filtered out, 1 ms)'
+    """
+    tests:int        = 0
+    failures:int     = 0
+    ran:int          = 0
+    checks:int       = 0
+    ignored:int      = 0
+    filtered_out:int = 0
+
+@dataclass
+class ModuleResult:
+    """ Result of a test module returned by run_test of c_test_runner.py
+    """
+    module:str          = ''    # Name of the tested module
+    is_exe_valid:bool   = False # True if the executable has been made without error
+    is_passed:bool      = False # True if the test passed
+    compile_time:float  = 0.0   # Seconds taken to compile the module
+    link_time:float     = 0.0   # Seconds taken to link the module
+    run_time:float      = 0.0   # Seconds taken to execute the test
+    timed_out_test:str  = ''    # Test killed by the timeout. e.g. 'TEST(group, name)'
+    test_counts:Optional[TestCounts] = None # None if the result of CppUTest was not found
+    is_result_cached:bool = False # True if the result has been replayed from the cache
+    # Test cases which have become slower than the previous runs. e.g. 'LedDriver.LedOn'
+    timing_regressions:list[str] = field(default_factory = list)
+
+def merge_sharded_test_counts(shard_counts:list[TestCounts]) -> TestCounts:
+    """ This function merges the counts of the shards of a test executable into the counts of
+        the whole executable.
+        CppUTest counts all the tests in the executable as 'tests', including the ones
+        filtered out. Thus, the filtered out tests are counted by every shard except one.
+    Args:
+         shard_counts: Counts reported by the shards of the same executable
+    """
+    tests = max(counts.tests for counts in shard_counts)
+    merged_counts = TestCounts(
+        tests        = tests,
+        failures     = sum(counts.failures for counts in shard_counts),
+        ran          = sum(counts.ran for counts in shard_counts),
+        checks       = sum(counts.checks for counts in shard_counts),
+        ignored      = sum(counts.ignored for counts in shard_counts),
+        filtered_out = sum(counts.filtered_out for counts in shard_counts)
+                       - (len(shard_counts) - 1) * tests
+        )
+    return merged_counts
+
+# Result line of CppUTest. e.g. 'OK (3 tests, 3 ran, 5 checks, 0 ignored, 0 filtered out, 1 ms)'
+_CPPUTEST_RESULT_PATTERN = re.compile(r'^(OK|Errors) \((.*)\)\s*$')
+_CPPUTEST_COUNT_PATTERN  = re.compile(r'(\d+) (failures?|tests?|ran|checks?|ignored|filtered out)')
+
+def parse_cpputest_result(lines:list[str]) -> Optional[TestCounts]:
+    """ This function returns the counts in the result line of CppUTest.
+        Returns None if the result line is not found. e.g. The test crashed.
+    Args:
+         lines: Lines output by the test executable
+    """
+    for line in reversed(lines):
+        result_match = _CPPUTEST_RESULT_PATTERN.match(line.strip())
+        if result_match is None:
+            continue
+
+        test_counts = TestCounts()
+        for count, name in _CPPUTEST_COUNT_PATTERN.findall(result_match.group(2)):
+            # 'failure' -> 'failures', 'filtered out' -> 'filtered_out', etc.
+            attribute = name.replace(' ', '_')
+            if not attribute.endswith('s') and attribute not in ('ran', 'ignored', 'filtered_out'):
+                attribute += 's'
+            setattr(test_counts, attribute, int(count))
+        return test_counts
+
+    return None
+
 def get_all_module_under_folder(folder_path:str):
     """ This function returns the list of folders containing the file named TEST_CODE_CONFIG_FILE
     under the input folder.
@@ -19,6 +117,6 @@ def get_all_module_under_folder(folder_path:str):
     module_list = glob.glob(f'{folder_path}/*/')
     module_list = [module for module in module_list
                           if os.path.exists(module + '/' + TEST_CODE_CONFIG_FILE)]
-    module_list = list(map(lambda path: os.path.basename(path.rstrip('\\')),
+    module_list = list(map(lambda path: os.path.basename(path.rstrip('\\/')),
                                 module_list))
     return module_list
@@ -4,31 +4,20 @@ from __future__ import annotations
 import os
 import re
 import tkinter
-from tkinter import Tk, StringVar
+from tkinter import Tk, StringVar, BooleanVar
 from tkinter import filedialog
 from tkinter import ttk
 from tkinter import Listbox
 from tkinter import Text
 from tkinter.font import Font
 import threading
-from dataclasses import dataclass, field
 from c_test_runner_common import get_all_module_under_folder
 from c_test_runner_common import DEFAULT_TEST_CODE_PATH
 from c_test_runner_common import DEFAULT_TEST_HARNESS_PATH
 from c_test_runner_common import DEFAULT_GLOBAL_CONFIG_PATH
+from c_test_runner_common import RunTestParam
 from py_module.tk_button import MultiTaskButton
 
-@dataclass
-class RunTestParam: # TODO: will move to common
-    """ Input parameter of run_test_func of CTestRunnerGui
-    """
-    modules:list[str]          = field(default_factory = list) # List of modules to be tested
-    run_type:str               = '' # clear or make or build
-    global_config_path:str     = '' # Path to the global configuration file.
-    test_directory:str         = '' # Path to the directory where test modules are located
-    test_harness_directory:str = '' # Path to the directory where the test harness are located
-    text_out                   = print # Function which output text string (e.g. print)
-
 class DirectorySelectingFrame:
     """ This class indicates a GUI frame including "test module directory selector",
         "test harness directory selector", and "global configuration file selector".
@@ -259,8 +248,23 @@ class TestButtonFrame:
         self.make_btn:MultiTaskButton            = None
         self.build_btn:MultiTaskButton           = None
         self.gen_coverage_btn:MultiTaskButton    = None
+        self.watch_check:ttk.Checkbutton         = None
         self.test_start_hook                     = None
 
+        # If watch_var is TRUE, 'Make' keeps testing the modules whenever their files change.
+        # watch_stop_event is set to stop it when the check box is unchecked.
+        self.watch_var                           = None
+        self.watch_stop_event                    = threading.Event()
+
+    def is_watch_enabled(self) -> bool:
+        return self.watch_var is not None and self.watch_var.get() is True
+
+    def __watch_toggled(self):
+        if self.watch_var.get() is True:
+            self.watch_stop_event.clear()
+        else:
+            self.watch_stop_event.set()
+
     def set_test_start_hook(self, hook):
         self.test_start_hook = hook
 
@@ -290,7 +294,7 @@ class TestButtonFrame:
         self.build_btn.configure(state = tkinter.NORMAL)
         self.gen_coverage_btn.configure(state = tkinter.NORMAL)
 
-    def create(self, clear_func, make_func, build_func, gen_func):
+    def create(self, clear_func, make_func, build_func, gen_func, is_watch_available = False):
         self.clear_btn = MultiTaskButton(
             self.frame,
             text='Clear',
@@ -332,6 +336,15 @@ class TestButtonFrame:
         self.build_btn.grid(row=0, column=2, sticky=tkinter.E)
         self.gen_coverage_btn.grid(row=0, column=3, sticky=tkinter.E)
 
+        if is_watch_available is True:
+            self.watch_var = BooleanVar(value = False)
+            self.watch_check = ttk.Checkbutton(
+                self.frame,
+                text='Watch',
+                variable=self.watch_var,
+                command=self.__watch_toggled)
+            self.watch_check.grid(row=0, column=4, sticky=tkinter.E, padx = (8, 0))
+
         self.frame.grid(row=2, sticky=tkinter.E, padx = 8, pady = 8)
 
 class CTestRunnerGui:
@@ -355,7 +368,7 @@ class CTestRunnerGui:
         test_param.text_out               = self.module_msg_frame.text_out
         return test_param
 
-    def create(self, run_func, gen_func):
+    def create(self, run_func, gen_func, watch_func = None):
         self.tk_root = Tk()
         self.tk_root.title('C Test Runner')
         self.tk_root.grid_columnconfigure(0, weight=1)
@@ -378,7 +391,12 @@ class CTestRunnerGui:
             run_func(test_param)
         def make_run():
             test_param = self.__get_run_test_param("Make")
-            run_func(test_param)
+            if self.button_frame.is_watch_enabled() is True:
+                # Keep testing until the 'Watch' check box is unchecked.
+                self.button_frame.watch_stop_event.clear()
+                watch_func(test_param, self.button_frame.watch_stop_event)
+            else:
+                run_func(test_param)
         def build_run():
             test_param = self.__get_run_test_param("Build")
             run_func(test_param)
@@ -389,6 +407,7 @@ class CTestRunnerGui:
             if open_dir != "":
                 gen_func(in_dir, open_dir)
         self.button_frame = TestButtonFrame(self.tk_root)
-        self.button_frame.create(clear_run, make_run, build_run, gen_run)
+        self.button_frame.create(clear_run, make_run, build_run, gen_run,
+                                 is_watch_available = watch_func is not None)
         self.button_frame.set_test_start_hook(self.module_msg_frame.clear_text)
         self.tk_root.mainloop()
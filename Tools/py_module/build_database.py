@@ -0,0 +1,169 @@
+'''
+ This module provides the build database which is saved in each object directory.
+ The database has a record per object file, which includes the command the object file was
+ compiled with and the signatures of all the files it depends on. Thus, the dependency files
+ (.d) need not to be parsed every time to check if the object files are up-to-date.
+'''
+import os
+import json
+import threading
+import dataclasses
+from enum import Enum
+from typing import Dict
+from typing import List
+from typing import Optional
+from .content_hash import ContentHashCache # pylint: disable=relative-beyond-top-level
+from .content_hash import FileSignature # pylint: disable=relative-beyond-top-level
+from .depfile import intern_path # pylint: disable=relative-beyond-top-level
+
+class RecordState(Enum):
+    '''
+     This enumerator class includes values suggesting the result of the check of a record.
+    '''
+    UP_TO_DATE               = 0 # Nothing has changed
+    UP_TO_DATE_STAMP_CHANGED = 1 # The contents have not changed, but some time stamps have
+    OUT_OF_DATE              = 2 # The command or the contents of a file have changed
+
+@dataclasses.dataclass
+class ObjectRecord:
+    '''
+     This data class represents what an object file has been built from. That is, the exact
+     compile command and the signatures of the source file and all the files it depends on.
+    '''
+    command:str
+    files:Dict[str, FileSignature]
+
+    @classmethod
+    def create(cls, command:str, file_list:List[str], hash_cache:ContentHashCache,
+               with_digest:bool = True)->Optional['ObjectRecord']:
+        """
+        This function creates the record of the object file built by the input command from
+        the input files. Returns None if one of the files does not exist.
+        with_digest: False not to hash the files. i.e. Only the time stamps are recorded.
+        """
+        files = {}
+        for file_path in file_list:
+            if with_digest is True:
+                signature = hash_cache.get_signature(file_path)
+            else:
+                signature = hash_cache.get_stamp(file_path)
+            if signature is None:
+                return None
+            files[file_path] = signature
+        return cls(command = command, files = files)
+
+    def get_file_list(self)->List[str]:
+        """
+        This function returns the list of the source file and all the files it depends on.
+        """
+        return list(self.files)
+
+    def check(self, command:str, hash_cache:ContentHashCache)->RecordState:
+        """
+        This function checks if the object file is still the one built by the input command
+        from the recorded contents.
+        The time stamps in this record are updated if only they have changed.
+        """
+        if command != self.command:
+            return RecordState.OUT_OF_DATE
+
+        state = RecordState.UP_TO_DATE
+        for file_path, recorded_signature in self.files.items():
+            signature = hash_cache.get_signature(file_path, recorded_signature)
+
+            # Deleted or modified?
+            if signature is None or signature.digest != recorded_signature.digest:
+                return RecordState.OUT_OF_DATE
+
+            if signature != recorded_signature:
+                # The contents are the same, but the time stamp is not.
+                self.files[file_path] = signature
+                state = RecordState.UP_TO_DATE_STAMP_CHANGED
+
+        return state
+
+class BuildDatabase:
+    '''
+     This class represents the build database of an object directory.
+    '''
+
+    # Name of the database file created in the object directory
+    DATABASE_FILE_NAME = '.make_db.json'
+
+    # Version of the database format. The database of the other version is discarded.
+    __VERSION = 1
+
+    def __init__(self, obj_dir:str):
+        self.__database_path:str = f'{obj_dir}/{self.DATABASE_FILE_NAME}'
+        self.__record_dict:Dict[str, ObjectRecord] = {}
+        self.__is_modified:bool = False
+        self.__load()
+
+    def __load(self):
+        """
+        This function loads the database file. If the file does not exist or is broken,
+        the database gets empty.
+        """
+        try:
+            with open(self.__database_path, 'r', encoding = 'UTF-8') as database_file:
+                database_dict = json.load(database_file)
+            if database_dict['version'] != self.__VERSION:
+                return
+            for obj, record in database_dict['objects'].items():
+                self.__record_dict[obj] = ObjectRecord(
+                    command = record['command'],
+                    files = {intern_path(path): FileSignature(*signature)
+                                for path, signature in record['files'].items()}
+                    )
+        except (OSError, ValueError, KeyError, TypeError):
+            self.__record_dict = {}
+
+    def get_record(self, obj:str)->Optional[ObjectRecord]:
+        """
+        This function returns the record of the input object file. Returns None if not found.
+        """
+        return self.__record_dict.get(obj)
+
+    def set_record(self, obj:str, record:ObjectRecord):
+        """
+        This function sets the record of the input object file. This must be called also when
+        the record returned by 'get_record' has been updated.
+        """
+        self.__record_dict[obj] = record
+        self.__is_modified = True
+
+    def remove_record(self, obj:str):
+        """
+        This function removes the record of the input object file.
+        """
+        if self.__record_dict.pop(obj, None) is not None:
+            self.__is_modified = True
+
+    def save(self):
+        """
+        This function saves the database into the file if it has been modified.
+        The file is replaced at once, so that the file is not broken even if two processes
+        save it at the same time.
+        """
+        if self.__is_modified is False:
+            return
+
+        if os.path.isdir(os.path.dirname(self.__database_path) or '.') is False:
+            # The object directory has been removed.
+            return
+
+        database_dict = {
+            'version': self.__VERSION,
+            'objects': {
+                obj: {
+                    'command': record.command,
+                    'files': {path: [signature.mtime_ns, signature.size, signature.digest]
+                                for path, signature in record.files.items()}
+                } for obj, record in self.__record_dict.items()
+            }
+        }
+        tmp_path = f'{self.__database_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding = 'UTF-8') as database_file:
+            json.dump(database_dict, database_file)
+        os.replace(tmp_path, self.__database_path)
+        self.__is_modified = False
@@ -0,0 +1,138 @@
+'''
+ This module provides the class which records how long each phase of a run takes.
+ e.g. Loading the configuration files, checking the dependencies, compiling each file, linking,
+ and executing the tests.
+ The events recorded are written as a Chrome trace file ('trace_event' JSON format), which can be
+ opened by 'chrome://tracing' or 'https://ui.perfetto.dev'.
+'''
+import os
+import json
+import time
+import threading
+import contextlib
+import dataclasses
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+@dataclasses.dataclass
+class TraceEvent:
+    '''
+     This data class represents a phase which has been recorded.
+    '''
+    name: str       # e.g. The source file compiled
+    category: str   # e.g. 'compile', 'link', 'test'
+    start: float    # Seconds since the trace started
+    duration: float # Seconds
+    thread: str     # Name of the thread where the phase was executed
+    args: Dict[str, Any] = dataclasses.field(default_factory = dict)
+
+class BuildTrace:
+    '''
+     This class records the events of a run. The methods can be called from the worker threads.
+    '''
+
+    # Categories of the events
+    CONFIG   = 'config'   # Loading a configuration file
+    SCAN     = 'scan'     # Checking if an object file is up-to-date
+    COMPILE  = 'compile'  # Compiling a translation unit
+    LINK     = 'link'     # Linking or archiving a target
+    TEST     = 'test'     # Executing a test executable
+    COVERAGE = 'coverage' # Generating the coverage report
+
+    def __init__(self):
+        self.__origin:float = time.perf_counter()
+        self.__events:List[TraceEvent] = []
+        self.__lock = threading.Lock()
+
+    def add_event(self, name:str, category:str, start:float, duration:float,
+                  args:Optional[Dict[str, Any]] = None):
+        """
+        This function records the event.
+        start: The value of time.perf_counter() when the phase started
+        duration: Seconds taken by the phase
+        """
+        event = TraceEvent(name = name, category = category, start = start - self.__origin,
+                           duration = duration, thread = threading.current_thread().name,
+                           args = dict(args or {}))
+        with self.__lock:
+            self.__events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name:str, category:str, **args)->Iterator[Dict[str, Any]]:
+        """
+        This function records the event taking the time while the 'with' block is executed.
+        The dictionary given by the 'with' statement is recorded as the arguments of the event.
+        So, the results found in the block can be added. e.g. args['cached'] = True
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add_event(name, category, start, time.perf_counter() - start, args)
+
+    def get_events(self)->List[TraceEvent]:
+        """
+        This function returns the events recorded in the order they started.
+        """
+        with self.__lock:
+            return sorted(self.__events, key = lambda event: event.start)
+
+    def get_slowest_events(self, category:str, count:int)->List[TraceEvent]:
+        """
+        This function returns the 'count' slowest events of the category, the slowest first.
+        """
+        events = [event for event in self.get_events() if event.category == category]
+        return sorted(events, key = lambda event: -event.duration)[:count]
+
+    def get_slowest_summary(self, count:int = 10)->List[str]:
+        """
+        This function returns the lines showing the 'count' slowest translation units compiled.
+        e.g. '   1.234 s  ../ProductCode/LedDriver/LedDriver.c'
+        """
+        return [f'{event.duration:8.3f} s  {event.name}'
+                    for event in self.get_slowest_events(self.COMPILE, count)]
+
+    def get_chrome_trace(self)->Dict[str, Any]:
+        """
+        This function returns the events in the Chrome trace format.
+        The threads are numbered in the order they appeared.
+        """
+        process_id = os.getpid()
+        thread_id_dict:Dict[str, int] = {}
+        trace_events:List[Dict[str, Any]] = []
+
+        for event in self.get_events():
+            if event.thread not in thread_id_dict:
+                thread_id_dict[event.thread] = len(thread_id_dict)
+                trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': process_id,
+                                     'tid': thread_id_dict[event.thread],
+                                     'args': {'name': event.thread}})
+
+            # Complete events. The times are written in micro seconds.
+            trace_events.append({'name': event.name, 'cat': event.category, 'ph': 'X',
+                                 'ts': round(event.start * 1e6),
+                                 'dur': round(event.duration * 1e6),
+                                 'pid': process_id, 'tid': thread_id_dict[event.thread],
+                                 'args': event.args})
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, trace_path:str):
+        """
+        This function writes the events into the file in the Chrome trace format.
+        """
+        with open(trace_path, 'w', encoding = 'UTF-8') as trace_file:
+            json.dump(self.get_chrome_trace(), trace_file)
+
+def trace_span(build_trace:Optional[BuildTrace], name:str, category:str,
+               **args)->contextlib.AbstractContextManager:
+    """
+    This function returns 'build_trace.span', or the context doing nothing if 'build_trace' is
+    None. So, the callers need not to check if the run is traced.
+    """
+    if build_trace is None:
+        return contextlib.nullcontext(args)
+    return build_trace.span(name, category, **args)
@@ -0,0 +1,115 @@
+'''
+ This module provides classes which detect changes of files by their contents instead of
+ their time stamps.
+ The hash value of a file is cached with its modification time and size. Thus, a file whose
+ modification time and size have not changed is not read again.
+'''
+import os
+import hashlib
+import dataclasses
+from typing import Dict
+from typing import Optional
+
+@dataclasses.dataclass(frozen = True)
+class FileSignature:
+    '''
+     This data class represents the state of a file when it was seen.
+     The digest is empty if the contents of the file were not hashed.
+    '''
+    mtime_ns:int
+    size:int
+    digest:str
+
+class ContentHashCache:
+    '''
+     This class provides the hash values of the files. The hash values are cached in memory
+     together with the modification time and size of the files.
+    '''
+
+    # Size of the chunk read at once to calculate the hash value
+    __READ_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        # This hash will have the file paths as keys, and the value will be the
+        # signature of the file.
+        self.__signature_dict:Dict[str, FileSignature] = {}
+
+    @classmethod
+    def __hash_file(cls, file_path:str)->str:
+        """
+        This function returns the hash value of the contents of the input file.
+        """
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as in_file:
+            for chunk in iter(lambda: in_file.read(cls.__READ_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def get_signature(self, file_path:str,
+                      known_signature:Optional[FileSignature] = None)->Optional[FileSignature]:
+        """
+        This function returns the signature of the input file. Returns None if the file does
+        not exist.
+        The file is read only if neither the cached signature nor the 'known_signature' has
+        the same modification time and size as the file.
+        file_path: The input file path
+        known_signature: The signature of the file recorded before (e.g. in a build database)
+        """
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        cached_signature = self.__signature_dict.get(file_path)
+        if self.__is_stamp_same(cached_signature, file_stat):
+            return cached_signature
+
+        if self.__is_stamp_same(known_signature, file_stat):
+            # Pre-check passed. The contents are regarded as unchanged.
+            signature = known_signature
+        else:
+            signature = FileSignature(
+                mtime_ns = file_stat.st_mtime_ns,
+                size = file_stat.st_size,
+                digest = self.__hash_file(file_path)
+                )
+
+        # Only the signatures which have the hash value can be served from the cache.
+        if signature.digest != '':
+            self.__signature_dict[file_path] = signature
+        return signature
+
+    def get_stamp(self, file_path:str)->Optional[FileSignature]:
+        """
+        This function returns the signature of the input file without hashing it.
+        i.e. The digest is empty unless the hash value has been cached.
+        Returns None if the file does not exist.
+        file_path: The input file path
+        """
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        cached_signature = self.__signature_dict.get(file_path)
+        if self.__is_stamp_same(cached_signature, file_stat):
+            return cached_signature
+
+        return FileSignature(mtime_ns = file_stat.st_mtime_ns, size = file_stat.st_size,
+                             digest = '')
+
+    @staticmethod
+    def __is_stamp_same(signature:Optional[FileSignature], file_stat:os.stat_result)->bool:
+        """
+        This function returns TRUE if the signature has the same modification time and size as
+        the input status of the file.
+        """
+        return (signature is not None and
+                signature.mtime_ns == file_stat.st_mtime_ns and
+                signature.size == file_stat.st_size)
+
+    def clear(self):
+        """
+        This function clears the cached signatures.
+        """
+        self.__signature_dict = {}
@@ -0,0 +1,95 @@
+r'''
+ This module provides the parser of the dependency files (.d) made by the compiler. ('-MMD')
+ A dependency file is a makefile which has the rules like below.
+
+    Obj/LedDriver.o: ../ProductCode/LedDriver/LedDriver.c \
+     ../ProductCode/LedDriver/LedDriver.h
+    ../ProductCode/LedDriver/LedDriver.h:
+
+ The lines continued by '\', the escaped characters ('\ ', '\#' and '$$'), and the drive letters
+ of Windows (e.g. 'C:\Include\a.h') are handled. The rules without prerequisites (i.e. the phony
+ targets made by '-MP') are skipped. The order-only prerequisites (the ones after '|', e.g.
+ the object directory) are skipped as well, since a directory is modified whenever a file in it
+ is written.
+ The paths found are interned, so that a header included by many objects (e.g.
+ 'CppUTest/TestHarness.h') is kept as one string in memory and looked up fast as a key.
+'''
+import re
+import sys
+from typing import List
+
+# A word of a rule. A backslash escapes the next character. (e.g. '\ ' is a space in a path)
+_WORD_PATTERN = re.compile(r'(?:\\.|\S)+')
+
+# A backslash at the end of a line continues the line.
+_CONTINUATION_PATTERN = re.compile(r'\\\r?\n')
+
+def intern_path(path:str)->str:
+    """
+    This function returns the path interned. i.e. The same object is returned for the same path
+    in this process.
+    """
+    return sys.intern(path)
+
+def _unescape(word:str)->str:
+    """
+    This function returns the path which the escape sequences of the word are removed from.
+    The backslashes of the other characters are the separators of Windows paths, and are kept.
+    """
+    if '\\' in word:
+        word = word.replace('\\ ', ' ').replace('\\#', '#')
+    if '$' in word:
+        word = word.replace('$$', '$')
+    return word
+
+def _is_target_separator(word:str)->bool:
+    """
+    This function checks if the word ends the targets of a rule. e.g. 'Obj/a.o:' or ':'
+    A drive letter (e.g. 'C:' of 'C: \\dir') is not regarded as the separator.
+    """
+    if word.endswith(':') is False:
+        return False
+    return not (len(word) == 2 and word[0].isalpha())
+
+def parse_dependency_text(text:str)->List[str]:
+    """
+    This function returns the prerequisites of all the rules in the text of a dependency file,
+    in the order they appear. The duplicated paths are removed.
+    """
+    file_dict = {}
+    for line in _CONTINUATION_PATTERN.sub(' ', text).splitlines():
+        if line.lstrip().startswith('#'):
+            # A comment line
+            continue
+
+        word_list = _WORD_PATTERN.findall(line)
+        prerequisite_list = []
+        for index, word in enumerate(word_list):
+            if _is_target_separator(word):
+                # The words after the targets are the prerequisites.
+                prerequisite_list = word_list[index + 1:]
+                break
+
+            # The first prerequisite may follow the separator without a space. e.g. 'a.o:a.c'
+            separator_index = word.find(':', 2)
+            if separator_index > 0 and word[separator_index + 1] not in '\\/':
+                prerequisite_list = [word[separator_index + 1:]] + word_list[index + 1:]
+                break
+
+        for prerequisite in prerequisite_list:
+            if prerequisite == '|':
+                # The order-only prerequisites follow until the end of the rule.
+                break
+            file_dict[intern_path(_unescape(prerequisite))] = None
+
+    return list(file_dict)
+
+def parse_dependency_file(file_path:str)->List[str]:
+    """
+    This function returns the prerequisites of all the rules in the dependency file.
+    i.e. The source file and the files it includes.
+    Raises OSError if the file can't be read.
+    file_path: Dependency file path
+    """
+    with open(file_path, 'r', encoding = 'UTF-8') as in_file:
+        return parse_dependency_text(in_file.read())
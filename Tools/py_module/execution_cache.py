@@ -0,0 +1,127 @@
+'''
+ This module provides the cache of the result of a test executable.
+ The result (the output, the status and the counts) is saved next to the executable together
+ with the key of the execution. The key is the hash value of the contents of the executable,
+ the arguments and the environment variables which affect the test. Thus, the test executable
+ which has not been linked again is not executed again, and its result is replayed.
+ Only the result of the last execution is kept for each executable.
+'''
+import os
+import json
+import hashlib
+import threading
+import dataclasses
+from typing import Dict
+from typing import List
+from typing import Optional
+from .content_hash import ContentHashCache # pylint: disable=relative-beyond-top-level
+from .junit_report import CaseResult # pylint: disable=relative-beyond-top-level
+from .junit_report import CaseStatus # pylint: disable=relative-beyond-top-level
+
+@dataclasses.dataclass
+class CachedExecution:
+    '''
+     This data class represents the result of an execution saved in the cache.
+    '''
+    is_passed: bool
+    output: List[str] = dataclasses.field(default_factory = list) # Lines output by the test
+    # Counts printed by CppUTest. e.g. {'tests': 3, 'failures': 1, ...} None if not found
+    test_counts: Optional[Dict[str, int]] = None
+    # Results of the test cases read from JUnit. Empty if not collected.
+    case_results: List[CaseResult] = dataclasses.field(default_factory = list)
+
+class ExecutionCache:
+    '''
+     This class represents the cache of the result of a test executable.
+     The methods can be called from the worker threads, as long as each thread uses its own
+     executable.
+    '''
+
+    # Extension of the cache file added to the path of the executable
+    FILE_EXTENSION = '.result.json'
+
+    # Version of the cache format. The cache of the other version is discarded.
+    __VERSION = 1
+
+    # Environment variables which can change the result of the test.
+    # e.g. The shared libraries loaded, the time zone and the locale
+    __ENVIRONMENT_VARIABLES = ('PATH', 'LD_LIBRARY_PATH', 'DYLD_LIBRARY_PATH', 'TZ', 'LANG',
+                               'LC_ALL')
+
+    def __init__(self, executable_path:str):
+        self.__executable_path:str = executable_path
+        self.__cache_path:str = executable_path + self.FILE_EXTENSION
+
+    def get_key(self, argument_list:List[str])->Optional[str]:
+        """
+        This function returns the key of the execution of the executable with the arguments.
+        Returns None if the executable does not exist.
+        argument_list: The arguments and the options of the execution. e.g. ['-v']
+        """
+        signature = ContentHashCache().get_signature(self.__executable_path)
+        if signature is None:
+            return None
+
+        key_dict = {
+            'executable': signature.digest,
+            'arguments': argument_list,
+            'environment': {name: os.environ.get(name)
+                                for name in self.__ENVIRONMENT_VARIABLES}
+        }
+        return hashlib.sha256(json.dumps(key_dict, sort_keys = True).encode()).hexdigest()
+
+    def load(self, key:str)->Optional[CachedExecution]:
+        """
+        This function returns the result saved with the key.
+        Returns None if the cache does not exist, is broken or has been saved with another key.
+        """
+        try:
+            with open(self.__cache_path, 'r', encoding = 'UTF-8') as cache_file:
+                cache_dict = json.load(cache_file)
+            if cache_dict['version'] != self.__VERSION or cache_dict['key'] != key:
+                return None
+            return CachedExecution(
+                is_passed = cache_dict['is_passed'],
+                output = cache_dict['output'],
+                test_counts = cache_dict['test_counts'],
+                case_results = [CaseResult(group = case['group'], name = case['name'],
+                                           duration = case['duration'],
+                                           status = CaseStatus(case['status']))
+                                    for case in cache_dict['case_results']]
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, key:str, execution:CachedExecution):
+        """
+        This function saves the result with the key, replacing the one saved before.
+        The file is replaced at once, so that the file is not broken even if two processes
+        save it at the same time.
+        """
+        cache_dict = {
+            'version': self.__VERSION,
+            'key': key,
+            'is_passed': execution.is_passed,
+            'output': execution.output,
+            'test_counts': execution.test_counts,
+            'case_results': [{'group': case.group, 'name': case.name,
+                              'duration': case.duration, 'status': case.status.value}
+                                for case in execution.case_results]
+        }
+        tmp_path = f'{self.__cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding = 'UTF-8') as cache_file:
+                json.dump(cache_dict, cache_file)
+            os.replace(tmp_path, self.__cache_path)
+        except OSError:
+            # The test is executed again next time.
+            pass
+
+    def clear(self):
+        """
+        This function removes the result saved. e.g. When the module is built or cleared.
+        """
+        try:
+            os.remove(self.__cache_path)
+        except FileNotFoundError:
+            pass
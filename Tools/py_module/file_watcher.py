@@ -0,0 +1,240 @@
+'''
+ This module provides the classes which wait for changes of files.
+ On Linux, the changes are notified by inotify. On the other platforms, or if inotify is not
+ available, the time stamps of the files are polled.
+'''
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from abc import ABC
+from abc import abstractmethod
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+class FileWatcher(ABC):
+    '''
+     This class is the base of the file watchers. The files watched are given by 'set_files'.
+     The subclasses implement '_wait_for_events'.
+    '''
+
+    def __init__(self):
+        # The normalized paths of the files watched
+        self._file_set:Set[str] = set()
+
+    @staticmethod
+    def normalize(file_path:str)->str:
+        """
+        This function returns the path used to identify the file.
+        The paths returned by 'wait_for_changes' are normalized by this function.
+        """
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def set_files(self, file_paths:Iterable[str]):
+        """
+        This function sets the files watched. The previous ones are not watched any longer.
+        """
+        self._file_set = {self.normalize(file_path) for file_path in file_paths}
+
+    @abstractmethod
+    def _wait_for_events(self, timeout:float)->Set[str]:
+        """
+        This function waits until at least one watched file changes or the timeout passes,
+        and returns the files changed.
+        """
+
+    def wait_for_changes(self, debounce:float = 0.3, timeout:Optional[float] = None,
+                         stop_event:Optional[threading.Event] = None)->Set[str]:
+        """
+        This function waits until the watched files change, and returns the changed files.
+        The changes made in a short time (e.g. 'Save All' of an editor) are returned together.
+        Returns an empty set if the timeout passes or 'stop_event' is set.
+        debounce: Seconds to wait for the next change after a change
+        timeout: Seconds to wait for the first change. None means forever.
+        stop_event: Event to stop waiting
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed_file_set:Set[str] = set()
+
+        # Wait for the first change.
+        while len(changed_file_set) == 0:
+            if stop_event is not None and stop_event.is_set():
+                return set()
+            wait_time = 0.2
+            if deadline is not None:
+                wait_time = min(wait_time, deadline - time.monotonic())
+                if wait_time <= 0:
+                    return set()
+            changed_file_set = self._wait_for_events(wait_time)
+
+        # Wait until the files get quiet.
+        while True:
+            new_changed_file_set = self._wait_for_events(debounce)
+            if len(new_changed_file_set) == 0:
+                return changed_file_set
+            changed_file_set |= new_changed_file_set
+
+    def close(self):
+        """
+        This function releases the resources used to watch the files.
+        """
+
+class PollingFileWatcher(FileWatcher):
+    '''
+     This class finds the changes of the files by polling their time stamps and sizes.
+    '''
+
+    def __init__(self, interval:float = 0.5):
+        super().__init__()
+        self.__interval:float = interval
+        self.__stamp_dict:Dict[str, Optional[Tuple[int, int]]] = {}
+
+    @staticmethod
+    def __get_stamp(file_path:str)->Optional[Tuple[int, int]]:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+
+    def set_files(self, file_paths:Iterable[str]):
+        super().set_files(file_paths)
+        self.__stamp_dict = {file_path: self.__get_stamp(file_path)
+                                for file_path in self._file_set}
+
+    def _wait_for_events(self, timeout:float)->Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed_file_set = set()
+            for file_path, stamp in self.__stamp_dict.items():
+                new_stamp = self.__get_stamp(file_path)
+                if new_stamp != stamp:
+                    self.__stamp_dict[file_path] = new_stamp
+                    changed_file_set.add(file_path)
+
+            remaining = deadline - time.monotonic()
+            if len(changed_file_set) > 0 or remaining <= 0:
+                return changed_file_set
+            time.sleep(min(self.__interval, remaining))
+
+class InotifyFileWatcher(FileWatcher):
+    '''
+     This class finds the changes of the files by inotify of Linux.
+     The directories of the files are watched instead of the files, because many editors save
+     a file by replacing it with a new one.
+    '''
+
+    # Events of inotify. See 'man inotify'
+    __IN_MODIFY      = 0x00000002
+    __IN_ATTRIB      = 0x00000004
+    __IN_CLOSE_WRITE = 0x00000008
+    __IN_MOVED_TO    = 0x00000080
+    __IN_CREATE      = 0x00000100
+    __IN_DELETE      = 0x00000200
+    __IN_NONBLOCK    = 0x00000800
+    __WATCH_MASK = (__IN_MODIFY | __IN_ATTRIB | __IN_CLOSE_WRITE | __IN_MOVED_TO |
+                    __IN_CREATE | __IN_DELETE)
+
+    # Header of an event: wd, mask, cookie, len
+    __EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        super().__init__()
+        self.__libc = self.__load_libc()
+        self.__fd:int = self.__libc.inotify_init1(self.__IN_NONBLOCK)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # Watch descriptor -> directory
+        self.__directory_dict:Dict[int, str] = {}
+
+    @staticmethod
+    def __load_libc()->ctypes.CDLL:
+        """
+        This function returns the C library having inotify. Raises OSError if not available.
+        """
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError('The C library is not found')
+        libc = ctypes.CDLL(libc_name, use_errno = True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+
+    def set_files(self, file_paths:Iterable[str]):
+        super().set_files(file_paths)
+
+        directory_set = {os.path.dirname(file_path) for file_path in self._file_set}
+        watched_directory_dict = {directory: wd for wd, directory in self.__directory_dict.items()}
+
+        # Stop watching the directories not required any longer.
+        for directory, wd in watched_directory_dict.items():
+            if directory not in directory_set:
+                self.__libc.inotify_rm_watch(self.__fd, wd)
+                del self.__directory_dict[wd]
+
+        for directory in directory_set - set(watched_directory_dict):
+            wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(directory),
+                                               self.__WATCH_MASK)
+            if wd >= 0:
+                self.__directory_dict[wd] = directory
+
+        # The events queued before are of the files changed by the last make. e.g. The library
+        self.__discard_events()
+
+    def __discard_events(self):
+        while True:
+            try:
+                if len(os.read(self.__fd, 64 * 1024)) == 0:
+                    return
+            except BlockingIOError:
+                return
+
+    def _wait_for_events(self, timeout:float)->Set[str]:
+        readable, _, _ = select.select([self.__fd], [], [], max(timeout, 0))
+        if len(readable) == 0:
+            return set()
+
+        changed_file_set = set()
+        try:
+            buffer = os.read(self.__fd, 64 * 1024)
+        except BlockingIOError:
+            return changed_file_set
+
+        offset = 0
+        while offset + self.__EVENT_HEADER.size <= len(buffer):
+            wd, _, _, name_length = self.__EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.__EVENT_HEADER.size
+            name = buffer[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+
+            directory = self.__directory_dict.get(wd)
+            if directory is None or name == b'':
+                continue
+            file_path = os.path.join(directory, os.fsdecode(name))
+            if file_path in self._file_set:
+                changed_file_set.add(file_path)
+
+        return changed_file_set
+
+    def close(self):
+        if self.__fd >= 0:
+            os.close(self.__fd)
+            self.__fd = -1
+
+def create_file_watcher()->FileWatcher:
+    """
+    This function returns the file watcher using inotify if available, otherwise the one polling
+    the files.
+    """
+    try:
+        return InotifyFileWatcher()
+    except (OSError, AttributeError):
+        return PollingFileWatcher()
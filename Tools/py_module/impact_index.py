@@ -0,0 +1,89 @@
+'''
+ This module provides the class which finds the test modules affected by changed files.
+ The index has the files each module depends on, and is looked up in reverse. i.e. From a file
+ to the modules depending on it.
+'''
+import os
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+class ImpactIndex:
+    '''
+     This class represents the reverse index from the files to the test modules depending on them.
+    '''
+
+    def __init__(self):
+        # This hash will have the normalized file paths as keys, and the value will be the
+        # set of the modules depending on the file.
+        self.__module_set_dict:Dict[str, Set[str]] = {}
+
+        # All the modules in the order they were added
+        self.__module_list:List[str] = []
+
+        # Modules whose dependencies are not known. e.g. Never built
+        self.__unknown_module_set:Set[str] = set()
+
+        # Files all the modules depend on. e.g. The global configuration file
+        self.__global_file_set:Set[str] = set()
+
+    @staticmethod
+    def __normalize(file_path:str)->str:
+        """
+        This function returns the path used as the key of the index, so that the same file
+        written in the different ways has the same key. e.g. './a/../b.h' and 'b.h'
+        """
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def add_module(self, module:str, dependency_list:Optional[List[str]]):
+        """
+        This function adds the module and the files it depends on into the index.
+        dependency_list: None if the dependencies are not known. Then, the module is affected by
+                         any change.
+        """
+        self.__module_list.append(module)
+        if dependency_list is None:
+            self.__unknown_module_set.add(module)
+            return
+
+        for file_path in dependency_list:
+            self.__module_set_dict.setdefault(self.__normalize(file_path), set()).add(module)
+
+    def add_global_file(self, file_path:str):
+        """
+        This function adds the file which all the modules depend on.
+        """
+        self.__global_file_set.add(self.__normalize(file_path))
+
+    def get_file_list(self)->List[str]:
+        """
+        This function returns all the files in the index. i.e. The files which may affect
+        the modules. The paths are normalized.
+        """
+        return sorted(self.__global_file_set | set(self.__module_set_dict))
+
+    def is_global_change(self, changed_file_list:List[str])->bool:
+        """
+        This function returns TRUE if one of the changed files is the one all the modules
+        depend on.
+        """
+        return any(self.__normalize(file_path) in self.__global_file_set
+                    for file_path in changed_file_list)
+
+    def get_affected_modules(self, changed_file_list:List[str])->List[str]:
+        """
+        This function returns the modules affected by the changed files in the order they were
+        added. The modules whose dependencies are not known are always affected.
+        changed_file_list: The files changed
+        """
+        if self.is_global_change(changed_file_list) is True:
+            return list(self.__module_list)
+
+        changed_file_set = {self.__normalize(file_path) for file_path in changed_file_list}
+
+        affected_module_set = set(self.__unknown_module_set)
+        for file_path in changed_file_set:
+            affected_module_set |= self.__module_set_dict.get(file_path, set())
+
+        return [module for module in self.__module_list if module in affected_module_set]
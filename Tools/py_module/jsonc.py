@@ -1,36 +1,93 @@
 '''
 This module provides a function which loads a json file with c style comments.
+The comments ('/* */' and '//') and the trailing commas (e.g. '[1, 2,]') are removed by a single
+scan which skips the strings. So, '//' in a string (e.g. a URL) is not regarded as a comment.
+The comments are replaced with the spaces, keeping the line breaks, so that the line and column
+numbers of an error are the ones in the original file.
 '''
 import json
 import re
 
 class JsonWithCommentsDecodeError(Exception):
     ''' This class represents the exception which can be happens in this module
+        The message includes the position of the error. e.g. 'Expecting value: line 3 column 5'
     '''
+    def __init__(self, message:str, lineno:int = 0, colno:int = 0):
+        super().__init__(message)
+        self.lineno = lineno # Line number of the error. 0 if not known
+        self.colno  = colno  # Column number of the error. 0 if not known
 
+# Comments. Each of them can be matched in only one way, not to backtrack.
+_LINE_COMMENT  = r'//[^\n]*(?![^\n])'
+_BLOCK_COMMENT = r'/\*(?:[^*]|\*(?!/))*\*/'
 
-def load(file):
+# White spaces and comments, which may be between a trailing comma and the closing bracket
+_SPACE_OR_COMMENT = r'(?:\s|' + _LINE_COMMENT + '|' + _BLOCK_COMMENT + r')*'
+
+# The tokens the scan stops at. The other characters are left as they are.
+_TOKEN_PATTERN = re.compile(
+    r'(?P<string>"(?:[^"\\\n]|\\.)*")'                             # String
+    r'|(?P<comment>' + _LINE_COMMENT + '|' + _BLOCK_COMMENT + ')'     # Comment
+    r'|(?P<trailing_comma>,(?=' + _SPACE_OR_COMMENT + r'[\]}]))'    # Comma before ']' or '}'
+    r'|(?P<unterminated>/\*)'                                       # Comment never closed
+    )
+
+# Any character but the line break
+_NOT_LINE_BREAK_PATTERN = re.compile(r'[^\r\n]')
+
+def _get_position(text:str, index:int):
+    """
+    This function returns the line and column numbers of the index in the text. (1-origin)
+    """
+    lineno = text.count('\n', 0, index) + 1
+    colno = index - text.rfind('\n', 0, index)
+    return (lineno, colno)
+
+def _replace_token(match:re.Match)->str:
+    """
+    This function returns the text the token is replaced with.
+    The length of the text is kept, so that the positions of the other tokens are not changed.
+    """
+    kind = match.lastgroup
+    if kind == 'string':
+        return match.group()
+    if kind == 'unterminated':
+        lineno, colno = _get_position(match.string, match.start())
+        raise JsonWithCommentsDecodeError(
+            f'Unterminated comment: line {lineno} column {colno} (char {match.start()})',
+            lineno, colno)
+    # A comment or a trailing comma
+    return _NOT_LINE_BREAK_PATTERN.sub(' ', match.group())
+
+def strip_comments(text:str)->str:
     '''
-    This functions loads a json file with c style comments
+    This functions returns the json text which the comments and the trailing commas are
+    removed from. The positions of the other characters are not changed.
     Args:
-        file: The json file object to be loaded
+        text: The json text with c style comments
     '''
+    return _TOKEN_PATTERN.sub(_replace_token, text)
 
+def loads(text:str):
+    '''
+    This functions loads a json text with c style comments
+    Args:
+        text: The json text to be loaded
+    '''
     try:
-        # Read the json file text as string
-        text = file.read()
-
-        # Remove C language style comment /*.*\*/ and //.*
-        text_without_comments = re.sub(r'/\*.*\*/|//.*', '', text)
-
-        # Read result text and return the json object
-        return json.loads(text_without_comments)
-
+        return json.loads(strip_comments(text))
     except json.decoder.JSONDecodeError as json_ex:
-        raise JsonWithCommentsDecodeError(json_ex.args[0]) from json_ex
-    except Exception as ex:
-        # Catch exceptions other than teh exceptions cached above
-        raise ex
+        # The message includes the line and the column in the original text.
+        raise JsonWithCommentsDecodeError(str(json_ex), json_ex.lineno, json_ex.colno) \
+            from json_ex
+
+def load(file):
+    '''
+    This functions loads a json file with c style comments
+    Args:
+        file: The json file object to be loaded
+    '''
+    return loads(file.read())
 
 if __name__ == "__main__":
     # This is an example code
@@ -0,0 +1,82 @@
+'''
+ This module provides the function which reads the JUnit reports written by CppUTest with
+ the '-ojunit' option. (e.g. 'cpputest_LedDriver.xml')
+ The reports are parsed incrementally, so that the whole report is not kept in memory.
+'''
+import glob
+import dataclasses
+import xml.etree.ElementTree as ElementTree
+from enum import Enum
+from typing import List
+
+class CaseStatus(Enum):
+    '''
+     This enumerator class includes values suggesting the result of a test case.
+    '''
+    PASSED  = 'passed'
+    FAILED  = 'failed'
+    SKIPPED = 'skipped' # e.g. IGNORE_TEST
+
+@dataclasses.dataclass
+class CaseResult:
+    '''
+     This data class represents the result of a test case written in the JUnit report.
+    '''
+    group: str
+    name: str
+    duration: float # Seconds
+    status: CaseStatus
+
+    def get_full_name(self)->str:
+        """
+        This function returns the name of the test case. e.g. 'LedDriver.LedOn'
+        This is the same format as the one listed by the '-ln' option of CppUTest.
+        """
+        return f'{self.group}.{self.name}'
+
+def parse_junit_report(report_path:str)->List[CaseResult]:
+    """
+    This function returns the results of the test cases in the JUnit report.
+    The test cases parsed before an error are returned if the report is broken.
+    e.g. The executable crashed while writing it.
+    report_path: Path to the JUnit report
+    """
+    results = []
+    try:
+        for _, element in ElementTree.iterparse(report_path, events = ('end',)):
+            if element.tag != 'testcase':
+                continue
+
+            if element.find('failure') is not None or element.find('error') is not None:
+                status = CaseStatus.FAILED
+            elif element.find('skipped') is not None:
+                status = CaseStatus.SKIPPED
+            else:
+                status = CaseStatus.PASSED
+
+            try:
+                duration = float(element.get('time', '0'))
+            except ValueError:
+                duration = 0.0
+
+            results.append(CaseResult(group = element.get('classname', ''),
+                                      name = element.get('name', ''),
+                                      duration = duration,
+                                      status = status))
+            # Release the test case parsed.
+            element.clear()
+    except (OSError, ElementTree.ParseError):
+        pass
+
+    return results
+
+def parse_junit_reports(report_dir:str)->List[CaseResult]:
+    """
+    This function returns the results of the test cases in all the JUnit reports written by
+    CppUTest in the input directory.
+    report_dir: The directory where the executable was executed
+    """
+    results = []
+    for report_path in sorted(glob.glob(f'{report_dir}/cpputest_*.xml')):
+        results += parse_junit_report(report_path)
+    return results
@@ -4,15 +4,35 @@
  like compiler options
 '''
 import os
-import re
-import subprocess
-import glob
+import time
+import hashlib
+import threading
+import contextlib
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from typing import Dict
 from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Optional
 import dataclasses
-from .timestamp_comp import TimestampComp # pylint: disable=relative-beyond-top-level
+from .timestamp_comp import TimestampCache # pylint: disable=relative-beyond-top-level
+from .content_hash import ContentHashCache # pylint: disable=relative-beyond-top-level
+from .build_database import BuildDatabase # pylint: disable=relative-beyond-top-level
+from .build_database import ObjectRecord # pylint: disable=relative-beyond-top-level
+from .build_database import RecordState # pylint: disable=relative-beyond-top-level
+from .object_cache import ObjectCache # pylint: disable=relative-beyond-top-level
+from .object_cache import get_shared_object_cache # pylint: disable=relative-beyond-top-level
+from .process_runner import format_command # pylint: disable=relative-beyond-top-level
+from .process_runner import run_command # pylint: disable=relative-beyond-top-level
+from .build_trace import BuildTrace # pylint: disable=relative-beyond-top-level
+from .build_trace import trace_span # pylint: disable=relative-beyond-top-level
+from .make_config import MakeConfigCache # pylint: disable=relative-beyond-top-level
+from .make_config import PrecompiledHeaderConfig # pylint: disable=relative-beyond-top-level
+from .make_config import UnityBuildConfig # pylint: disable=relative-beyond-top-level
+from .make_config import get_shared_config_cache # pylint: disable=relative-beyond-top-level
+from .depfile import parse_dependency_file # pylint: disable=relative-beyond-top-level
 from . import jsonc # pylint: disable=no-name-in-module
 
 class MakeConfigLoadError(Exception):
@@ -28,6 +48,22 @@ class ExecutableStatus(Enum):
     EXECUTABLE_VALID   = 0
     EXECUTABLE_INVALID = 1
 
+class RebuildDetection(Enum):
+    '''
+     This enumerator class provides the ways to decide if an object file needs to be rebuilt.
+     The values are the ones written in the 'rebuild_detection' of the configuration file.
+    '''
+    TIMESTAMP    = 'timestamp'    # Rebuild if a related file is newer than the object
+    CONTENT_HASH = 'content_hash' # Rebuild if the contents of a related file or the command changed
+
+@dataclasses.dataclass
+class BuildTimes:
+    '''
+     This data class represents the seconds taken by the last 'make' or 'build'.
+    '''
+    compile_time: float = 0.0
+    link_time: float    = 0.0
+
 @dataclasses.dataclass
 class _RelevantFiles:
     '''
@@ -36,7 +72,32 @@ class _RelevantFiles:
     src: str
     obj: str
     dep: str
-    opt: str
+    opt: List[str]
+    use_pch: bool = False # True to use the precompiled header, if it is declared
+    pch: str = '' # Header included first to use its precompiled header. '' if not used
+    include_opt: Optional[List[str]] = None # Include options. None to use the make file's ones
+
+@dataclasses.dataclass
+class _UnityBatch:
+    '''
+     This data class represents the source files compiled together as one translation unit.
+    '''
+    unity: _RelevantFiles               # The generated source including all the members
+    member_list: List[_RelevantFiles]   # The source files included
+
+# Locks of the precompiled headers shared in this process. The keys are the absolute paths.
+# A precompiled header can be shared by the make files built in parallel. (e.g. The test modules)
+_precompiled_header_lock_dict:Dict[str, threading.Lock] = {}
+_precompiled_header_lock_dict_lock = threading.Lock()
+
+def _get_precompiled_header_lock(pch_path:str)->threading.Lock:
+    """
+    This function returns the lock of the precompiled header, which must be held while
+    the precompiled header is checked and made.
+    """
+    with _precompiled_header_lock_dict_lock:
+        return _precompiled_header_lock_dict.setdefault(os.path.abspath(pch_path),
+                                                        threading.Lock())
 
 class MakeFile:
     '''
@@ -44,6 +105,20 @@ class MakeFile:
      methods executing 'make', 'build', 'clear'.
     '''
 
+    # Extensions of the files made in the object folders. i.e. The object files, the dependency
+    # files and the coverage data files.
+    __OBJECT_FOLDER_EXTENSIONS = ('.o', '.d', '.gcda', '.gcno', '.gch')
+
+    # Extensions of the source files which use the precompiled header. (C++ header)
+    __PRECOMPILED_HEADER_USER_EXTENSIONS = ('.cpp',)
+
+    # Options to make the object files for the coverage. The sources compiled with them are not
+    # batched by the unity build by default, so that the coverage is reported per source file.
+    __COVERAGE_OPTIONS = ('-fprofile-arcs', '-ftest-coverage', '--coverage')
+
+    # Prefix of the sources generated by the unity build in the object folders
+    __UNITY_SOURCE_PREFIX = 'Unity_'
+
     # Return value of 'IssueCompileCommand'
     class CompileStatus(Enum):
         '''
@@ -73,7 +148,8 @@ class MakeFile:
     def __init__(self, target_path:str = '', compiler:str = '',
                     include_path_list:Optional[List[str]] = None,
                     linker_option_list:Optional[List[str]] = None,
-                    string_out = print):
+                    string_out = print, jobs:int = 0,
+                    rebuild_detection:RebuildDetection = RebuildDetection.TIMESTAMP):
         """
         This method initializes all global variables in this module
         """
@@ -89,16 +165,16 @@ class MakeFile:
         # Include arguments in the compiling command. This will be generated from
         # the '@gaIncludePaths'.
         # Initialize include arguments
-        if include_path_list is None:
-            self.__include_string:str = ''
-        else:
-            self.__include_string:str = self.__include_path_list_to_command(include_path_list)
+        self.__include_path_list:List[str] = []
+        self.__include_option_list:List[str] = []
+        if include_path_list is not None:
+            self.add_include_path(include_path_list)
 
-        # Option arguments in the compiling command. This will be generated from the '@gaOptions'.
+        # Option arguments in the linking command.
         if linker_option_list is None:
-            self.__linker_option_string:str = ''
+            self.__linker_option_list:List[str] = []
         else:
-            self.__linker_option_string:str = self.__option_list_to_command(linker_option_list)
+            self.__linker_option_list:List[str] = list(linker_option_list)
 
         # This is an array of RelevantFiles
         # the respective values are 'source file path', 'object file path', 'dependency
@@ -108,33 +184,77 @@ class MakeFile:
 
         self.__string_out = string_out
 
-    @staticmethod
-    def __option_list_to_command(option_list:List[str])->str:
-        """
-        This function converts the array of the options into the string
-        which can be used in the command.
-        e.g. ["-Wall", "-O2", "-MMD"] -> "-Wall -O2 -MMD"
-        """
+        # The number of files compiled in parallel. 0 means the number of the cores.
+        self.__jobs:int = jobs
+
+        # Archiver command used when the target is a static library (e.g. 'libhoge.a')
+        self.__archiver:str = 'ar'
+
+        # Static libraries linked after all the object files.
+        self.__library_list:List[str] = []
+
+        # The way to decide if an object file needs to be rebuilt.
+        self.__rebuild_detection:RebuildDetection = rebuild_detection
+
+        # Hash values of the files used in the content hash mode.
+        self.__hash_cache = ContentHashCache()
+
+        # Build databases loaded from the object directories. The keys are the directories.
+        self.__database_dict:Dict[str, BuildDatabase] = {}
+
+        # Object cache shared with the other make files. None if the cache is not used.
+        self.__object_cache:Optional[ObjectCache] = None
+
+        # Seconds taken by the last make.
+        self.__build_times = BuildTimes()
+
+        # Object folders already created by the current make.
+        self.__created_folder_set:Set[str] = set()
 
-        # Combine the members of the list with separator ' '.
-        return ' '.join(option_list)
+        # Recorder of the time taken by each phase. None if the phases are not recorded.
+        self.__build_trace:Optional[BuildTrace] = None
 
-    def __include_path_list_to_command(self, include_path:List[str])->str:
+        # Time stamps of the files read during the make. This can be shared by the make files of
+        # the same build session. Then, the owner of the cache clears it. (e.g. The test harness)
+        self.__timestamp_cache = TimestampCache()
+        self.__is_timestamp_cache_shared:bool = False
+
+        # Configurations parsed from the configuration files. Shared in the process by default.
+        self.__config_cache:MakeConfigCache = get_shared_config_cache()
+
+        # Header precompiled for the C++ sources. None if no header is precompiled.
+        # The precompiled headers can be shared by the make files. (e.g. The test harness
+        # declares it for the test modules) Then, the owner of them removes them in 'clear'.
+        self.__precompiled_header:Optional[PrecompiledHeaderConfig] = None
+        self.__is_precompiled_header_shared:bool = False
+
+        # Include options to make the precompiled headers. The ones of the owner are used, so that
+        # the make files with the different include paths share the precompiled headers.
+        # None to use the include options of this make file.
+        self.__precompiled_header_include_option_list:Optional[List[str]] = None
+
+        # Unity build, which compiles the source files in batches. None not to batch them.
+        self.__unity_build:Optional[UnityBuildConfig] = None
+
+        # Object files linked into the target, decided by the last compilation. A batch of
+        # the unity build is linked as one object file. None to link the ones of all the sources.
+        self.__link_object_list:Optional[List[str]] = None
+
+        # True if the result of the test executable can be replayed while it is not changed.
+        # A flaky or time-dependent test turns it off.
+        self.__is_test_result_cached:bool = True
+
+    @staticmethod
+    def __include_path_list_to_options(include_path:List[str])->List[str]:
         """
-        This function converts the array of the include paths into the string which can
-        be used in the command.
+        This function converts the array of the include paths into the arguments of the command.
         e.g. ["../ProductCode/SetAndGet/", "./TestHarness/"] ->
-        "-I ../ProductCode/SetAndGet/ -I ./TestHarness/"
+        ["-I", "../ProductCode/SetAndGet/", "-I", "./TestHarness/"]
         """
-
-        # Make the array which will have include options as members.
-        # e.g ["../ProductCode/SetAndGet/", "./TestHarness/"]
-        #  -> ["-I ../ProductCode/SetAndGet/", "-I ./TestHarness/"]
-        include_option_list = list(map(lambda s: '-I ' + s, include_path))
-
-        # Get the option string by inputting the option array to 'OptionArrayToCommand',
-        # and return the result.
-        return self.__option_list_to_command(include_option_list)
+        include_option_list = []
+        for path in include_path:
+            include_option_list += ['-I', path]
+        return include_option_list
 
     @staticmethod
     def __check_source_file_extention(file_path:str)->Tuple[bool, str]:
@@ -144,64 +264,212 @@ class MakeFile:
             return (True, filename)
         return (False, filename)
 
-    @staticmethod
-    def __create_object_folder(obj_path:str):
+    def __create_object_folder(self, obj_path:str):
         """
         This function creates the folder where all object files to be generated will be saved.
+        The folders created are remembered until the next make, so that the file system is
+        accessed only once per folder.
         $objPath: Path to a folder where all object files are stored
         """
+        if obj_path in self.__created_folder_set:
+            return
 
-        # Save the object file path temporarily.
-        obj_tmp = obj_path
+        # If NOT the object folder exists, then, make it.
+        if obj_path != '':
+            os.makedirs(obj_path, exist_ok = True)
+        self.__created_folder_set.add(obj_path)
 
-        # Replace '/' into '\'. This is required for the windows shell.
-        obj_tmp = re.sub('/', r'\\', obj_tmp)
+    @staticmethod
+    def __get_compile_command(c_compiler:str, include_option_list:List[str],
+                                relevant_files:_RelevantFiles)->List[str]:
+        """
+        This function returns the command compiling the source file of the input relevant files.
+        """
+        if relevant_files.include_opt is not None:
+            include_option_list = relevant_files.include_opt
+        return ([c_compiler] + relevant_files.opt +
+                MakeFile.__get_precompiled_header_option(relevant_files) + include_option_list +
+                ['-c', relevant_files.src, '-o', relevant_files.obj])
 
-        # If NOT the object folder exists, then, make it.
-        subprocess.check_output('if not exist '+ obj_tmp + ' mkdir ' + obj_tmp, shell=True)
+    @staticmethod
+    def __get_precompiled_header_option(relevant_files:_RelevantFiles)->List[str]:
+        """
+        This function returns the option including the header whose precompiled header is used.
+        The compiler uses '<header>.gch' instead of the header if it is valid for the options.
+        """
+        if relevant_files.pch == '':
+            return []
+        return ['-include', relevant_files.pch]
+
+    @staticmethod
+    def __preprocess(c_compiler:str, include_option_list:List[str],
+                        relevant_files:_RelevantFiles)->Optional[bytes]:
+        """
+        This function returns the preprocessed source of the input relevant files.
+        The dependency file is generated as well, if the options request it.
+        Returns None if the preprocessing failed.
+        """
+        # The dependency file is written where the compilation writes it.
+        if relevant_files.include_opt is not None:
+            include_option_list = relevant_files.include_opt
+
+        dependency_option_list = []
+        if set(relevant_files.opt) & {'-MD', '-MMD'}:
+            dependency_option_list = ['-MF', relevant_files.dep, '-MT', relevant_files.obj]
+
+        preprocess_cmd = ([c_compiler] + relevant_files.opt +
+                          MakeFile.__get_precompiled_header_option(relevant_files) +
+                          include_option_list + ['-E', relevant_files.src] +
+                          dependency_option_list)
 
-    def __issue_compile_command(self, c_compiler:str, include_string:str,
-                                    relevant_files:_RelevantFiles)->CompileStatus:
+        # The error will be displayed by the compilation.
+        result = run_command(preprocess_cmd, merge_stderr = False)
+        if result.return_code != 0:
+            return None
+        return result.output
+
+    @staticmethod
+    def __issue_compile_command(c_compiler:str, include_option_list:List[str],
+                                    relevant_files:_RelevantFiles, string_out,
+                                    object_cache:Optional[ObjectCache] = None,
+                                    build_trace:Optional[BuildTrace] = None)->CompileStatus:
         """
         This function issues the compiling command according to the input parameters.
         This also displays the command and the output result.
         If this function detected 'error' in the output message of the command,
         it returns 'COMPILE_ERROR'. Unless, returns 'COMPILE_SUCCEEDED'.
+        If the object cache is given, the object file is copied from the cache instead of
+        being compiled, when the same translation unit has been compiled before.
+        This function can be called from the worker threads. Thus, it must not touch any
+        member of this class. Messages are output through 'string_out' instead.
         cCompiler: Compiler command e.g. 'gcc'
-        includeStr: Include string e.g. '-I ./hoge/'
+        include_option_list: Include options e.g. ['-I', './hoge/']
         dRelevantFile: Reference to a hash which has source, object, dependency file path
+        string_out: Function which outputs the messages of this compilation
+        object_cache: Object cache to be used. None not to use the cache.
+        build_trace: Recorder of the time taken by the compilation. None not to record it.
         """
+        with trace_span(build_trace, relevant_files.src, BuildTrace.COMPILE,
+                        obj = relevant_files.obj) as trace_args:
+            compile_status = MakeFile.__compile_source(c_compiler, include_option_list,
+                                                       relevant_files, string_out, object_cache)
+            trace_args['status'] = compile_status.name
+        return compile_status
 
-        option_string = relevant_files.opt
-
+    @staticmethod
+    def __compile_source(c_compiler:str, include_option_list:List[str],
+                         relevant_files:_RelevantFiles, string_out,
+                         object_cache:Optional[ObjectCache])->CompileStatus:
+        """
+        This function is the body of '__issue_compile_command'. See it for the parameters.
+        """
         # Make compiling command
-        compile_cmd =(
-            f'{c_compiler} {option_string} {include_string}'
-            f' -c {relevant_files.src} -o {relevant_files.obj}'
-        )
+        compile_cmd = MakeFile.__get_compile_command(c_compiler, include_option_list,
+                                                     relevant_files)
 
         # Display the command.
-        self.__string_out(compile_cmd)
+        string_out(format_command(compile_cmd))
+
+        # Look up the object cache
+        cache_key:Optional[str] = None
+        if object_cache is not None:
+            preprocessed_source = MakeFile.__preprocess(c_compiler, include_option_list,
+                                                        relevant_files)
+            if preprocessed_source is not None:
+                cache_key = object_cache.compute_key(c_compiler,
+                                                     format_command(relevant_files.opt),
+                                                     preprocessed_source, relevant_files.src,
+                                                     relevant_files.obj)
+                if object_cache.fetch(cache_key, relevant_files.obj) is True:
+                    string_out('Served from the object cache: ' + relevant_files.obj)
+                    return MakeFile.CompileStatus.COMPILE_SUCCEEDED
 
-        # Execute the command and get the STDOUT.
         # Execute the command and get the output as binary
-        try:
-            whole_mssage_byte = subprocess.check_output(compile_cmd,
-                                                   stderr=subprocess.STDOUT,
-                                                   shell=True)
-        except subprocess.CalledProcessError as exception:
-            self.__string_out(exception.output.decode())
-            return self.CompileStatus.COMPILE_ERROR
+        result = run_command(compile_cmd)
+        if result.return_code != 0:
+            string_out(result.output.decode())
+            return MakeFile.CompileStatus.COMPILE_ERROR
 
         # Convert the binary into string
-        whole_message = whole_mssage_byte.decode()
+        whole_message = result.output.decode()
 
         # Display the result.
         if not whole_message == '':
-            self.__string_out(whole_message)
+            string_out(whole_message)
+
+        # Save the object for the next time.
+        if cache_key is not None:
+            object_cache.store(cache_key, relevant_files.obj)
 
         # No error message detected.
-        return self.CompileStatus.COMPILE_SUCCEEDED
+        return MakeFile.CompileStatus.COMPILE_SUCCEEDED
+
+    def __get_database(self, obj:str)->BuildDatabase:
+        """
+        This function returns the build database of the directory where the input object file
+        is located. The database is loaded from the file only once.
+        """
+        obj_dir = self.__get_directry(obj)
+        if obj_dir not in self.__database_dict:
+            self.__database_dict[obj_dir] = BuildDatabase(obj_dir)
+        return self.__database_dict[obj_dir]
+
+    def __save_databases(self):
+        """
+        This function saves all the modified build databases into the files.
+        """
+        for database in self.__database_dict.values():
+            database.save()
+
+    def __create_object_record(self, relevant_file:_RelevantFiles,
+                               with_digest:bool)->Optional[ObjectRecord]:
+        """
+        This function makes the record of the object file from its dependency file,
+        then saves it into the build database. Returns None if the record can't be made.
+        relevant_file: Reference to a hash which has source, object, dependency file path
+        with_digest: True to record the hash values of the files as well as the time stamps
+        """
+        database = self.__get_database(relevant_file.obj)
+
+        if os.path.exists(relevant_file.dep) is False:
+            database.remove_record(relevant_file.obj)
+            return None
+
+        compile_cmd = self.__get_compile_command(self.__compiler, self.__include_option_list,
+                                                 relevant_file)
+        related_file_list = parse_dependency_file(relevant_file.dep)
+        record = ObjectRecord.create(format_command(compile_cmd), related_file_list,
+                                     self.__hash_cache, with_digest)
+
+        if record is None:
+            # A related file does not exist.
+            database.remove_record(relevant_file.obj)
+        else:
+            database.set_record(relevant_file.obj, record)
+        return record
+
+    def __is_the_object_up_to_date_by_hash(self, relevant_file:_RelevantFiles)->bool:
+        """
+        This function checks if the object file is up-to-date by the record of it.
+        i.e. The compile command and the contents of all the related files are the same as
+        when the object file was built.
+        relevant_file: Reference to a hash which has source, object, dependency file path
+        """
+        database = self.__get_database(relevant_file.obj)
+        record = database.get_record(relevant_file.obj)
+        if record is None:
+            # No record, then the object file can't be trusted.
+            return False
+
+        compile_cmd = self.__get_compile_command(self.__compiler, self.__include_option_list,
+                                                 relevant_file)
+        state = record.check(format_command(compile_cmd), self.__hash_cache)
+
+        if state == RecordState.UP_TO_DATE_STAMP_CHANGED:
+            # Save the new time stamps, so that the files are not hashed again next time.
+            database.set_record(relevant_file.obj, record)
+
+        return state != RecordState.OUT_OF_DATE
 
     def __does_the_file_need_to_be_compiled(self, relevant_file:_RelevantFiles)->bool:
         """
@@ -211,50 +479,127 @@ class MakeFile:
         hRelevantFile_ref: Reference to a hash which has source, object, dependency file path
         """
 
+        # The object file does not exist, then compile the file.
+        if os.path.exists(relevant_file.obj) is False:
+            return True
+
+        # In the content hash mode, the time stamps are not compared.
+        if self.__rebuild_detection == RebuildDetection.CONTENT_HASH:
+            return self.__is_the_object_up_to_date_by_hash(relevant_file) is False
+
+        # Get the related files from the build database.
+        # If not recorded yet, make the record from the dependency file.
+        record = self.__get_database(relevant_file.obj).get_record(relevant_file.obj)
+        if record is None:
+            record = self.__create_object_record(relevant_file, with_digest = False)
+
+        if record is None:
+            # The dependency file or a related file does not exist.
+            # Then, compile the file.
+            return True
+
+        # Has the object file been compiled with the other command?
+        # (e.g. the options of the file have been changed in the configuration file)
+        compile_cmd = self.__get_compile_command(self.__compiler, self.__include_option_list,
+                                                 relevant_file)
+        if record.command != format_command(compile_cmd):
+            # Only this object file needs to be compiled again.
+            return True
+
         # Get the object file path from the hash
         object_file     = relevant_file.obj
 
-        # Get the dependency file path from the hash
-        dependency_file = relevant_file.dep
-
-        # Are both the object/dependency files exist?
-        if os.path.exists(object_file) and os.path.exists(dependency_file):
-            # Get the array which contains all the relational files to the source file.
-            related_file_list = self.__get_related_file_list(dependency_file)
-
-            for related_file in related_file_list:
-                if os.path.exists(related_file) is False:
-                    # A file in the related file list is not existing.
-                    # Compile the source anyway
-                    return True
-
-            # Is the object files newest compared to all the relative files?
-            if TimestampComp.is_the_file_latest(object_file, related_file_list) is True:
-                # Yes, the object file is up-to-date, skip the compiling.
-                return False
-            # One of the relative file is updated. Compile the source file.
+        # Get the array which contains all the relational files to the source file.
+        related_file_list = record.get_file_list()
+
+        # Get the time stamps of the object file and all the relative files at once.
+        # The time stamp is None if the file does not exist.
+        time_stamp_dict = self.__timestamp_cache.collect_timestamps([object_file] +
+                                                                    related_file_list)
+
+        if None in time_stamp_dict.values():
+            # A file in the related file list is not existing.
+            # Compile the source anyway
             return True
-        # One of the object/dependency files does not exist.
-        # Then, compile the file.
+
+        # Is the object files newest compared to all the relative files?
+        object_time = time_stamp_dict[object_file]
+        if all(time_stamp_dict[related_file] <= object_time
+                for related_file in related_file_list):
+            # Yes, the object file is up-to-date, skip the compiling.
+            return False
+        # One of the relative file is updated. Compile the source file.
         return True
 
+    def __does_the_file_need_to_be_compiled_traced(self, relevant_file:_RelevantFiles)->bool:
+        """
+        This function calls '__does_the_file_need_to_be_compiled' recording the time it takes.
+        """
+        with trace_span(self.__build_trace, relevant_file.obj, BuildTrace.SCAN) as trace_args:
+            is_required = self.__does_the_file_need_to_be_compiled(relevant_file)
+            trace_args['compile'] = is_required
+        return is_required
+
     @staticmethod
     def __get_directry(file_path:str)->str:
         return os.path.dirname(file_path)
 
 
-    def __compile_sources(self, compiler:str, include_path:str)->WholeCompileStatus:
+    def __output_object_cache_statistics(self):
         """
-        This function compile all the source files listed in the global array 'gaAllRelevantFiles'.
+        This function outputs the statistics of the object cache, and saves them in the cache.
+        """
+        statistics = self.__object_cache.get_statistics()
+        self.__string_out(f'Object cache: {statistics.hits} hits, {statistics.misses} misses, '
+                          f'{statistics.evictions} evictions')
+        self.__object_cache.save_statistics()
+
+    def set_jobs(self, jobs:int):
+        '''
+        This method sets the number of files compiled in parallel. 0 means the number of the cores.
+        '''
+        self.__jobs = jobs
+
+    def get_jobs(self)->int:
+        '''
+        This method returns the number of files compiled in parallel. 0 means the number of
+        the cores.
+        '''
+        return self.__jobs
+
+    def __get_job_count(self)->int:
+        """
+        This function returns the number of files to be compiled in parallel.
+        """
+        if self.__jobs > 0:
+            return self.__jobs
+
+        # Not specified, then use all the cores.
+        return os.cpu_count() or 1
+
+    def __compile_sources(self, compiler:str, include_option_list:List[str],
+                          relevant_file_list:List[_RelevantFiles],
+                          object_cache:Optional[ObjectCache],
+                          failed_file_list:Optional[List[_RelevantFiles]] = None
+                          )->WholeCompileStatus:
+        """
+        This function compile all the source files listed in 'relevant_file_list'.
         If the object file is already exist and it is the latest, this skips the compilation.
+        The files to be compiled are compiled in parallel by the worker threads. But the messages
+        are output in the order of the list per file.
         Returns NO_COMPILE_ERROR: If compilation finished without error.
         Returns AT_LEAST_ONE_COMPILE_ERROR: If at least one file finished with an error.
         Returns NO_COMPILED_FILE: If no file has been compiled.
         compiler: Compiler command e.g. 'gcc'
         aAllRelevantFiles_ref: Reference to the array which will contains all source, object,
         dependency file paths.
-        includeStr: Include string e.g. '-I ./hoge/'
+        include_option_list: Include options e.g. ['-I', './hoge/']
+        relevant_file_list: The files to be compiled
+        object_cache: Object cache to be used. None not to use the cache.
+        failed_file_list: The files which could not be compiled are appended, if given.
         """
+        if failed_file_list is None:
+            failed_file_list = []
 
         # Initialize the compile error indicator.
         # This value will be TRUE if at least one compile error happened.
@@ -264,38 +609,83 @@ class MakeFile:
         # This value will be TRUE if at least one file was compiled.
         does_compiled_file_exist:bool = False
 
-        # Start compiling for all source files in the array
-        for relative_files in self.__all_relevant_file_list:
-            # If the source file does NOT exists
-            if os.path.exists(relative_files.src) is False:
-                # The source file was not found
-                self.__string_out("Error: Could not find " + relative_files.src)
+        # The list of messages and compile jobs of each source file.
+        # The messages are stored here first, then output in the order of this list.
+        # Thus, the messages of the files compiled in parallel are not mixed.
+        compile_jobs:List[Tuple[List[str], Optional[Future]]] = []
 
-                # Error detected, set the error indicator 'TRUE'
-                is_compile_error = True
+        with ThreadPoolExecutor(max_workers = self.__get_job_count()) as executor:
+            # Start compiling for all source files in the array
+            # Which files need to be compiled is decided in this thread one by one, and only
+            # the compilations run in parallel.
+            for relative_files in relevant_file_list:
+                messages:List[str] = []
+                compile_job:Optional[Future] = None
 
-            # Check if the source file needs to be compiled
-            elif self.__does_the_file_need_to_be_compiled(relative_files) is True:
-                # The file need to be compiled
+                # If the source file does NOT exists
+                if os.path.exists(relative_files.src) is False:
+                    # The source file was not found
+                    messages.append("Error: Could not find " + relative_files.src)
 
-                # Capture object file folder path
-                obj_path = self.__get_directry(relative_files.obj)
+                    # Error detected, set the error indicator 'TRUE'
+                    is_compile_error = True
+                    failed_file_list.append(relative_files)
 
-                # If not exists, Create a folder where all object files will be stored.
-                self.__create_object_folder(obj_path)
+                # Check if the source file needs to be compiled
+                elif self.__does_the_file_need_to_be_compiled_traced(relative_files) is True:
+                    # The file need to be compiled
 
-                # Set the compile indicator 'TRUE'
-                does_compiled_file_exist = True
+                    # Capture object file folder path
+                    obj_path = self.__get_directry(relative_files.obj)
 
-                # Issue the compile command and check if it outputs error.
-                if (self.__issue_compile_command(compiler, include_path, relative_files) ==
-                    self.CompileStatus.COMPILE_ERROR):
-                    # Error detected, set the error indicator 'TRUE'
-                    is_compile_error = True
+                    # If not exists, Create a folder where all object files will be stored.
+                    self.__create_object_folder(obj_path)
 
-            else:
-                # The source file does not need to be compiled. skip.
-                self.__string_out('skip compiling ' + relative_files.obj)
+                    # Set the compile indicator 'TRUE'
+                    does_compiled_file_exist = True
+
+                    # The record will be made again after the compilation.
+                    self.__get_database(relative_files.obj).remove_record(relative_files.obj)
+
+                    # Issue the compile command in a worker thread.
+                    compile_job = executor.submit(self.__issue_compile_command,
+                                                  compiler, include_option_list, relative_files,
+                                                  messages.append, object_cache,
+                                                  self.__build_trace)
+
+                else:
+                    # The source file does not need to be compiled. skip.
+                    messages.append('skip compiling ' + relative_files.obj)
+
+                compile_jobs.append((messages, compile_job))
+
+            # Output the messages in order, waiting for each compilation.
+            for relative_files, (messages, compile_job) in zip(relevant_file_list, compile_jobs):
+                if compile_job is not None:
+                    # The object file and the dependency file have been written.
+                    self.__timestamp_cache.invalidate([relative_files.obj, relative_files.dep])
+
+                    # Check if the compile command output error.
+                    if compile_job.result() == self.CompileStatus.COMPILE_ERROR:
+                        # Error detected, set the error indicator 'TRUE'
+                        is_compile_error = True
+                        failed_file_list.append(relative_files)
+                    else:
+                        # Record what the object file has been built from.
+                        self.__create_object_record(
+                            relative_files,
+                            with_digest = (self.__rebuild_detection ==
+                                           RebuildDetection.CONTENT_HASH)
+                            )
+
+                for message in messages:
+                    self.__string_out(message)
+
+        # The dependency files need not to be parsed next time.
+        self.__save_databases()
+
+        if object_cache is not None and does_compiled_file_exist is True:
+            self.__output_object_cache_statistics()
 
         # Check the Compiling result
         # Error exists?
@@ -310,85 +700,331 @@ class MakeFile:
         # No files has been compiled.
         return self.WholeCompileStatus.NO_COMPILED_FILE
 
-    def __link_objects(self, compiler:str, option_string:str, target:str)->LinkStatus:
+    def __get_precompiled_header_list(self, relevant_file_list:List[_RelevantFiles]
+                                      )->List[_RelevantFiles]:
+        """
+        This function returns the precompiled headers to be made, and sets them to the C++ sources
+        using them. A precompiled header is made per compiler and set of options, because it can
+        be used only by the compilations with the same options.
+        Only the sources which opt in use it. (e.g. The test sources, not the product sources
+        nor the CppUTest library) The header is included before everything in the sources.
+        The precompiled header is made from the header including the declared header.
+        e.g. '<obj_dir>/<key>/TestHarness.h' -> '<obj_dir>/<key>/TestHarness.h.gch'
+        So, the sources including the former header use the latter one.
+        """
+        include_option_list = self.__get_precompiled_header_include_option_list()
+        precompiled_header_dict:Dict[str, _RelevantFiles] = {}
+        for relevant_file in relevant_file_list:
+            relevant_file.pch = ''
+            if self.__precompiled_header is None or relevant_file.use_pch is False or \
+               os.path.splitext(relevant_file.src)[1] not in \
+               self.__PRECOMPILED_HEADER_USER_EXTENSIONS:
+                continue
+
+            key_source = '\n'.join([self.__compiler, format_command(relevant_file.opt),
+                                    format_command(include_option_list)])
+            key = hashlib.sha1(key_source.encode()).hexdigest()[:16]
+            header = (f'{self.__precompiled_header.obj_dir}/{key}/'
+                      f'{os.path.basename(self.__precompiled_header.path)}')
+
+            if header not in precompiled_header_dict:
+                # The dependency file is always made to track the headers included.
+                dependency_option_list = []
+                if not set(relevant_file.opt) & {'-MD', '-MMD'}:
+                    dependency_option_list = ['-MMD']
+                precompiled_header_dict[header] = _RelevantFiles(
+                    src = header,
+                    obj = header + '.gch',
+                    dep = header + '.d',
+                    opt = relevant_file.opt + dependency_option_list + ['-x', 'c++-header'],
+                    include_opt = include_option_list
+                    )
+            relevant_file.pch = header
+
+        return list(precompiled_header_dict.values())
+
+    def __get_precompiled_header_include_option_list(self)->List[str]:
+        """
+        This function returns the include options to make the precompiled headers.
+        """
+        if self.__precompiled_header_include_option_list is None:
+            return self.__include_option_list
+        return self.__precompiled_header_include_option_list
+
+    @staticmethod
+    def __get_include_directive(file_path:str)->str:
+        """
+        This function returns the line including the file by the absolute path.
+        So, the file including it can be anywhere.
+        """
+        absolute_path = os.path.abspath(file_path).replace('\\', '/')
+        return f'#include "{absolute_path}"\n'
+
+    def __write_generated_source(self, file_path:str, contents:str):
+        """
+        This function writes the source generated by this class. e.g. The header precompiled
+        The file is written only if its contents change, not to make the objects made from it
+        out-of-date.
+        """
+        try:
+            with open(file_path, 'r', encoding = 'UTF-8') as source_file:
+                if source_file.read() == contents:
+                    return
+        except OSError:
+            # Not written yet
+            pass
+
+        with open(file_path, 'w', encoding = 'UTF-8') as source_file:
+            source_file.write(contents)
+        self.__timestamp_cache.invalidate([file_path])
+
+    def __make_precompiled_headers(self, relevant_file_list:List[_RelevantFiles]):
+        """
+        This function makes the precompiled headers which are out-of-date, before the sources
+        using them are compiled. The staleness is checked in the same way as the object files.
+        The precompiled headers shared with the other make files are locked while they are made.
+        If a precompiled header could not be made, the sources are compiled with the header
+        itself instead.
+        relevant_file_list: The files to be compiled, which use the precompiled headers
+        """
+        precompiled_header_list = self.__get_precompiled_header_list(relevant_file_list)
+        if len(precompiled_header_list) == 0:
+            return
+
+        with contextlib.ExitStack() as stack:
+            # Lock in the order of the paths not to be deadlocked.
+            for precompiled_header in sorted(precompiled_header_list,
+                                             key = lambda relevant_file: relevant_file.obj):
+                stack.enter_context(_get_precompiled_header_lock(precompiled_header.obj))
+
+            for precompiled_header in precompiled_header_list:
+                self.__create_object_folder(self.__get_directry(precompiled_header.src))
+                self.__write_generated_source(
+                    precompiled_header.src,
+                    self.__get_include_directive(self.__precompiled_header.path))
+
+            # The precompiled headers are not stored in the object cache, since they are large.
+            failed_file_list:List[_RelevantFiles] = []
+            self.__compile_sources(self.__compiler, self.__include_option_list,
+                                   precompiled_header_list, None, failed_file_list)
+
+            if len(failed_file_list) > 0:
+                # Remove the old precompiled headers, which may have been made from
+                # the old header.
+                for precompiled_header in failed_file_list:
+                    self.__remove_file(precompiled_header.obj)
+                self.__string_out('Warning: The precompiled header could not be made. '
+                                  'The sources are compiled without it.')
+
+    def __get_unity_batch_list(self)->List[_UnityBatch]:
+        """
+        This function returns the batches of the unity build. The source files of the same
+        language, object folder and options are batched in the order of the list.
+        The batch is named by its members. e.g. '<obj_dir>/Unity_0123456789ab.cpp'
+        Returns an empty list if the unity build is not used.
+        """
+        if self.__unity_build is None:
+            return []
+
+        group_dict:Dict[Tuple[str, str, Tuple[str, ...]], List[_RelevantFiles]] = {}
+        for relevant_file in self.__all_relevant_file_list:
+            if self.__unity_build.exclude_coverage is True and \
+               not set(relevant_file.opt).isdisjoint(self.__COVERAGE_OPTIONS):
+                continue
+            key = (os.path.splitext(relevant_file.src)[1], self.__get_directry(relevant_file.obj),
+                   tuple(relevant_file.opt), relevant_file.use_pch)
+            group_dict.setdefault(key, []).append(relevant_file)
+
+        batch_size = max(self.__unity_build.batch_size, 1)
+        batch_list = []
+        for (extension, obj_path, _, use_pch), member_list in group_dict.items():
+            for index in range(0, len(member_list), batch_size):
+                batch_member_list = member_list[index:index + batch_size]
+                if len(batch_member_list) < 2:
+                    # A source file alone is compiled as it is.
+                    continue
+
+                member_key = '\n'.join(member.src for member in batch_member_list)
+                name = (self.__UNITY_SOURCE_PREFIX +
+                        hashlib.sha1(member_key.encode()).hexdigest()[:12])
+                unity = _RelevantFiles(
+                    src = obj_path + '/' + name + extension,
+                    obj = obj_path + '/' + name + '.o',
+                    dep = obj_path + '/' + name + '.d',
+                    opt = list(batch_member_list[0].opt),
+                    use_pch = use_pch
+                    )
+                batch_list.append(_UnityBatch(unity = unity, member_list = batch_member_list))
+
+        return batch_list
+
+    @staticmethod
+    def __combine_compile_status(status_list:List[WholeCompileStatus])->WholeCompileStatus:
+        """
+        This function returns the compile status of the compilations as a whole.
+        """
+        if MakeFile.WholeCompileStatus.AT_LEAST_ONE_COMPILE_ERROR in status_list:
+            return MakeFile.WholeCompileStatus.AT_LEAST_ONE_COMPILE_ERROR
+        if MakeFile.WholeCompileStatus.NO_COMPILE_ERROR in status_list:
+            return MakeFile.WholeCompileStatus.NO_COMPILE_ERROR
+        return MakeFile.WholeCompileStatus.NO_COMPILED_FILE
+
+    def __compile_all_sources(self)->WholeCompileStatus:
+        """
+        This function compiles all the source files, and decides the object files to be linked.
+        With the unity build, the source files of a batch are compiled as one translation unit,
+        which is generated in the object folder. If a batch could not be compiled, its source
+        files are compiled one by one, so that the errors are found per file.
+        The return value is the same as '__compile_sources'.
+        """
+        batch_list = self.__get_unity_batch_list()
+        batch_dict = {member.obj: batch for batch in batch_list for member in batch.member_list}
+
+        for batch in batch_list:
+            self.__create_object_folder(self.__get_directry(batch.unity.src))
+            self.__write_generated_source(batch.unity.src,
+                                          ''.join(self.__get_include_directive(member.src)
+                                                  for member in batch.member_list))
+
+        # The translation units in the order of the source files. A batch is placed at its first
+        # member.
+        compile_list = []
+        for relevant_file in self.__all_relevant_file_list:
+            batch = batch_dict.get(relevant_file.obj)
+            if batch is None:
+                compile_list.append(relevant_file)
+            elif relevant_file is batch.member_list[0]:
+                compile_list.append(batch.unity)
+
+        self.__make_precompiled_headers(self.__all_relevant_file_list +
+                                        [batch.unity for batch in batch_list])
+
+        failed_file_list:List[_RelevantFiles] = []
+        status_list = [self.__compile_sources(self.__compiler, self.__include_option_list,
+                                              compile_list, self.__object_cache,
+                                              failed_file_list)]
+
+        # Compile the members of the batches failed one by one.
+        failed_batch_list = [batch for batch in batch_list if batch.unity in failed_file_list]
+        if len(failed_batch_list) > 0:
+            fallback_list = []
+            for batch in failed_batch_list:
+                self.__string_out(f'The unity build of {batch.unity.src} failed. '
+                                  'Compiling the source files one by one.')
+                fallback_list += batch.member_list
+
+            # The batches failed are not the errors by themselves. Their members decide it.
+            failed_unity_list = [batch.unity for batch in failed_batch_list]
+            if all(relevant_file in failed_unity_list for relevant_file in failed_file_list):
+                status_list = [self.WholeCompileStatus.NO_COMPILE_ERROR]
+            status_list.append(self.__compile_sources(self.__compiler, self.__include_option_list,
+                                                      fallback_list, self.__object_cache))
+
+        # Link the object of a batch instead of the ones of its members.
+        self.__link_object_list = []
+        for relevant_file in self.__all_relevant_file_list:
+            batch = batch_dict.get(relevant_file.obj)
+            if batch is None or batch in failed_batch_list:
+                self.__link_object_list.append(relevant_file.obj)
+            elif relevant_file is batch.member_list[0]:
+                self.__link_object_list.append(batch.unity.obj)
+
+        return self.__combine_compile_status(status_list)
+
+    def __get_link_object_list(self)->List[str]:
+        """
+        This function returns the object files linked into the target.
+        """
+        if self.__link_object_list is None:
+            return [relevant_file.obj for relevant_file in self.__all_relevant_file_list]
+        return self.__link_object_list
+
+    def __is_library_target(self)->bool:
+        """
+        This function returns TRUE if the target is a static library, not an executable.
+        """
+        return os.path.splitext(self.__target_path)[1] in ('.a', '.lib')
+
+    def __get_link_command(self, compiler:str, option_list:List[str], target:str)->List[str]:
+        """
+        This function returns the command linking all the object files into the target.
+        If the target is a static library, the command archives the object files instead.
+        """
+
+        # All the object files to be linked
+        all_object = self.__get_link_object_list()
+
+        # Make the command
+        if self.__is_library_target() is True:
+            return [self.__archiver, 'rcs', target] + all_object
+
+        # The static libraries must follow the objects which refer them.
+        return [compiler] + option_list + ['-o', target] + all_object + self.__library_list
+
+    def __link_objects(self, compiler:str, option_list:List[str], target:str)->LinkStatus:
         """
         This function links all the object files listed in the global array 'gaAllRelevantFiles'.
         And generates target executable file.
+        If the target is a static library, the object files are archived into it instead.
+        A long command is executed with a response file, since it may exceed the limit of
+        the command line. (e.g. hundreds of the object files)
         compiler: Compiler command e.g. 'gcc'
         aAllRelevantFiles_ref: Reference to the array which will contains all source, object,
         dependency file paths.
-        option_string: Option string e.g. '-Wall -O'
+        option_list: Linker options e.g. ['-Wall', '-O']
         targetStr:
         """
 
-        # Define/initialize the string which will contain all object file to be linked.
-        all_object = ''
+        with trace_span(self.__build_trace, target, BuildTrace.LINK) as trace_args:
+            link_status = self.__run_link_command(compiler, option_list, target)
+            trace_args['status'] = link_status.name
 
-        # Append all object files in the array
-        for relevant_file in self.__all_relevant_file_list:
-            all_object = all_object + relevant_file.obj + ' '
+        # The target has been written.
+        self.__timestamp_cache.invalidate([target])
+        return link_status
 
+    def __run_link_command(self, compiler:str, option_list:List[str], target:str)->LinkStatus:
+        """
+        This function is the body of '__link_objects'. See it for the parameters.
+        """
         # Make the command
-        cmd = f'{compiler} {option_string} -o {target} {all_object}'
+        cmd = self.__get_link_command(compiler, option_list, target)
+
+        if self.__is_library_target() is True:
+            # Remove the old library not to leave the objects which are not listed anymore.
+            self.__remove_file(target)
 
         # Display the command
-        self.__string_out(cmd)
+        self.__string_out(format_command(cmd))
 
-        try:
-            whole_mssage_byte = subprocess.check_output(cmd,
-                                                   stderr=subprocess.STDOUT,
-                                                   shell=True)
-        except subprocess.CalledProcessError as exception:
-            self.__string_out(exception.output.decode())
+        result = run_command(cmd)
+        if result.return_code != 0:
+            self.__string_out(result.output.decode())
             return self.LinkStatus.LINK_ERROR
 
         # Convert the binary into string
-        whole_message = whole_mssage_byte.decode()
+        whole_message = result.output.decode()
 
         # Display the result.
         if not whole_message == '':
             self.__string_out(whole_message)
 
+        # Record the command and the contents of the inputs which the target has been linked with.
+        # So, the target is not linked again if they have not changed.
+        input_list = self.__get_link_object_list()
+        if self.__is_library_target() is False:
+            input_list = input_list + self.__library_list
+        record = ObjectRecord.create(format_command(cmd), input_list, self.__hash_cache)
+        if record is None:
+            # An input has been removed while linking. The target will be linked next time.
+            record = ObjectRecord(command = '', files = {})
+        database = self.__get_database(target)
+        database.set_record(target, record)
+        database.save()
+
         # No error message detected.
         return self.LinkStatus.LINK_SUCCEEDED
 
-    @staticmethod
-    def __get_related_file_list(file_path:str)->List[str]:
-        """
-        This function returns the array containing all relative files found in the input .d file
-        file_path: Dependency file path
-        """
-
-        # Define/initialize the array of relative file found in the input .d file
-        file_list = []
-
-        # Open the dependency file.
-        with open(file_path, 'r', encoding = 'UTF-8') as in_file:
-
-            lines = in_file.readlines()
-
-            # Read the file line by line.
-            for line in lines:
-                # Clean the line string
-                # Remove the object file
-                line = re.sub(r'.+\:', '', line)
-                # Remove '\'
-                line = re.sub(r'\\', '', line)
-                # Remove a space at the top.
-                line = re.sub(r'^\s+', '', line)
-                # Remove a space at the bottom.
-                line = re.sub(r'\s+$', '', line)
-
-                # Split the line into relevant files
-                file_list += re.split(r'\s+', line)
-
-
-        # Remove blank member just in case
-        file_list = [file for file in file_list if file != '']
-
-        # Return the array of the related files
-        return file_list
-
     def __is_linking_requiered(self, target_path:str, compile_states:WholeCompileStatus)->bool:
         """
         This function returns TRUE if the linking required. Returns FALSE if not.
@@ -396,27 +1032,53 @@ class MakeFile:
         compile_states: Compile state should be return value of the 'CompileSources'
         """
 
-        # If at least one source file was updated and compiled without error.
-        if compile_states == self.WholeCompileStatus.NO_COMPILE_ERROR:
-            # Linking is required anyway.
-            return True
-
         # If at least one error happened.
         if compile_states == self.WholeCompileStatus.AT_LEAST_ONE_COMPILE_ERROR:
             # Skip linking due to the error
             self.__string_out('Skip linking, because at least one compile error happened.')
             return False
 
-        # If no compiled file exists
-        # compile_states == self.WholeCompileStatus.NO_COMPILED_FILE
-        # If the executable exists,
-        if os.path.exists('./' + target_path) is True:
-            # Skip linking because no updated source file, and the executable exists.
+        # No executable, then linking is required anyway.
+        if os.path.exists(target_path) is False:
+            return True
+
+        # Has the link command changed? (e.g. linker options or the object files)
+        link_cmd = self.__get_link_command(self.__compiler, self.__linker_option_list,
+                                           target_path)
+        database = self.__get_database(target_path)
+        record = database.get_record(target_path)
+        if record is None or record.command != format_command(link_cmd):
+            # The executable has been linked with the other command, then link again.
+            return True
+
+        if len(record.files) == 0:
+            # The inputs have not been recorded. (Linked by the older version)
+            # Then, link if a source has been compiled or a library is newer.
+            if compile_states == self.WholeCompileStatus.NO_COMPILE_ERROR or \
+               self.__timestamp_cache.is_the_file_latest(target_path,
+                                                         self.__library_list) is False:
+                return True
             self.__string_out('Skip linking, because nothing has been updated.')
             return False
-        # No compiled file, but there isn't executable file,
-        # then linking is required.
-        return True
+
+        # Have the contents of the objects or the libraries changed? The files whose time stamps
+        # have not changed are not read. So, this is cheap if nothing has been compiled.
+        state = record.check(format_command(link_cmd), self.__hash_cache)
+        if state == RecordState.OUT_OF_DATE:
+            return True
+
+        if state == RecordState.UP_TO_DATE_STAMP_CHANGED:
+            # e.g. Only a comment has been modified, and the object file is the same as before.
+            # Save the new time stamps, so that the files are not hashed again next time.
+            database.set_record(target_path, record)
+            database.save()
+            self.__string_out('Skip linking, because the objects and the libraries have not '
+                              'changed.')
+            return False
+
+        # Skip linking because no updated source file, and the executable exists.
+        self.__string_out('Skip linking, because nothing has been updated.')
+        return False
 
     def __is_the_executable_valid(self, compile_state:WholeCompileStatus,
                                      link_state:LinkStatus)->ExecutableStatus:
@@ -440,11 +1102,13 @@ class MakeFile:
         # No error, then the execute file is valid
         return ExecutableStatus.EXECUTABLE_VALID
 
-    def add_src(self, source_file:str, options:List[str], obj_path:str)->str:
+    def add_src(self, source_file:str, options:List[str], obj_path:str,
+                use_precompiled_header:bool = False)->str:
         """
         source_file:
         aOption_ref:
         obj_path:
+        use_precompiled_header: True to compile the C++ source with the precompiled header
         """
 
         # Make all the relevant file array for each source file
@@ -455,7 +1119,8 @@ class MakeFile:
                 src = source_file,
                 obj = obj_path + '/' + file_name + '.o',
                 dep = obj_path + '/' + file_name + '.d',
-                opt = self.__option_list_to_command(options)
+                opt = list(options),
+                use_pch = use_precompiled_header
                 )
 
             # Append a instance which will contains all source, object, dependency file paths.
@@ -468,64 +1133,177 @@ class MakeFile:
         self.__string_out('>>> ' + source_file)
         return ''
 
+    def add_include_path(self, include_path_list:List[str]):
+        '''
+        This method appends the include paths used to compile all the source files.
+        '''
+        self.__include_path_list += include_path_list
+        self.__include_option_list += self.__include_path_list_to_options(include_path_list)
+
+    def set_object_cache(self, object_cache:Optional[ObjectCache]):
+        '''
+        This method sets the object cache used to compile the source files.
+        The same cache object can be shared by the make files.
+        '''
+        self.__object_cache = object_cache
+
+    def set_build_trace(self, build_trace:Optional[BuildTrace]):
+        '''
+        This method sets the recorder of the time taken by each phase. e.g. Each compilation
+        The same recorder can be shared by the make files.
+        '''
+        self.__build_trace = build_trace
+
+    def set_timestamp_cache(self, timestamp_cache:TimestampCache):
+        '''
+        This method sets the cache of the time stamps shared with the other make files of
+        the build session. e.g. The make files of the modules share the cache of the test harness.
+        The cache is not cleared by this make file. The owner of it must clear it when the files
+        may have been modified outside. e.g. Before the next session.
+        '''
+        self.__timestamp_cache = timestamp_cache
+        self.__is_timestamp_cache_shared = True
+
+    def get_timestamp_cache(self)->TimestampCache:
+        '''
+        This method returns the cache of the time stamps used by this make file.
+        '''
+        return self.__timestamp_cache
+
+    def set_config_cache(self, config_cache:MakeConfigCache):
+        '''
+        This method sets the cache of the configuration files used by 'load_json_makefile'.
+        '''
+        self.__config_cache = config_cache
+
+    def set_precompiled_header(self, precompiled_header:Optional[PrecompiledHeaderConfig],
+                               include_path_list:List[str]):
+        '''
+        This method sets the header precompiled for the C++ sources, which is shared with
+        the other make files. e.g. The test modules use the one declared by the test harness.
+        The precompiled headers are made with the include paths of the owner, so that they are
+        shared by the make files whose include paths are different.
+        The precompiled headers are not removed by 'clear' of this make file. The owner of them
+        removes them.
+        '''
+        self.__precompiled_header = precompiled_header
+        self.__is_precompiled_header_shared = True
+        self.__precompiled_header_include_option_list = \
+            self.__include_path_list_to_options(include_path_list)
+
+    def set_unity_build(self, unity_build:Optional[UnityBuildConfig]):
+        '''
+        This method sets the unity build, which compiles the source files in batches.
+        None not to batch them.
+        '''
+        self.__unity_build = unity_build
+
+    def is_test_result_cached(self)->bool:
+        '''
+        This method returns TRUE if the result of the target executable can be replayed from
+        the cache while the executable is not changed.
+        '''
+        return self.__is_test_result_cached
+
+    def is_coverage_instrumented(self)->bool:
+        '''
+        This method returns TRUE if the target is built with the coverage options. Then, the
+        executable writes the coverage data files (.gcda) whenever it is executed.
+        '''
+        option_set = set(self.__linker_option_list)
+        for relevant_file in self.__all_relevant_file_list:
+            option_set.update(relevant_file.opt)
+        return not option_set.isdisjoint(self.__COVERAGE_OPTIONS)
+
+    def get_precompiled_header(self)->Optional[PrecompiledHeaderConfig]:
+        '''
+        This method returns the header precompiled for the C++ sources. None if not used.
+        '''
+        return self.__precompiled_header
+
+    def add_library(self, library_path:str):
+        '''
+        This method appends a static library to be linked with the object files.
+        '''
+        self.__library_list.append(library_path)
+
     def load_json_makefile(self, json_path):
         '''
         This method read a json file which contains source files to be compiled and
         associated compile options
+        The file is parsed only once while it is not modified. See MakeConfigCache.
         '''
-        dir_path = os.path.dirname(json_path)
-        def get_path_from_root(path:str):
-            tmp_path = dir_path + '/' + path
-            return tmp_path.replace(r'/./', '/')
-
-        with  open(json_path, 'r', encoding = 'UTF-8') as json_file:
+        with trace_span(self.__build_trace, json_path, BuildTrace.CONFIG):
             try:
-                makefile_dict = jsonc.load(json_file)
-
-                # Overwrite
-                if 'compiler' in makefile_dict:
-                    self.__compiler = makefile_dict['compiler']
-
-                # Overwrite
-                if 'target' in makefile_dict:
-                    self.__target_path = get_path_from_root(makefile_dict['target'])
-
-                # Overwrite
-                if 'linker_option' in makefile_dict:
-                    self.__linker_option_string = self.__option_list_to_command(
-                        makefile_dict['linker_option']
-                        )
-
-                # Append
-                if 'include_path' in makefile_dict:
-                    include_path_list = [get_path_from_root(path) for path
-                                            in makefile_dict["include_path"]]
-                    include_str = self.__include_path_list_to_command(include_path_list)
-                    self.__include_string  += f' {include_str}'
-
-                # Get the global options
-                global_opt_list = []
-                if 'global_option' in makefile_dict:
-                    global_opt_list = makefile_dict['global_option']
-
-                # Append
-                obj_list = []
-                if 'source_file' in makefile_dict:
-                    for source in makefile_dict['source_file']:
-                        # Extend the option list
-                        option = global_opt_list + source['opt']
-                        obj_list.append(self.add_src(
-                            get_path_from_root(source['path']),
-                            option,
-                            get_path_from_root(source['obj_dir'])
-                            ))
-
-                return obj_list
+                config = self.__config_cache.load(json_path)
             except jsonc.JsonWithCommentsDecodeError as josnc_load_error:
                 self.__string_out('In the file '+json_path+'.')
                 self.__string_out(josnc_load_error.args[0])
                 raise MakeConfigLoadError(josnc_load_error.args[0]) from josnc_load_error
 
+        # Overwrite
+        if config.compiler is not None:
+            self.__compiler = config.compiler
+
+        # Overwrite
+        if config.target is not None:
+            self.__target_path = config.target
+
+        # Overwrite
+        if config.jobs is not None:
+            self.__jobs = config.jobs
+
+        # Overwrite
+        if config.rebuild_detection is not None:
+            try:
+                self.__rebuild_detection = RebuildDetection(config.rebuild_detection)
+            except ValueError as value_error:
+                self.__string_out('In the file '+json_path+'.')
+                self.__string_out('Unknown rebuild_detection: ' + str(config.rebuild_detection))
+                raise MakeConfigLoadError(value_error.args[0]) from value_error
+
+        # Overwrite
+        if config.object_cache is not None:
+            self.__object_cache = get_shared_object_cache(config.object_cache.path,
+                                                          config.object_cache.max_size)
+
+        # Overwrite
+        if config.archiver is not None:
+            self.__archiver = config.archiver
+
+        # Overwrite
+        if config.linker_option is not None:
+            self.__linker_option_list = list(config.linker_option)
+
+        # Overwrite
+        if config.precompiled_header is not None:
+            self.__precompiled_header = config.precompiled_header
+            self.__is_precompiled_header_shared = False
+            self.__precompiled_header_include_option_list = None
+
+        # Overwrite
+        if config.unity_build is not None:
+            self.set_unity_build(config.unity_build)
+
+        # Overwrite
+        if config.test_result_cache is not None:
+            self.__is_test_result_cached = config.test_result_cache
+
+        # Append
+        if len(config.include_path) > 0:
+            self.add_include_path(list(config.include_path))
+
+        # Append
+        for library_path in config.library:
+            self.add_library(library_path)
+
+        # Append
+        obj_list = []
+        for source in config.source_file:
+            obj_list.append(self.add_src(source.path, list(source.opt), source.obj_dir,
+                                         source.use_precompiled_header))
+
+        return obj_list
 
     def get_all_object_path(self):
         '''
@@ -539,6 +1317,50 @@ class MakeFile:
         '''
         return self.__target_path
 
+    def get_include_path_list(self)->List[str]:
+        '''
+        This method return the include paths used to compile the source files
+        '''
+        return list(self.__include_path_list)
+
+    def get_dependency_list(self)->Optional[List[str]]:
+        """
+        This function returns all the files the target depends on. i.e. The source files, the
+        files they include, and the libraries. The included files are taken from the build
+        databases or the dependency files (.d) made by the last make.
+        Returns None if an object file has not been made yet, because its dependencies are not
+        known.
+        """
+        # The batched source files are recorded as the batches by the unity build.
+        unity_dict = {member.obj: batch.unity for batch in self.__get_unity_batch_list()
+                        for member in batch.member_list}
+
+        dependency_list = []
+        for relevant_file in self.__all_relevant_file_list:
+            record = None
+            if relevant_file.obj in unity_dict:
+                unity = unity_dict[relevant_file.obj]
+                record = self.__get_database(unity.obj).get_record(unity.obj)
+            if record is None:
+                record = self.__get_database(relevant_file.obj).get_record(relevant_file.obj)
+            if record is not None:
+                dependency_list += record.get_file_list()
+            elif os.path.exists(relevant_file.dep):
+                dependency_list += parse_dependency_file(relevant_file.dep)
+            else:
+                return None
+
+        dependency_list += self.__library_list
+
+        # Remove the duplicated files keeping the order
+        return list(dict.fromkeys(dependency_list))
+
+    def get_build_times(self)->BuildTimes:
+        """
+        This function returns the seconds taken to compile and link by the last make/build.
+        """
+        return dataclasses.replace(self.__build_times)
+
     def make(self)->ExecutableStatus:
         """
         This function will make target object executable file. But only out-of-date source files
@@ -547,21 +1369,32 @@ class MakeFile:
         Then return the compile state.
         """
 
-        TimestampComp.clear_time_stamp_dict()
+        # The files may have been modified since the last make.
+        if self.__is_timestamp_cache_shared is False:
+            self.__timestamp_cache.clear()
+
+        self.__build_times = BuildTimes()
+
+        # The object folders may have been removed since the last make.
+        self.__created_folder_set = set()
 
         # Compile all the sources and get the status
-        compile_state = self.__compile_sources(self.__compiler, self.__include_string)
+        start_time = time.perf_counter()
+        compile_state = self.__compile_all_sources()
+        self.__build_times.compile_time = time.perf_counter() - start_time
 
         link_state = None
 
         # Check if linking is required
         if self.__is_linking_requiered(self.__target_path, compile_state) is True:
             # If required, then link them
+            start_time = time.perf_counter()
             link_state = self.__link_objects(
                 self.__compiler,
-                self.__linker_option_string,
+                self.__linker_option_list,
                 self.__target_path
                 )
+            self.__build_times.link_time = time.perf_counter() - start_time
         else:
             link_state = self.LinkStatus.LINK_SKIPPED
 
@@ -571,25 +1404,87 @@ class MakeFile:
         if os.path.exists(file_path):
             self.__string_out('Removing ' + file_path.replace('\\', '/'))
             os.remove(file_path)
+            self.__timestamp_cache.invalidate([file_path])
+
+    def __remove_empty_folder(self, folder_path:str):
+        try:
+            os.rmdir(folder_path)
+            self.__string_out('Removing ' + folder_path.replace('\\', '/'))
+        except OSError:
+            # The folder does not exist or holds the other files.
+            pass
 
     def clear(self):
         """
         This function removes all the object/dependency files in the object folder.
+        The coverage data files (.gcda, .gcno) and the sources generated by the unity build are
+        removed as well. The other files in the folder are left, since they are not made by
+        this class.
         Removes the target executable file as well.
         """
-        for all_relevant_files in self.__all_relevant_file_list:
-            obj_path = self.__get_directry(all_relevant_files.obj)
-
-            # Get the list of all files in the object path
-            files = glob.glob(obj_path+r'\*')
+        # The object folders in the order of the source files, without duplication
+        obj_path_list = list(dict.fromkeys(self.__get_directry(relevant_file.obj)
+                                           for relevant_file in self.__all_relevant_file_list))
+
+        # The folders of the precompiled headers of all the options, if this make file owns them
+        precompiled_header_path_list = self.__get_owned_precompiled_header_path_list()
+        obj_path_list += [self.__get_directry(path) for path in precompiled_header_path_list]
+        for path in precompiled_header_path_list:
+            self.__remove_file(path)
+
+        for obj_path in obj_path_list:
+            # Remove the files made by the compilation in the object directly
+            try:
+                with os.scandir(obj_path if obj_path != '' else '.') as entries:
+                    for entry in entries:
+                        if (os.path.splitext(entry.name)[1] in self.__OBJECT_FOLDER_EXTENSIONS or
+                            self.__is_unity_source(entry.name)) and entry.is_file():
+                            self.__remove_file(entry.path)
+            except FileNotFoundError:
+                # The object folder has not been made yet.
+                pass
+
+            # Remove the build database
+            self.__remove_file(f'{obj_path}/{BuildDatabase.DATABASE_FILE_NAME}')
+
+        # Remove the folders of the precompiled headers, and the folder holding them, which are
+        # made only for the precompiled headers. The folders holding the other files are left.
+        if len(precompiled_header_path_list) > 0:
+            pch_folder_list = [self.__get_directry(path) for path in precompiled_header_path_list]
+            for folder_path in pch_folder_list + [self.__precompiled_header.obj_dir]:
+                self.__remove_empty_folder(folder_path)
+
+        # Forget the build databases loaded
+        self.__database_dict = {}
 
-            # Remove all files in the object directly
-            for file in files:
-                # Remove a file
-                self.__remove_file(file)
         # Remove the target file
         self.__remove_file(self.__target_path)
 
+    def __is_unity_source(self, file_name:str)->bool:
+        """
+        This function returns TRUE if the file is a source generated by the unity build.
+        """
+        return file_name.startswith(self.__UNITY_SOURCE_PREFIX) and \
+               self.__check_source_file_extention(file_name)[0] is True
+
+    def __get_owned_precompiled_header_path_list(self)->List[str]:
+        """
+        This function returns the headers which the precompiled headers are made from, in all
+        the folders of the options. e.g. ['<obj_dir>/<key>/TestHarness.h']
+        Returns an empty list if this make file does not own the precompiled headers.
+        """
+        if self.__precompiled_header is None or self.__is_precompiled_header_shared is True:
+            return []
+
+        header_name = os.path.basename(self.__precompiled_header.path)
+        try:
+            with os.scandir(self.__precompiled_header.obj_dir) as entries:
+                return [f'{self.__precompiled_header.obj_dir}/{entry.name}/{header_name}'
+                            for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            # No precompiled header has been made yet.
+            return []
+
     def build(self)->ExecutableStatus:
         """
         This function will compile all source files in any cases.
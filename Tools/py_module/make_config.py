@@ -0,0 +1,298 @@
+'''
+ This module provides the loader of the configuration files of MakeFile. e.g. 'MakeConfig.jsonc'
+ A configuration file is parsed once into an immutable object whose paths are resolved, and
+ the object is cached. The cache entry is valid while the time stamp and the size of the file
+ are the same. So, the configuration files loaded for every module (e.g. the global one) are not
+ parsed again in a run. The cache can be saved in a file to be used by the next runs as well.
+'''
+import os
+import json
+import threading
+import dataclasses
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from . import jsonc # pylint: disable=no-name-in-module
+
+@dataclasses.dataclass(frozen = True)
+class SourceConfig:
+    '''
+     This data class represents a source file written in the configuration file.
+    '''
+    path: str            # Path to the source file
+    opt: Tuple[str, ...] # 'global_option' followed by the options of the file
+    obj_dir: str         # Directory where the object file is made
+    use_precompiled_header: bool = False # True to compile it with the precompiled header
+
+@dataclasses.dataclass(frozen = True)
+class ObjectCacheConfig:
+    '''
+     This data class represents the 'object_cache' written in the configuration file.
+    '''
+    path: str     # Directory of the cache
+    max_size: int # Bytes
+
+@dataclasses.dataclass(frozen = True)
+class PrecompiledHeaderConfig:
+    '''
+     This data class represents the 'precompiled_header' written in the configuration file.
+    '''
+    path: str    # Header to be precompiled. e.g. 'TestHarnessPch.h'
+    obj_dir: str # Directory where the precompiled headers are made
+
+@dataclasses.dataclass(frozen = True)
+class UnityBuildConfig:
+    '''
+     This data class represents the 'unity_build' written in the configuration file.
+    '''
+    batch_size: int = 8            # The maximum number of the sources compiled together
+    exclude_coverage: bool = True  # True not to batch the sources compiled for the coverage
+
+@dataclasses.dataclass(frozen = True)
+class MakeConfig:
+    '''
+     This data class represents the contents of a configuration file.
+     The paths are resolved from the directory where the configuration file is located.
+     None means the item is not written in the file.
+    '''
+    compiler: Optional[str]                      = None
+    target: Optional[str]                        = None
+    jobs: Optional[int]                          = None
+    rebuild_detection: Optional[str]             = None
+    object_cache: Optional[ObjectCacheConfig]    = None
+    archiver: Optional[str]                      = None
+    linker_option: Optional[Tuple[str, ...]]     = None
+    precompiled_header: Optional[PrecompiledHeaderConfig] = None
+    unity_build: Optional[UnityBuildConfig]      = None
+    test_result_cache: Optional[bool]            = None
+    include_path: Tuple[str, ...]                = ()
+    library: Tuple[str, ...]                     = ()
+    source_file: Tuple[SourceConfig, ...]        = ()
+
+    @classmethod
+    def from_json(cls, makefile_dict:Dict[str, Any], json_path:str)->'MakeConfig':
+        """
+        This function returns the configuration of the contents of the configuration file.
+        makefile_dict: The object loaded from the configuration file
+        json_path: Path to the configuration file
+        """
+        dir_path = os.path.dirname(json_path)
+        def get_path_from_root(path:str):
+            tmp_path = dir_path + '/' + path
+            return tmp_path.replace(r'/./', '/')
+
+        object_cache = None
+        if 'object_cache' in makefile_dict:
+            cache_config = makefile_dict['object_cache']
+            object_cache = ObjectCacheConfig(
+                path = get_path_from_root(cache_config['path']),
+                max_size = cache_config.get('max_size_mb', 1024) * 1024 * 1024
+                )
+
+        linker_option = None
+        if 'linker_option' in makefile_dict:
+            linker_option = tuple(makefile_dict['linker_option'])
+
+        precompiled_header = None
+        if 'precompiled_header' in makefile_dict:
+            header_config = makefile_dict['precompiled_header']
+            precompiled_header = PrecompiledHeaderConfig(
+                path = get_path_from_root(header_config['path']),
+                obj_dir = get_path_from_root(header_config['obj_dir'])
+                )
+
+        unity_build = None
+        if 'unity_build' in makefile_dict:
+            unity_config = makefile_dict['unity_build']
+            default_config = UnityBuildConfig()
+            unity_build = UnityBuildConfig(
+                batch_size = unity_config.get('batch_size', default_config.batch_size),
+                exclude_coverage = unity_config.get('exclude_coverage',
+                                                    default_config.exclude_coverage)
+                )
+
+        global_opt_list = makefile_dict.get('global_option', [])
+
+        return cls(
+            compiler = makefile_dict.get('compiler'),
+            target = (get_path_from_root(makefile_dict['target'])
+                      if 'target' in makefile_dict else None),
+            jobs = makefile_dict.get('jobs'),
+            rebuild_detection = makefile_dict.get('rebuild_detection'),
+            object_cache = object_cache,
+            archiver = makefile_dict.get('archiver'),
+            linker_option = linker_option,
+            precompiled_header = precompiled_header,
+            unity_build = unity_build,
+            test_result_cache = makefile_dict.get('test_result_cache'),
+            include_path = tuple(get_path_from_root(path)
+                                    for path in makefile_dict.get('include_path', [])),
+            library = tuple(get_path_from_root(path)
+                                for path in makefile_dict.get('library', [])),
+            source_file = tuple(SourceConfig(path = get_path_from_root(source['path']),
+                                             opt = tuple(global_opt_list + source['opt']),
+                                             obj_dir = get_path_from_root(source['obj_dir']),
+                                             use_precompiled_header = source.get(
+                                                 'use_precompiled_header', False))
+                                    for source in makefile_dict.get('source_file', []))
+            )
+
+    @classmethod
+    def from_dict(cls, config_dict:Dict[str, Any])->'MakeConfig':
+        """
+        This function returns the configuration saved by 'dataclasses.asdict'.
+        """
+        object_cache = config_dict['object_cache']
+        linker_option = config_dict['linker_option']
+        precompiled_header = config_dict['precompiled_header']
+        unity_build = config_dict['unity_build']
+        return cls(
+            compiler = config_dict['compiler'],
+            target = config_dict['target'],
+            jobs = config_dict['jobs'],
+            rebuild_detection = config_dict['rebuild_detection'],
+            object_cache = None if object_cache is None else ObjectCacheConfig(**object_cache),
+            archiver = config_dict['archiver'],
+            linker_option = None if linker_option is None else tuple(linker_option),
+            precompiled_header = (None if precompiled_header is None
+                                  else PrecompiledHeaderConfig(**precompiled_header)),
+            unity_build = None if unity_build is None else UnityBuildConfig(**unity_build),
+            test_result_cache = config_dict['test_result_cache'],
+            include_path = tuple(config_dict['include_path']),
+            library = tuple(config_dict['library']),
+            source_file = tuple(SourceConfig(path = source['path'], opt = tuple(source['opt']),
+                                             obj_dir = source['obj_dir'],
+                                             use_precompiled_header =
+                                                source['use_precompiled_header'])
+                                    for source in config_dict['source_file'])
+            )
+
+@dataclasses.dataclass
+class _CacheEntry:
+    '''
+     This data class represents a configuration cached, and the file it has been parsed from.
+    '''
+    json_path: str # The path given to load the file. The paths in the config are resolved by it.
+    mtime_ns: int
+    size: int
+    config: MakeConfig
+
+class MakeConfigCache:
+    '''
+     This class represents the cache of the configurations parsed.
+     The methods can be called from the worker threads.
+    '''
+
+    # Version of the format of the cache file. The file of the other versions is ignored.
+    __FORMAT_VERSION = 5
+
+    def __init__(self, cache_path:Optional[str] = None):
+        """
+        cache_path: Path to the file where the cache is saved. None to keep it only in memory.
+        """
+        self.__cache_path:Optional[str] = cache_path
+        self.__lock = threading.Lock()
+
+        # This hash will have the absolute paths of the configuration files as keys.
+        self.__entry_dict:Dict[str, _CacheEntry] = {}
+        self.__is_modified:bool = False
+
+        # The number of the configuration files parsed. i.e. Not found in the cache
+        self.__parse_count:int = 0
+
+        if cache_path is not None:
+            self.__load_cache_file()
+
+    def __load_cache_file(self):
+        """
+        This function loads the cache saved in the file. A broken file is ignored.
+        """
+        try:
+            with open(self.__cache_path, 'r', encoding = 'UTF-8') as cache_file:
+                cache_dict = json.load(cache_file)
+            if cache_dict.get('version') != self.__FORMAT_VERSION:
+                return
+            for key, entry in cache_dict['entries'].items():
+                self.__entry_dict[key] = _CacheEntry(json_path = entry['json_path'],
+                                                     mtime_ns = entry['mtime_ns'],
+                                                     size = entry['size'],
+                                                     config = MakeConfig.from_dict(entry['config']))
+        except (OSError, ValueError, KeyError, TypeError):
+            self.__entry_dict = {}
+
+    def load(self, json_path:str)->MakeConfig:
+        """
+        This function returns the configuration of the file. The file is parsed only if it is not
+        cached, or it has changed since it was cached.
+        Raises OSError if the file can't be read, and jsonc.JsonWithCommentsDecodeError if it is
+        not a valid JSON with comments.
+        """
+        file_stat = os.stat(json_path)
+        key = os.path.abspath(json_path)
+
+        with self.__lock:
+            entry = self.__entry_dict.get(key)
+        if entry is not None and entry.json_path == json_path and \
+           entry.mtime_ns == file_stat.st_mtime_ns and entry.size == file_stat.st_size:
+            return entry.config
+
+        with open(json_path, 'r', encoding = 'UTF-8') as json_file:
+            config = MakeConfig.from_json(jsonc.load(json_file), json_path)
+
+        with self.__lock:
+            self.__entry_dict[key] = _CacheEntry(json_path, file_stat.st_mtime_ns,
+                                                 file_stat.st_size, config)
+            self.__is_modified = True
+            self.__parse_count += 1
+        return config
+
+    def get_parse_count(self)->int:
+        """
+        This function returns the number of the configuration files parsed, not found in
+        the cache.
+        """
+        with self.__lock:
+            return self.__parse_count
+
+    def save(self):
+        """
+        This function saves the cache into the file, if the cache file is used and the cache
+        has been modified.
+        """
+        with self.__lock:
+            if self.__cache_path is None or self.__is_modified is False:
+                return
+            cache_dict = {
+                'version': self.__FORMAT_VERSION,
+                'entries': {key: {'json_path': entry.json_path,
+                                  'mtime_ns': entry.mtime_ns,
+                                  'size': entry.size,
+                                  'config': dataclasses.asdict(entry.config)}
+                                for key, entry in self.__entry_dict.items()}
+                }
+            self.__is_modified = False
+
+        # Write into a temporary file first, not to leave a broken cache file.
+        cache_dir = os.path.dirname(self.__cache_path)
+        if cache_dir != '':
+            os.makedirs(cache_dir, exist_ok = True)
+        temporary_path = f'{self.__cache_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding = 'UTF-8') as cache_file:
+            json.dump(cache_dict, cache_file)
+        os.replace(temporary_path, self.__cache_path)
+
+# The caches shared in this process. The keys are the paths to the cache files. (None: In memory)
+_shared_cache_dict:Dict[Optional[str], MakeConfigCache] = {}
+_shared_cache_lock = threading.Lock()
+
+def get_shared_config_cache(cache_path:Optional[str] = None)->MakeConfigCache:
+    """
+    This function returns the cache shared in this process. The same object is returned for
+    the same cache file, so that the configuration files are parsed once per process.
+    cache_path: Path to the file where the cache is saved. None to keep it only in memory.
+    """
+    with _shared_cache_lock:
+        if cache_path not in _shared_cache_dict:
+            _shared_cache_dict[cache_path] = MakeConfigCache(cache_path)
+        return _shared_cache_dict[cache_path]
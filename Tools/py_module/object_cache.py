@@ -0,0 +1,294 @@
+'''
+ This module provides the object cache shared by all the make files.
+ An object file is stored in the cache with the key calculated from the compiler, the options
+ and the preprocessed source. Thus, the same translation unit compiled in another module,
+ another branch or by another 'Build' is served from the cache instead of being compiled.
+ The size of the cache is limited. The least recently used objects are evicted first.
+ The make files in a process share one object per cache directory. (See get_shared_object_cache)
+ So, the size of the cache is counted once. An entry evicted while it is fetched is counted as
+ a miss, and the object is compiled.
+'''
+import os
+import re
+import json
+import shutil
+import hashlib
+import threading
+import dataclasses
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Optional
+
+@dataclasses.dataclass
+class CacheStatistics:
+    '''
+     This data class represents the statistics of the object cache.
+    '''
+    hits:int      = 0
+    misses:int    = 0
+    evictions:int = 0
+
+class ObjectCache:
+    '''
+     This class represents a content-addressed object cache located in a directory.
+     The methods can be called from the worker threads.
+    '''
+
+    # Options which embed the path of the object file into the object file.
+    # The objects compiled with them can be shared only by the same object path.
+    __PATH_DEPENDENT_OPTIONS = ('-fprofile-arcs', '-ftest-coverage', '--coverage',
+                                '-fprofile-generate')
+
+    # Prefix of the options which embed the path of the source file and the working directory
+    # into the debug information. e.g. '-g', '-ggdb', '-g3' ('-g0' disables it.)
+    __DEBUG_OPTION_PREFIX = '-g'
+
+    # Extensions of the files stored with an object file. e.g. 'hoge.gcno' for 'hoge.o'
+    __ARTIFACT_EXTENSIONS = ('.o', '.gcno')
+
+    # Line markers of the preprocessed source. e.g. '# 1 "./hoge/../fuga.c"'
+    __LINE_MARKER_PATTERN = re.compile(rb'^(# \d+ ")([^"]*)(")', re.MULTILINE)
+
+    __STATISTICS_FILE_NAME = 'stats.json'
+
+    # The statistics file is shared by all the instances.
+    __statistics_lock = threading.Lock()
+
+    def __init__(self, cache_dir:str, max_size:int):
+        """
+        cache_dir: Directory where the objects are cached
+        max_size: Maximum total size of the cached objects in bytes
+        """
+        self.__cache_dir:str = cache_dir
+        self.__max_size:int = max_size
+        self.__lock = threading.Lock()
+        self.__statistics = CacheStatistics()
+        self.__unsaved_statistics = CacheStatistics()
+
+        # Total size of the cached objects. This is calculated when it is required first.
+        self.__total_size:Optional[int] = None
+
+    def get_cache_dir(self)->str:
+        """
+        This function returns the directory where the objects are cached.
+        """
+        return self.__cache_dir
+
+    def compute_key(self, compiler:str, option_string:str, preprocessed_source:bytes,
+                    source_path:str, obj_path:str)->str:
+        """
+        This function returns the key of the object file compiled from the input.
+        compiler: Compiler command e.g. 'gcc'
+        option_string: Options of the compilation except the include paths and the file paths
+        preprocessed_source: Output of the preprocessor
+        source_path: Path to the source file given to the compiler
+        obj_path: Path to the object file
+        """
+        hasher = hashlib.sha256()
+        hasher.update(compiler.encode())
+
+        # The compiler itself may have been updated.
+        compiler_path = shutil.which(compiler)
+        if compiler_path is not None:
+            compiler_stat = os.stat(compiler_path)
+            hasher.update(f'{compiler_stat.st_mtime_ns} {compiler_stat.st_size}'.encode())
+
+        hasher.update(option_string.encode())
+
+        option_list = option_string.split()
+        if any(option in option_list for option in self.__PATH_DEPENDENT_OPTIONS):
+            hasher.update(os.path.abspath(obj_path).encode())
+
+        # The debug information has the source path as given and the working directory.
+        # So, the debugger finds the source of the object compiled by this make file.
+        if any(option.startswith(self.__DEBUG_OPTION_PREFIX) and option != '-g0'
+                   for option in option_list):
+            hasher.update(f'{source_path}\n{os.getcwd()}'.encode())
+
+        # The same source included through different relative paths has the same key.
+        hasher.update(self.__LINE_MARKER_PATTERN.sub(
+            lambda match: (match.group(1) + os.path.normpath(match.group(2).decode()).encode()
+                           + match.group(3)),
+            preprocessed_source))
+
+        return hasher.hexdigest()
+
+    def __get_entry_dir(self, key:str)->str:
+        return f'{self.__cache_dir}/{key[:2]}/{key}'
+
+    def __get_artifact_list(self, obj_path:str, entry_dir:str)->List[Tuple[str, str]]:
+        """
+        This function returns the list of the files stored together for the input object file.
+        The members are the pairs of the path in the object directory and the one in the cache.
+        """
+        base_path = os.path.splitext(obj_path)[0]
+        return [(base_path + extension, f'{entry_dir}/object{extension}')
+                    for extension in self.__ARTIFACT_EXTENSIONS]
+
+    def fetch(self, key:str, obj_path:str)->bool:
+        """
+        This function copies the cached object file (and its coverage notes) to the input path.
+        Returns TRUE if the object was found in the cache.
+        """
+        entry_dir = self.__get_entry_dir(key)
+        try:
+            # The files are copied without the lock, so that the other threads are not blocked.
+            # If the entry is evicted meanwhile, the copy fails and the object is compiled.
+            artifact_list = self.__get_artifact_list(obj_path, entry_dir)
+            for artifact, cached_file in artifact_list:
+                # The object file itself must be found. The others are optional.
+                if artifact == artifact_list[0][0] or os.path.exists(cached_file):
+                    shutil.copyfile(cached_file, artifact)
+        except OSError:
+            self.__count(misses = 1)
+            return False
+
+        # Mark the entry as used recently.
+        with self.__lock:
+            try:
+                os.utime(entry_dir)
+            except OSError:
+                # Evicted after the copy. The object copied is complete.
+                pass
+
+        self.__count(hits = 1)
+        return True
+
+    def store(self, key:str, obj_path:str):
+        """
+        This function stores the object file (and its coverage notes) into the cache.
+        """
+        entry_dir = self.__get_entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+
+        tmp_dir = f'{entry_dir}.{os.getpid()}.{threading.get_ident()}.tmp'
+        entry_size = 0
+        try:
+            os.makedirs(tmp_dir, exist_ok = True)
+            for artifact, cached_file in self.__get_artifact_list(obj_path, tmp_dir):
+                if os.path.exists(artifact):
+                    shutil.copyfile(artifact, cached_file)
+                    entry_size += os.path.getsize(artifact)
+            # Publish the entry at once, not to serve a half-written entry.
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process has stored the same entry, or the cache is not writable.
+            shutil.rmtree(tmp_dir, ignore_errors = True)
+            return
+
+        with self.__lock:
+            if self.__total_size is None:
+                self.__total_size = self.__calculate_total_size()
+            else:
+                self.__total_size += entry_size
+            is_over = self.__total_size > self.__max_size
+
+        if is_over is True:
+            self.__evict()
+
+    def __get_all_entries(self)->List[os.DirEntry]:
+        entries = []
+        if os.path.isdir(self.__cache_dir) is False:
+            return entries
+        for sub_dir in os.scandir(self.__cache_dir):
+            if sub_dir.is_dir() and len(sub_dir.name) == 2:
+                entries += [entry for entry in os.scandir(sub_dir.path)
+                                if entry.is_dir() and not entry.name.endswith('.tmp')]
+        return entries
+
+    @staticmethod
+    def __get_entry_size(entry_dir:str)->int:
+        return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+
+    def __calculate_total_size(self)->int:
+        return sum(self.__get_entry_size(entry.path) for entry in self.__get_all_entries())
+
+    def __evict(self):
+        """
+        This function removes the least recently used objects until the total size gets
+        smaller than the maximum size.
+        """
+        with self.__lock:
+            entries = sorted(((entry.stat().st_mtime_ns, self.__get_entry_size(entry.path),
+                               entry.path) for entry in self.__get_all_entries()))
+            total_size = sum(size for _, size, _ in entries)
+            evictions = 0
+            for _, size, path in entries:
+                if total_size <= self.__max_size:
+                    break
+                shutil.rmtree(path, ignore_errors = True)
+                total_size -= size
+                evictions += 1
+            self.__total_size = total_size
+        self.__count(evictions = evictions)
+
+    def __count(self, hits:int = 0, misses:int = 0, evictions:int = 0):
+        with self.__lock:
+            for statistics in (self.__statistics, self.__unsaved_statistics):
+                statistics.hits      += hits
+                statistics.misses    += misses
+                statistics.evictions += evictions
+
+    def get_statistics(self)->CacheStatistics:
+        """
+        This function returns the statistics of this instance. i.e. Of the make files sharing it
+        in this process.
+        """
+        with self.__lock:
+            return dataclasses.replace(self.__statistics)
+
+    def get_total_statistics(self)->CacheStatistics:
+        """
+        This function returns the statistics accumulated in the cache directory so far.
+        """
+        statistics_path = f'{self.__cache_dir}/{self.__STATISTICS_FILE_NAME}'
+        try:
+            with open(statistics_path, 'r', encoding = 'UTF-8') as statistics_file:
+                return CacheStatistics(**json.load(statistics_file))
+        except (OSError, ValueError, TypeError):
+            return CacheStatistics()
+
+    def save_statistics(self):
+        """
+        This function adds the statistics of this instance to the ones saved in the cache
+        directory. The file is replaced at once, so that it is not broken even if two processes
+        save it at the same time.
+        """
+        with self.__lock:
+            unsaved_statistics = self.__unsaved_statistics
+            self.__unsaved_statistics = CacheStatistics()
+
+        if unsaved_statistics == CacheStatistics():
+            return
+
+        statistics_path = f'{self.__cache_dir}/{self.__STATISTICS_FILE_NAME}'
+        with self.__statistics_lock:
+            total_statistics = self.get_total_statistics()
+            total_statistics.hits      += unsaved_statistics.hits
+            total_statistics.misses    += unsaved_statistics.misses
+            total_statistics.evictions += unsaved_statistics.evictions
+            os.makedirs(self.__cache_dir, exist_ok = True)
+            temporary_path = f'{statistics_path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w', encoding = 'UTF-8') as statistics_file:
+                json.dump(dataclasses.asdict(total_statistics), statistics_file)
+            os.replace(temporary_path, statistics_path)
+
+# The caches shared in this process. The keys are the absolute paths to the cache directories.
+_shared_cache_dict:Dict[str, ObjectCache] = {}
+_shared_cache_lock = threading.Lock()
+
+def get_shared_object_cache(cache_dir:str, max_size:int)->ObjectCache:
+    """
+    This function returns the object cache shared in this process. The same object is returned
+    for the same directory, so that the make files tested in parallel share the size of the cache
+    and the lock. The maximum size given first is used.
+    cache_dir: Directory where the objects are cached
+    max_size: Maximum total size of the cached objects in bytes
+    """
+    with _shared_cache_lock:
+        key = os.path.abspath(cache_dir)
+        if key not in _shared_cache_dict:
+            _shared_cache_dict[key] = ObjectCache(cache_dir, max_size)
+        return _shared_cache_dict[key]
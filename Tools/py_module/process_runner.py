@@ -0,0 +1,91 @@
+'''
+ This module provides the functions which execute the commands of the tools. e.g. The compiler
+ The commands are given as the lists of the arguments, and executed directly without the shell.
+ Thus, no shell process is spawned per command, and the paths including spaces can be used.
+ The arguments of a very long command (e.g. linking hundreds of objects) are passed through
+ a response file ('@file'), which the GNU tools read as if they were on the command line.
+'''
+import os
+import shlex
+import tempfile
+import subprocess
+import dataclasses
+from typing import List
+from typing import Optional
+
+# The commands longer than this (in characters) are executed with a response file.
+# The command line of Windows is limited to 32767 characters, and Linux limits the length of
+# an argument and the total size of the arguments.
+RESPONSE_FILE_THRESHOLD = 8000
+
+@dataclasses.dataclass
+class CommandResult:
+    '''
+     This data class represents the result of a command executed.
+    '''
+    return_code: int
+    output: bytes # STDOUT (and STDERR if they are merged)
+
+def format_command(argv:List[str])->str:
+    """
+    This function returns the command as a string, which is displayed and recorded.
+    The arguments are quoted as the shell of the platform requires.
+    e.g. ['gcc', '-c', 'my file.c'] -> "gcc -c 'my file.c'"
+    """
+    if os.name == 'nt':
+        return subprocess.list2cmdline(argv)
+    return shlex.join(argv)
+
+def _quote_response_file_argument(argument:str)->str:
+    """
+    This function returns the argument written in a response file.
+    The GNU tools split the contents of the response file by white spaces, and the quotes and
+    backslashes escape the characters as the shell does.
+    """
+    if argument != '' and not any(char in argument for char in ' \t\n\'"\\'):
+        return argument
+    escaped = argument.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def _write_response_file(argument_list:List[str])->str:
+    """
+    This function writes the arguments into a temporary response file, and returns its path.
+    The caller must remove the file.
+    """
+    with tempfile.NamedTemporaryFile('w', suffix = '.rsp', delete = False,
+                                     encoding = 'UTF-8') as response_file:
+        response_file.write('\n'.join(_quote_response_file_argument(argument)
+                                      for argument in argument_list))
+        response_file.write('\n')
+        return response_file.name
+
+def run_command(argv:List[str], merge_stderr:bool = True,
+                use_response_file:Optional[bool] = None)->CommandResult:
+    """
+    This function executes the command and returns its output.
+    A command which could not be executed (e.g. the compiler is not found) fails with
+    the message of the error as the output, rather than raising an exception.
+    argv: The command and its arguments. e.g. ['gcc', '-c', 'a.c', '-o', 'a.o']
+    merge_stderr: True to output STDERR into the output. False to discard it.
+    use_response_file: True to pass the arguments through a response file. None to use it only
+                       if the command is longer than RESPONSE_FILE_THRESHOLD.
+    """
+    if use_response_file is None:
+        use_response_file = len(format_command(argv)) > RESPONSE_FILE_THRESHOLD
+
+    response_file_path:Optional[str] = None
+    if use_response_file is True and len(argv) > 1:
+        response_file_path = _write_response_file(argv[1:])
+        argv = [argv[0], '@' + response_file_path]
+
+    try:
+        completed = subprocess.run(argv, stdout = subprocess.PIPE,
+                                   stderr = subprocess.STDOUT if merge_stderr
+                                            else subprocess.DEVNULL,
+                                   check = False)
+        return CommandResult(completed.returncode, completed.stdout)
+    except OSError as error:
+        return CommandResult(-1, f'Failed to execute {argv[0]}: {error}\n'.encode())
+    finally:
+        if response_file_path is not None:
+            os.remove(response_file_path)
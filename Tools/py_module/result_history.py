@@ -0,0 +1,187 @@
+'''
+ This module provides the class which keeps the results of the test cases in a SQLite database.
+ The durations of the test cases are used to execute the slow tests first, to find the test cases
+ which have become slow, and to report the results without executing the tests again.
+'''
+import time
+import sqlite3
+import threading
+import dataclasses
+from contextlib import closing
+from typing import Dict
+from typing import List
+from typing import Optional
+from .junit_report import CaseResult # pylint: disable=relative-beyond-top-level
+from .junit_report import CaseStatus # pylint: disable=relative-beyond-top-level
+
+@dataclasses.dataclass
+class TimingRegression:
+    '''
+     This data class represents a test case which has become slower than before.
+    '''
+    full_name: str           # e.g. 'LedDriver.LedOn'
+    previous_duration: float # Average seconds of the previous runs
+    latest_duration: float   # Seconds of the latest run
+
+@dataclasses.dataclass
+class RunSummary:
+    '''
+     This data class represents the summary of a run of a module.
+    '''
+    module: str
+    started: float  # Seconds since the epoch
+    tests: int      # The number of the test cases executed (including skipped ones)
+    failures: int
+    skipped: int
+    duration: float # Total seconds of the test cases
+
+class ResultHistory:
+    '''
+     This class represents the database of the results of the test cases.
+     The methods can be called from the worker threads.
+    '''
+
+    # Name of the database file created in the test directory
+    DATABASE_FILE_NAME = '.test_history.sqlite3'
+
+    # The number of the recent runs whose durations are averaged
+    __AVERAGED_RUN_COUNT = 5
+
+    __SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS runs('
+        ' run_id INTEGER PRIMARY KEY AUTOINCREMENT, module TEXT NOT NULL, started REAL NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS cases('
+        ' run_id INTEGER NOT NULL, group_name TEXT NOT NULL, test_name TEXT NOT NULL,'
+        ' duration REAL NOT NULL, status TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS runs_module ON runs(module, run_id)',
+        'CREATE INDEX IF NOT EXISTS cases_run ON cases(run_id)'
+    )
+
+    def __init__(self, database_path:str):
+        self.__database_path:str = database_path
+        self.__is_initialized:bool = False
+        self.__lock = threading.Lock()
+
+    def __connect(self)->sqlite3.Connection:
+        """
+        This function returns a new connection to the database. A connection must not be shared
+        by the threads.
+        """
+        connection = sqlite3.connect(self.__database_path, timeout = 30)
+        with self.__lock:
+            if self.__is_initialized is False:
+                with connection:
+                    for statement in self.__SCHEMA:
+                        connection.execute(statement)
+                self.__is_initialized = True
+        return connection
+
+    def record_run(self, module:str, case_results:List[CaseResult],
+                   started:Optional[float] = None)->int:
+        """
+        This function saves the results of the test cases executed by a run of the module.
+        Returns the ID of the run.
+        started: Seconds since the epoch when the run started. None means now.
+        """
+        if started is None:
+            started = time.time()
+
+        with closing(self.__connect()) as connection, connection:
+            cursor = connection.execute('INSERT INTO runs(module, started) VALUES (?, ?)',
+                                        (module, started))
+            run_id = cursor.lastrowid
+            connection.executemany(
+                'INSERT INTO cases(run_id, group_name, test_name, duration, status)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                [(run_id, case.group, case.name, case.duration, case.status.value)
+                    for case in case_results])
+        return run_id
+
+    def __get_recent_run_ids(self, connection:sqlite3.Connection, module:str,
+                             count:int)->List[int]:
+        return [row[0] for row in connection.execute(
+            'SELECT run_id FROM runs WHERE module = ? ORDER BY run_id DESC LIMIT ?',
+            (module, count))]
+
+    def __get_case_durations(self, connection:sqlite3.Connection,
+                             run_ids:List[int])->Dict[str, List[float]]:
+        """
+        This function returns the durations of the test cases executed by the input runs.
+        The keys are the full names of the test cases. e.g. 'LedDriver.LedOn'
+        """
+        durations:Dict[str, List[float]] = {}
+        if len(run_ids) == 0:
+            return durations
+        placeholders = ', '.join('?' * len(run_ids))
+        for group, name, duration in connection.execute(
+                f'SELECT group_name, test_name, duration FROM cases'
+                f' WHERE run_id IN ({placeholders}) AND status != ?',
+                run_ids + [CaseStatus.SKIPPED.value]):
+            durations.setdefault(f'{group}.{name}', []).append(duration)
+        return durations
+
+    def get_case_durations(self, module:str)->Dict[str, float]:
+        """
+        This function returns the average seconds taken by the test cases of the module in
+        the recent runs. The keys are the full names of the test cases. e.g. 'LedDriver.LedOn'
+        """
+        with closing(self.__connect()) as connection:
+            run_ids = self.__get_recent_run_ids(connection, module, self.__AVERAGED_RUN_COUNT)
+            durations = self.__get_case_durations(connection, run_ids)
+        return {full_name: sum(values) / len(values) for full_name, values in durations.items()}
+
+    def get_module_duration(self, module:str)->Optional[float]:
+        """
+        This function returns the total seconds taken by the test cases of the module in
+        the latest run. Returns None if the module has not been recorded.
+        """
+        with closing(self.__connect()) as connection:
+            row = connection.execute(
+                'SELECT SUM(cases.duration) FROM cases WHERE cases.run_id = '
+                '(SELECT MAX(run_id) FROM runs WHERE module = ?)', (module,)).fetchone()
+        return None if row is None or row[0] is None else row[0]
+
+    def find_regressions(self, module:str, ratio:float = 1.5,
+                         min_increase:float = 0.05)->List[TimingRegression]:
+        """
+        This function returns the test cases of the module which were slower in the latest run
+        than the average of the previous runs.
+        ratio: A test case is reported if it took more than 'ratio' times the average
+        min_increase: And it took more than 'min_increase' seconds longer than the average
+        """
+        with closing(self.__connect()) as connection:
+            run_ids = self.__get_recent_run_ids(connection, module,
+                                                self.__AVERAGED_RUN_COUNT + 1)
+            if len(run_ids) < 2:
+                return []
+            latest_durations = self.__get_case_durations(connection, run_ids[:1])
+            previous_durations = self.__get_case_durations(connection, run_ids[1:])
+
+        regressions = []
+        for full_name, (latest_duration, *_) in latest_durations.items():
+            if full_name not in previous_durations:
+                continue
+            previous_duration = (sum(previous_durations[full_name]) /
+                                 len(previous_durations[full_name]))
+            if latest_duration > previous_duration * ratio and \
+               latest_duration - previous_duration > min_increase:
+                regressions.append(TimingRegression(full_name, previous_duration,
+                                                    latest_duration))
+        return sorted(regressions, key = lambda regression: regression.full_name)
+
+    def get_latest_summaries(self)->List[RunSummary]:
+        """
+        This function returns the summaries of the latest runs of all the modules recorded.
+        """
+        with closing(self.__connect()) as connection:
+            rows = connection.execute(
+                'SELECT runs.module, runs.started, COUNT(cases.run_id),'
+                ' SUM(CASE WHEN cases.status = ? THEN 1 ELSE 0 END),'
+                ' SUM(CASE WHEN cases.status = ? THEN 1 ELSE 0 END),'
+                ' SUM(cases.duration)'
+                ' FROM runs LEFT JOIN cases ON cases.run_id = runs.run_id'
+                ' WHERE runs.run_id IN (SELECT MAX(run_id) FROM runs GROUP BY module)'
+                ' GROUP BY runs.run_id ORDER BY runs.module',
+                (CaseStatus.FAILED.value, CaseStatus.SKIPPED.value)).fetchall()
+        return [RunSummary(module, started, tests, failures or 0, skipped or 0, duration or 0.0)
+                    for module, started, tests, failures, skipped, duration in rows]
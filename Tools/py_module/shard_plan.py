@@ -0,0 +1,120 @@
+'''
+ This module provides functions which split the tests of a CppUTest executable into shards.
+ Each shard is executed as another process of the same executable with the filters selecting
+ its tests. Thus, a module having many tests can be tested by multiple cores.
+'''
+import dataclasses
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+@dataclasses.dataclass
+class Shard:
+    '''
+     This data class represents the tests executed by a process.
+     The shard has either whole groups or some tests of a single group, because CppUTest
+     selects the tests matching any of the group filters and any of the name filters.
+    '''
+    groups: List[str] = dataclasses.field(default_factory = list)
+    names: List[str]  = dataclasses.field(default_factory = list) # Empty means all the tests
+    weight: float     = 0.0 # Estimated time to execute the tests
+
+    def get_arguments(self)->List[str]:
+        """
+        This function returns the command line arguments of CppUTest selecting the tests.
+        """
+        arguments = []
+        for group in self.groups:
+            arguments += ['-sg', group]
+        for name in self.names:
+            arguments += ['-sn', name]
+        return arguments
+
+def parse_test_list(list_output:str)->List[Tuple[str, str]]:
+    """
+    This function returns the tests listed by the '-ln' option of CppUTest.
+    list_output: Output of '-ln'. e.g. 'LedDriver.LedOff LedDriver.LedOn'
+    Returns the list of (group, name) in the listed order.
+    """
+    tests = []
+    for test in list_output.split():
+        group, separator, name = test.partition('.')
+        if separator != '':
+            tests.append((group, name))
+    return tests
+
+# Weight of a test recorded as 0 seconds, so that such tests are spread over the shards.
+_MIN_WEIGHT = 0.001
+
+def _get_weight(group:str, name:str, durations:Optional[Dict[str, float]])->float:
+    """
+    This function returns the estimated time of the test. 1 if the time is not known.
+    """
+    if durations is None:
+        return 1.0
+    return max(durations.get(f'{group}.{name}', 1.0), _MIN_WEIGHT)
+
+def _pack_shards(shards:List[Shard], shard_count:int)->List[Shard]:
+    """
+    This function packs the input shards into 'shard_count' shards. The heaviest one is put
+    into the lightest shard first. (Longest processing time first)
+    """
+    shards = sorted(shards, key = lambda shard: shard.weight, reverse = True)
+    packed_shards = [Shard() for _ in range(min(shard_count, len(shards)))]
+    for shard in shards:
+        lightest_shard = min(packed_shards, key = lambda packed_shard: packed_shard.weight)
+        lightest_shard.groups += shard.groups
+        lightest_shard.weight += shard.weight
+    return packed_shards
+
+def plan_shards(tests:List[Tuple[str, str]], shard_count:int,
+                durations:Optional[Dict[str, float]] = None)->List[Shard]:
+    """
+    This function splits the tests into at most 'shard_count' shards whose weights are close.
+    tests: List of (group, name) returned by 'parse_test_list'
+    shard_count: The maximum number of the shards
+    durations: Seconds taken by the tests before. The keys are 'group.name'. Every test is
+               regarded to take the same time if it is None.
+    """
+    group_dict:Dict[str, List[Tuple[str, float]]] = {}
+    for group, name in tests:
+        group_dict.setdefault(group, []).append((name, _get_weight(group, name, durations)))
+
+    if len(group_dict) == 0 or shard_count <= 1:
+        return [Shard(weight = sum(weight for tests in group_dict.values()
+                                            for _, weight in tests))]
+
+    group_shards = [Shard(groups = [group], weight = sum(weight for _, weight in tests))
+                        for group, tests in group_dict.items()]
+
+    if len(group_shards) >= shard_count:
+        # Enough groups. Pack whole groups.
+        return _pack_shards(group_shards, shard_count)
+
+    # Fewer groups than the shards. Split each group into the shards proportional to its weight.
+    total_weight = sum(shard.weight for shard in group_shards)
+    split_counts = {group: max(1, min(len(group_tests),
+                                      round(shard_count * group_shard.weight / total_weight)))
+                        for group_shard, (group, group_tests)
+                        in zip(group_shards, group_dict.items())}
+    # The rounding may exceed the number of the shards.
+    while sum(split_counts.values()) > shard_count:
+        largest_group = max(split_counts, key = lambda group: split_counts[group])
+        split_counts[largest_group] -= 1
+
+    shards = []
+    for group_shard in group_shards:
+        group = group_shard.groups[0]
+        group_tests = group_dict[group]
+        split_count = split_counts[group]
+        split_shards = [Shard(groups = [group]) for _ in range(split_count)]
+        for name, weight in sorted(group_tests, key = lambda test: test[1], reverse = True):
+            lightest_shard = min(split_shards, key = lambda split_shard: split_shard.weight)
+            lightest_shard.names.append(name)
+            lightest_shard.weight += weight
+        if split_count == 1:
+            # The group is not split. Select it without the name filters.
+            split_shards[0].names = []
+        shards += split_shards
+    return shards
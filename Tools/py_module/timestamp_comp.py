@@ -2,8 +2,13 @@
  This module provids functions which compares timestamp of the files.
 '''
 import os
+import threading
+import dataclasses
 from enum import Enum
+from typing import Dict
+from typing import Iterable
 from typing import List
+from typing import Optional
 
 ###############################################
 ####### Definitions of Constant values ########
@@ -18,51 +23,217 @@ class CompResult(Enum):
     FILE2_IS_NEWER = 1
     SAME_TIMESTAMP = 2
 
+@dataclasses.dataclass
+class TimestampCacheStatistics:
+    '''
+     This data class represents the statistics of a timestamp cache.
+    '''
+    hits: int          = 0 # Time stamps found in the cache
+    misses: int        = 0 # Time stamps read from the file system
+    invalidations: int = 0 # Paths invalidated
+
+class TimestampCache:
+    '''
+     This class keeps the time stamps of the files read during a build session, so that each file
+     is accessed once. A cache can be shared by the make files built in parallel, since the methods
+     can be called from the worker threads.
+     The paths written during the session (e.g. the object files compiled) must be invalidated.
+    '''
+
+    # The files in a directory are read by a scan of the directory, if this number of them or
+    # more are requested. Only on Windows, where the scan gives the time stamps without
+    # accessing each file. On the other platforms, each file is accessed anyway.
+    __SCAN_THRESHOLD = 2 if os.name == 'nt' else None
+
+    def __init__(self):
+        # This hash will have the file paths as keys, and the value will be the
+        # time stamp value of the file.
+        # The values are the integers in nanoseconds, so that the close time stamps are not rounded
+        # into the same value.
+        self.__time_stamp_dict:Dict[str, int] = {}
+        self.__lock = threading.Lock()
+        self.__statistics = TimestampCacheStatistics()
+
+        # The number of the invalidations of each path. The time stamp read while the path is
+        # invalidated is not saved, since it may be older than the invalidation. The time stamps
+        # of the other paths read at the same time are saved.
+        self.__invalidation_count_dict:Dict[str, int] = {}
+
+        # Incremented by 'clear'. The time stamps read while the cache is cleared are not saved.
+        self.__clear_count:int = 0
+
+    @staticmethod
+    def __get_time_stamp_value_from_os(file:str) -> Optional[int]:
+        """
+         This function returns comparable time stamp value of the input file.
+         Returns None if the file does not exist. So, the existence is checked by the same
+         system call.
+        file: The input file path
+        """
+        try:
+            return os.stat(file).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def __scan_directory(directory:str, file_name_dict:Dict[str, List[str]],
+                         time_stamp_dict:Dict[str, Optional[int]]):
+        """
+        This function reads the time stamps of the files in the directory by a scan of it.
+        file_name_dict: The file names in the directory as keys, and the paths requested as values
+        time_stamp_dict: The time stamps read are stored here. The keys are the paths requested.
+        """
+        try:
+            with os.scandir(directory if directory != '' else '.') as entries:
+                for entry in entries:
+                    for file in file_name_dict.get(os.path.normcase(entry.name), []):
+                        try:
+                            time_stamp_dict[file] = entry.stat().st_mtime_ns
+                        except OSError:
+                            pass
+        except OSError:
+            # The directory does not exist, then the files do not either.
+            pass
+
+    def collect_timestamps(self, file_list:List[str]) -> Dict[str, Optional[int]]:
+        """
+        This function returns the time stamp values of all the input files in nanoseconds.
+        The value of a file which does not exist is None. i.e. The existence of the files is
+        checked together.
+        The files whose time stamps have not been saved are grouped by their directories, and
+        the files in the same directory are read at once where it is cheaper.
+        file_list: The input file paths
+        """
+        time_stamp_dict:Dict[str, Optional[int]] = {}
+
+        # This hash will have the directories as keys, and the value will be the hash from
+        # the file names to the paths requested.
+        directory_dict:Dict[str, Dict[str, List[str]]] = {}
+        missed_file_list:List[str] = []
+
+        with self.__lock:
+            clear_count = self.__clear_count
+            for file in file_list:
+                if file in time_stamp_dict:
+                    continue
+                file_time = self.__time_stamp_dict.get(file)
+                time_stamp_dict[file] = file_time
+                if file_time is None:
+                    missed_file_list.append(file)
+                    directory, file_name = os.path.split(file)
+                    directory_dict.setdefault(directory, {}).setdefault(
+                        os.path.normcase(file_name), []).append(file)
+            self.__statistics.hits += len(time_stamp_dict) - len(missed_file_list)
+            self.__statistics.misses += len(missed_file_list)
+            invalidation_count_list = [self.__invalidation_count_dict.get(file, 0)
+                                            for file in missed_file_list]
+
+        # Read the file system without the lock.
+        for directory, file_name_dict in directory_dict.items():
+            if self.__SCAN_THRESHOLD is not None and len(file_name_dict) >= self.__SCAN_THRESHOLD:
+                self.__scan_directory(directory, file_name_dict, time_stamp_dict)
+            else:
+                for files in file_name_dict.values():
+                    for file in files:
+                        time_stamp_dict[file] = self.__get_time_stamp_value_from_os(file)
+
+        # Save the time stamps of the existing files. The files not existing may be made later.
+        with self.__lock:
+            if clear_count == self.__clear_count:
+                for file, invalidation_count in zip(missed_file_list, invalidation_count_list):
+                    if time_stamp_dict[file] is not None and \
+                       invalidation_count == self.__invalidation_count_dict.get(file, 0):
+                        self.__time_stamp_dict[file] = time_stamp_dict[file]
+
+        return time_stamp_dict
+
+    def is_the_file_latest(self, in_file:str, list_file:List[str])->bool:
+        """
+        This function checks if the first input file is the latest compared
+        to the files in the list input as the second parameter.
+        The time stamps of all the files are collected at once.
+        Raises FileNotFoundError if one of the files does not exist.
+        inFile: The file to be checked.
+        aFileList_ref: Reference to the array containing files to be compared.
+        """
+        time_stamp_dict = self.collect_timestamps([in_file] + list_file)
+        for file, file_time in time_stamp_dict.items():
+            if file_time is None:
+                raise FileNotFoundError(f'No such file: {file}')
+
+        # If a file in the array is newer, return false
+        in_file_time = time_stamp_dict[in_file]
+        return all(time_stamp_dict[file_compared] <= in_file_time for file_compared in list_file)
+
+    def invalidate(self, file_list:Iterable[str]):
+        """
+        This function forgets the time stamps of the files, which have been written or removed.
+        So, they are read again next time.
+        """
+        with self.__lock:
+            for file in file_list:
+                self.__time_stamp_dict.pop(file, None)
+                self.__invalidation_count_dict[file] = \
+                    self.__invalidation_count_dict.get(file, 0) + 1
+                self.__statistics.invalidations += 1
+
+    def clear(self):
+        """
+        This function forgets the time stamps of all the files.
+        """
+        with self.__lock:
+            self.__clear_count += 1
+            self.__time_stamp_dict = {}
+            self.__invalidation_count_dict = {}
+
+    def get_statistics(self)->TimestampCacheStatistics:
+        """
+        This function returns the statistics of this cache.
+        """
+        with self.__lock:
+            return dataclasses.replace(self.__statistics)
+
 class TimestampComp:
     '''
      This module provids functions which compares timestamp of the files.
+     The time stamps are saved in the cache shared in the process. The make files use their own
+     caches instead. See TimestampCache.
     '''
-    # Initialize time stamp list. For more explanation, see where this is
-    # defined.
-    # This hash will have the file paths as keys, and the value will be the
-    # time stamp value of the file.
-    # That is, the time stamp value of the file will be saved in this hash not
+    # The time stamp value of the file will be saved in this cache not
     # to call system function every time to check the time stamp value.
-    __save_time_stamp_dict = {}
+    __default_cache = TimestampCache()
 
     @classmethod
-    def __get_time_stamp_value_from_os(cls, file:str) -> float:
+    def collect_timestamps(cls, file_list:List[str]) -> Dict[str, Optional[int]]:
         """
-         This function returns comparable time stamp value of the input file.
-        file: The input file path
+        This function returns the time stamp values of all the input files in nanoseconds.
+        See TimestampCache.collect_timestamps.
         """
-
-        # Get the status of the file
-        # Return the value
-        return os.path.getmtime(file)
+        return cls.__default_cache.collect_timestamps(file_list)
 
     @classmethod
-    def get_timestamp_value(cls, file:str) -> float:
+    def get_timestamp_ns(cls, file:str) -> int:
         """
-        This function returns the time stamp value of the input file.
+        This function returns the time stamp value of the input file in nanoseconds.
         If the '__SavedTimeStampDict' has the time stamp value of the input file,
         it returns from the hash. Unless, it will check the system file stamp value.
+        Raises FileNotFoundError if the file does not exist.
         file: The input file path
         """
-
-        # Has the time stamp value of the file been stored?
-        if file in cls.__save_time_stamp_dict:
-            # Return the value from the hash.
-            return cls.__save_time_stamp_dict[file]
-        # Get the value from the system
-        file_time = cls.__get_time_stamp_value_from_os(file)
-
-        # Save the file time to the hash.
-        cls.__save_time_stamp_dict[file] = file_time
-
-        # Return the value
+        file_time = cls.collect_timestamps([file])[file]
+        if file_time is None:
+            raise FileNotFoundError(f'No such file: {file}')
         return file_time
 
+    @classmethod
+    def get_timestamp_value(cls, file:str) -> float:
+        """
+        This function returns the time stamp value of the input file in seconds.
+        See get_timestamp_ns.
+        file: The input file path
+        """
+        return cls.get_timestamp_ns(file) / 1e9
+
     @classmethod
     def compare_timestamps(cls, file1:str, file2:str) -> CompResult:
         """
@@ -80,10 +251,10 @@ class TimestampComp:
         """
 
         # Get the time stamp value of the first input file.
-        timestame_value1 = cls.get_timestamp_value(file1)
+        timestame_value1 = cls.get_timestamp_ns(file1)
 
         # Get the time stamp value of the second input file.
-        timestame_value2 = cls.get_timestamp_value(file2)
+        timestame_value2 = cls.get_timestamp_ns(file2)
 
         # If the time stamp value of the second input file is larger...
         if timestame_value1 < timestame_value2:
@@ -103,19 +274,9 @@ class TimestampComp:
         """
         This function checks if the first input file is the latest compared
         to the files in the list input as the second parameter.
-        inFile: The file to be checked.
-        aFileList_ref: Reference to the array containing files to be compared.
+        See TimestampCache.is_the_file_latest.
         """
-
-        # Check the file with all files in the array
-        for file_compared in list_file :
-            # If a file in the array is newer,
-            if cls.compare_timestamps(in_file, file_compared) == CompResult.FILE2_IS_NEWER:
-                # Return false
-                return False
-
-        # Reaching here means the checked file is the newest one.
-        return True
+        return cls.__default_cache.is_the_file_latest(in_file, list_file)
 
     @classmethod
     def is_the_file_oldest(cls,in_file:str, list_file:List[str])->bool:
@@ -142,4 +303,4 @@ class TimestampComp:
         This function clears saved timestamp information. Intended to be used for test
         """
 
-        cls.__save_time_stamp_dict = {}
+        cls.__default_cache.clear()
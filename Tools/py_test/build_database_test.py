@@ -0,0 +1,69 @@
+import unittest
+import os
+import tempfile
+from py_module.content_hash import ContentHashCache
+from py_module.build_database import BuildDatabase, ObjectRecord, RecordState
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file1 = os.path.join(self.temp_dir.name, 'file1.c')
+        self.file2 = os.path.join(self.temp_dir.name, 'file2.h')
+        with open(self.file1, 'w', encoding = 'UTF-8') as out_file:
+            out_file.write('int main(void) { return 0; }\n')
+        with open(self.file2, 'w', encoding = 'UTF-8') as out_file:
+            out_file.write('#define HOGE 1\n')
+        self.hash_cache = ContentHashCache()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_missing_file(self):
+        self.assertIsNone(ObjectRecord.create('gcc -c', [self.file1 + '.none'], self.hash_cache))
+
+    def test_basic_001_up_to_date(self):
+        record = ObjectRecord.create('gcc -c', [self.file1, self.file2], self.hash_cache)
+        self.assertEqual(record.check('gcc -c', self.hash_cache), RecordState.UP_TO_DATE)
+
+    def test_basic_002_touch_only(self):
+        record = ObjectRecord.create('gcc -c', [self.file1, self.file2], self.hash_cache)
+        stat = os.stat(self.file2)
+        os.utime(self.file2, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertEqual(record.check('gcc -c', ContentHashCache()),
+                         RecordState.UP_TO_DATE_STAMP_CHANGED)
+        self.assertEqual(record.check('gcc -c', ContentHashCache()),
+                         RecordState.UP_TO_DATE)
+
+    def test_basic_003_contents_changed(self):
+        record = ObjectRecord.create('gcc -c', [self.file1, self.file2], self.hash_cache)
+        with open(self.file2, 'w', encoding = 'UTF-8') as out_file:
+            out_file.write('#define HOGE 2\n')
+        self.assertEqual(record.check('gcc -c', ContentHashCache()),
+                         RecordState.OUT_OF_DATE)
+
+    def test_basic_004_command_changed(self):
+        record = ObjectRecord.create('gcc -c', [self.file1, self.file2], self.hash_cache)
+        self.assertEqual(record.check('gcc -O2 -c', self.hash_cache),
+                         RecordState.OUT_OF_DATE)
+
+    def test_basic_005_save_and_load(self):
+        record = ObjectRecord.create('gcc -c', [self.file1, self.file2], self.hash_cache)
+        database = BuildDatabase(self.temp_dir.name)
+        database.set_record('file1.o', record)
+        database.save()
+        self.assertEqual(BuildDatabase(self.temp_dir.name).get_record('file1.o'), record)
+        self.assertIsNone(BuildDatabase(self.temp_dir.name).get_record('file2.o'))
+
+    def test_basic_006_remove_record(self):
+        record = ObjectRecord.create('gcc -c', [self.file1], self.hash_cache, with_digest = False)
+        self.assertEqual(record.get_file_list(), [self.file1])
+        database = BuildDatabase(self.temp_dir.name)
+        database.set_record('file1.o', record)
+        database.save()
+        database.remove_record('file1.o')
+        database.save()
+        self.assertIsNone(BuildDatabase(self.temp_dir.name).get_record('file1.o'))
+
+if __name__ == '__main__':
+    unittest.main()
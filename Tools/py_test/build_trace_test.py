@@ -0,0 +1,50 @@
+import unittest
+import os
+import json
+import tempfile
+import threading
+from py_module.build_trace import BuildTrace, trace_span
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.build_trace = BuildTrace()
+        self.build_trace.add_event('fast.c', BuildTrace.COMPILE, 0.0, 0.1)
+        self.build_trace.add_event('slow.c', BuildTrace.COMPILE, 0.0, 2.0)
+        self.build_trace.add_event('test.exe', BuildTrace.LINK, 0.0, 5.0)
+
+    def test_basic_000_span(self):
+        with self.build_trace.span('middle.c', BuildTrace.COMPILE, obj = 'middle.o') as args:
+            args['status'] = 'COMPILE_SUCCEEDED'
+        event = [event for event in self.build_trace.get_events() if event.name == 'middle.c'][0]
+        self.assertEqual(event.args, {'obj': 'middle.o', 'status': 'COMPILE_SUCCEEDED'})
+        self.assertGreaterEqual(event.duration, 0.0)
+
+    def test_basic_001_slowest(self):
+        slowest = self.build_trace.get_slowest_events(BuildTrace.COMPILE, 1)
+        self.assertEqual([event.name for event in slowest], ['slow.c'])
+        self.assertEqual(len(self.build_trace.get_slowest_summary(10)), 2)
+
+    def test_basic_002_chrome_trace(self):
+        thread = threading.Thread(target = self.build_trace.add_event,
+                                  args = ('other.c', BuildTrace.COMPILE, 0.0, 0.5))
+        thread.start()
+        thread.join()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_path = os.path.join(temp_dir, 'trace.json')
+            self.build_trace.write_chrome_trace(trace_path)
+            with open(trace_path, 'r', encoding='utf-8') as trace_file:
+                trace_events = json.load(trace_file)['traceEvents']
+        complete_events = [event for event in trace_events if event['ph'] == 'X']
+        thread_names = [event for event in trace_events if event['ph'] == 'M']
+        self.assertEqual(len(complete_events), 4)
+        self.assertEqual(len(thread_names), 2)
+        self.assertIn({'name': 'slow.c', 'dur': 2000000},
+                      [{'name': event['name'], 'dur': event['dur']} for event in complete_events])
+
+    def test_basic_003_no_trace(self):
+        with trace_span(None, 'a.c', BuildTrace.COMPILE) as args:
+            args['status'] = 'COMPILE_SUCCEEDED'
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import os
+import tempfile
+from py_module.content_hash import ContentHashCache, FileSignature
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file1 = os.path.join(self.temp_dir.name, 'file1.c')
+        with open(self.file1, 'w', encoding = 'UTF-8') as out_file:
+            out_file.write('int main(void) { return 0; }\n')
+        self.hash_cache = ContentHashCache()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_missing_file(self):
+        self.assertIsNone(self.hash_cache.get_signature(self.file1 + '.none'))
+        self.assertIsNone(self.hash_cache.get_stamp(self.file1 + '.none'))
+
+    def test_basic_001_same_contents_same_digest(self):
+        signature1 = self.hash_cache.get_signature(self.file1)
+        stat = os.stat(self.file1)
+        os.utime(self.file1, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        signature2 = self.hash_cache.get_signature(self.file1)
+        self.assertEqual(signature1.digest, signature2.digest)
+        self.assertNotEqual(signature1.mtime_ns, signature2.mtime_ns)
+
+    def test_basic_002_known_signature_is_trusted(self):
+        stat = os.stat(self.file1)
+        known = FileSignature(stat.st_mtime_ns, stat.st_size, 'known')
+        self.assertEqual(self.hash_cache.get_signature(self.file1, known).digest, 'known')
+
+    def test_basic_003_stamp_without_digest(self):
+        self.assertEqual(self.hash_cache.get_stamp(self.file1).digest, '')
+
+if __name__ == '__main__':
+    unittest.main()
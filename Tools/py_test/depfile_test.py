@@ -0,0 +1,61 @@
+import unittest
+import os
+import tempfile
+from py_module.depfile import parse_dependency_text
+from py_module.depfile import parse_dependency_file
+
+class BasicTest(unittest.TestCase):
+
+    def test_basic_000_continuation(self):
+        text = ('Obj/LedDriver.o: ../LedDriver/LedDriver.c \\\n'
+                ' ../LedDriver/LedDriver.h \\\n'
+                ' ../include/CppUTest/TestHarness.h\n')
+        self.assertEqual(parse_dependency_text(text),
+                         ['../LedDriver/LedDriver.c', '../LedDriver/LedDriver.h',
+                          '../include/CppUTest/TestHarness.h'])
+
+    def test_basic_001_phony_targets(self):
+        # '-MP' adds the rules without prerequisites for the headers.
+        text = ('Obj/a.o: a.c a.h \\\r\n'
+                ' b.h\r\n'
+                '\r\n'
+                'a.h:\r\n'
+                '\r\n'
+                'b.h:\r\n')
+        self.assertEqual(parse_dependency_text(text), ['a.c', 'a.h', 'b.h'])
+
+    def test_basic_002_escape(self):
+        text = 'Obj/my\\ file.o: my\\ file.c inc\\#1.h cost$$.h\n'
+        self.assertEqual(parse_dependency_text(text), ['my file.c', 'inc#1.h', 'cost$.h'])
+
+    def test_basic_003_drive_letter(self):
+        text = ('C:\\Work\\Obj\\a.o: C:\\Work\\a.c \\\n'
+                ' C:/Work/include/a.h D:\\Include\\b.h\n'
+                'C:/Work/include/a.h:\n')
+        self.assertEqual(parse_dependency_text(text),
+                         ['C:\\Work\\a.c', 'C:/Work/include/a.h', 'D:\\Include\\b.h'])
+
+    def test_basic_004_separator_without_space(self):
+        self.assertEqual(parse_dependency_text('a.o:a.c a.h\nb.o : b.c\n'),
+                         ['a.c', 'a.h', 'b.c'])
+
+    def test_basic_005_duplicates_and_order_only(self):
+        text = 'a.o: a.c common.h | Obj Obj/Pch\nb.o: b.c common.h\n'
+        self.assertEqual(parse_dependency_text(text), ['a.c', 'common.h', 'b.c'])
+
+    def test_basic_006_interned(self):
+        # The same header found in the different files is the same object.
+        header = ''.join(['../include/CppUTest/', 'TestHarness.h'])
+        first = parse_dependency_text(f'a.o: a.c {header}\n')
+        second = parse_dependency_text(f'b.o: b.c {header}\n')
+        self.assertIs(first[1], second[1])
+
+    def test_basic_007_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dep_path = os.path.join(temp_dir, 'a.d')
+            with open(dep_path, 'w', encoding='utf-8') as dep_file:
+                dep_file.write('a.o: a.c \\\n a.h\n')
+            self.assertEqual(parse_dependency_file(dep_path), ['a.c', 'a.h'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+from py_module.junit_report import CaseResult, CaseStatus
+from py_module.execution_cache import ExecutionCache, CachedExecution
+
+def create_execution():
+    return CachedExecution(
+        is_passed = False,
+        output = ['TEST(LedDriver, LedOn) - 0 ms', 'Errors (1 failures, 2 tests, 2 ran)'],
+        test_counts = {'tests': 2, 'failures': 1, 'ran': 2, 'checks': 2, 'ignored': 0,
+                       'filtered_out': 0},
+        case_results = [CaseResult('LedDriver', 'LedOn', 0.1, CaseStatus.FAILED),
+                        CaseResult('LedDriver', 'LedOff', 0.0, CaseStatus.PASSED)])
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.executable_path = os.path.join(self.temp_dir.name, 'LedDriverTest.exe')
+        self.write_executable(b'executable 1')
+        self.cache = ExecutionCache(self.executable_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_executable(self, contents:bytes):
+        with open(self.executable_path, 'wb') as executable_file:
+            executable_file.write(contents)
+
+    def test_basic_000_empty(self):
+        key = self.cache.get_key(['-v'])
+        self.assertIsNotNone(key)
+        self.assertIsNone(self.cache.load(key))
+
+    def test_basic_001_saved(self):
+        key = self.cache.get_key(['-v'])
+        self.cache.save(key, create_execution())
+        self.assertTrue(os.path.isfile(self.executable_path + ExecutionCache.FILE_EXTENSION))
+        # Loaded by another object. e.g. The next run
+        self.assertEqual(ExecutionCache(self.executable_path).load(key), create_execution())
+
+    def test_basic_002_executable_changed(self):
+        self.cache.save(self.cache.get_key(['-v']), create_execution())
+        self.write_executable(b'executable 2')
+        self.assertIsNone(self.cache.load(self.cache.get_key(['-v'])))
+
+    def test_basic_003_arguments_changed(self):
+        key = self.cache.get_key(['-v'])
+        self.cache.save(key, create_execution())
+        self.assertNotEqual(self.cache.get_key(['-v', '-ojunit']), key)
+        self.assertIsNone(self.cache.load(self.cache.get_key(['-v', '-ojunit'])))
+
+    def test_basic_004_environment_changed(self):
+        key = self.cache.get_key([])
+        with mock.patch.dict(os.environ, {'TZ': 'Asia/Tokyo'}):
+            self.assertNotEqual(self.cache.get_key([]), key)
+        with mock.patch.dict(os.environ, {'UNRELATED_VARIABLE': '1'}):
+            self.assertEqual(self.cache.get_key([]), key)
+
+    def test_basic_005_clear(self):
+        key = self.cache.get_key([])
+        self.cache.save(key, create_execution())
+        self.cache.clear()
+        self.assertIsNone(self.cache.load(key))
+        # Nothing to remove
+        self.cache.clear()
+
+    def test_basic_006_no_executable(self):
+        os.remove(self.executable_path)
+        self.assertIsNone(self.cache.get_key([]))
+
+    def test_basic_007_broken(self):
+        key = self.cache.get_key([])
+        with open(self.executable_path + ExecutionCache.FILE_EXTENSION, 'w',
+                  encoding = 'UTF-8') as cache_file:
+            cache_file.write('{"version": 1, "key": ')
+        self.assertIsNone(self.cache.load(key))
+
+if __name__ == '__main__':
+    unittest.main()
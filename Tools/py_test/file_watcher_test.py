@@ -0,0 +1,76 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from py_module.file_watcher import FileWatcher
+from py_module.file_watcher import PollingFileWatcher
+from py_module.file_watcher import InotifyFileWatcher
+
+class PollingTest(unittest.TestCase):
+
+    def create_watcher(self)->FileWatcher:
+        return PollingFileWatcher(interval = 0.05)
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.watched_file = os.path.join(self.temp_dir, 'Watched.h')
+        self.other_file = os.path.join(self.temp_dir, 'Other.h')
+        for file_path in (self.watched_file, self.other_file):
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write('// before\n')
+        self.watcher = self.create_watcher()
+        self.watcher.set_files([self.watched_file])
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.temp_dir)
+
+    def write_later(self, file_path:str):
+        def write():
+            time.sleep(0.1)
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write('// after, longer than before\n')
+        thread = threading.Thread(target = write)
+        thread.start()
+        return thread
+
+    def test_000_no_change(self):
+        self.assertEqual(self.watcher.wait_for_changes(debounce = 0.05, timeout = 0.3), set())
+
+    def test_001_change_detected(self):
+        thread = self.write_later(self.watched_file)
+        changed = self.watcher.wait_for_changes(debounce = 0.05, timeout = 5)
+        thread.join()
+        self.assertEqual(changed, {FileWatcher.normalize(self.watched_file)})
+
+    def test_002_file_not_watched(self):
+        thread = self.write_later(self.other_file)
+        changed = self.watcher.wait_for_changes(debounce = 0.05, timeout = 0.5)
+        thread.join()
+        self.assertEqual(changed, set())
+
+    def test_003_stop_event(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertEqual(self.watcher.wait_for_changes(stop_event = stop_event), set())
+
+class InotifyTest(PollingTest):
+
+    def create_watcher(self)->FileWatcher:
+        try:
+            return InotifyFileWatcher()
+        except (OSError, AttributeError):
+            self.skipTest('inotify is not available')
+
+class BaseClassTest(unittest.TestCase):
+
+    def test_000_incomplete_subclass(self):
+        class IncompleteWatcher(FileWatcher):
+            pass
+        with self.assertRaises(TypeError):
+            IncompleteWatcher()
+
+if __name__ == '__main__':
+    unittest.main()
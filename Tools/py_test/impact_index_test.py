@@ -0,0 +1,40 @@
+import unittest
+from py_module.impact_index import ImpactIndex
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.impact_index = ImpactIndex()
+        self.impact_index.add_global_file('../GlobalMakeConfig.jsonc')
+        self.impact_index.add_module('LedDriver', ['./Led/LedDriver.c', './Led/LedDriver.h',
+                                                   './Common/Types.h'])
+        self.impact_index.add_module('Timer', ['./Timer/Timer.c', './Common/Types.h'])
+        self.impact_index.add_module('Motor', ['./Motor/Motor.c'])
+
+    def test_basic_000_no_module_affected(self):
+        self.assertEqual(self.impact_index.get_affected_modules(['./README.md']), [])
+
+    def test_basic_001_one_module_affected(self):
+        self.assertEqual(self.impact_index.get_affected_modules(['Led/../Led/LedDriver.h']),
+                         ['LedDriver'])
+
+    def test_basic_002_shared_file(self):
+        self.assertEqual(self.impact_index.get_affected_modules(['./Common/Types.h']),
+                         ['LedDriver', 'Timer'])
+
+    def test_basic_003_global_file(self):
+        self.assertEqual(self.impact_index.get_affected_modules(['../GlobalMakeConfig.jsonc']),
+                         ['LedDriver', 'Timer', 'Motor'])
+
+    def test_basic_004_unknown_dependencies(self):
+        self.impact_index.add_module('NotBuilt', None)
+        self.assertEqual(self.impact_index.get_affected_modules(['./Motor/Motor.c']),
+                         ['Motor', 'NotBuilt'])
+
+    def test_basic_005_file_list(self):
+        self.assertEqual(len(self.impact_index.get_file_list()), 6)
+        self.assertTrue(self.impact_index.is_global_change(['../GlobalMakeConfig.jsonc']))
+        self.assertFalse(self.impact_index.is_global_change(['./Common/Types.h']))
+
+if __name__ == '__main__':
+    unittest.main()
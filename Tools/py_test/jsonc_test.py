@@ -1,5 +1,6 @@
 import unittest
 from py_module.jsonc import load
+from py_module.jsonc import loads
 from py_module.jsonc import JsonWithCommentsDecodeError
 
 class BasicTest(unittest.TestCase):
@@ -19,6 +20,36 @@ class BasicTest(unittest.TestCase):
             self.assertEqual(read_dict['array_of_dict'][1]['string'], 'Hello')
             self.assertEqual(read_dict['array_of_dict'][1]['number'], 2)
 
+class SyntaxTest(unittest.TestCase):
+
+    def test_syntax_000_comment_markers_in_string(self):
+        read_dict = loads('{ "url": "http://example.com/*x*/", /* "a": 1 */ "b": "//" }')
+        self.assertEqual(read_dict, {'url': 'http://example.com/*x*/', 'b': '//'})
+
+    def test_syntax_001_escaped_quote(self):
+        read_dict = loads('{ "a": "say \\"hi\\" // not a comment" } // comment')
+        self.assertEqual(read_dict['a'], 'say "hi" // not a comment')
+
+    def test_syntax_002_multi_line_comment(self):
+        read_dict = loads('{\n /* line 1\n    line 2 */\n "a": 1\n}')
+        self.assertEqual(read_dict, {'a': 1})
+
+    def test_syntax_003_trailing_comma(self):
+        read_dict = loads('{ "a": [1, 2, /* last */ ], "b": { "c": 3, // comment\n },\n}')
+        self.assertEqual(read_dict, {'a': [1, 2], 'b': {'c': 3}})
+        self.assertEqual(loads('[ "a,", ",]" ]'), ['a,', ',]'])
+
+    def test_syntax_004_error_position(self):
+        with self.assertRaises(JsonWithCommentsDecodeError) as context:
+            loads('{\n  /* comment */ "a": 1,\n  "b": \n}')
+        self.assertEqual((context.exception.lineno, context.exception.colno), (4, 1))
+        self.assertIn('line 4 column 1', context.exception.args[0])
+
+    def test_syntax_005_unterminated_comment(self):
+        with self.assertRaises(JsonWithCommentsDecodeError) as context:
+            loads('{\n  "a": 1 /* not closed\n}')
+        self.assertEqual((context.exception.lineno, context.exception.colno), (2, 10))
+
 class ErrorDetectTest(unittest.TestCase):
 
     __EXT_JSONC_FILE = './py_test/jsonc_test/error.jsonc'
@@ -0,0 +1,56 @@
+import unittest
+import os
+import tempfile
+from py_module.junit_report import parse_junit_report, parse_junit_reports
+from py_module.junit_report import CaseResult, CaseStatus
+
+REPORT = '''<?xml version="1.0" encoding="UTF-8" ?>
+<testsuite errors="0" failures="1" hostname="localhost" name="LedDriver" tests="3" time="0.012">
+<properties>
+</properties>
+<testcase classname="LedDriver" name="LedOff" time="0.010">
+<failure message="LedDriverTest.cpp:61: expected [253 0xfd]" type="AssertionFailedError">
+</failure>
+</testcase>
+<testcase classname="LedDriver" name="LedOn" time="0.002">
+</testcase>
+<testcase classname="LedDriver" name="Ignored" time="0.000">
+<skipped />
+</testcase>
+<system-out></system-out>
+<system-err></system-err>
+</testsuite>
+'''
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.report_path = os.path.join(self.temp_dir.name, 'cpputest_LedDriver.xml')
+        with open(self.report_path, 'w', encoding = 'UTF-8') as report_file:
+            report_file.write(REPORT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_parse(self):
+        self.assertEqual(parse_junit_report(self.report_path), [
+            CaseResult('LedDriver', 'LedOff', 0.010, CaseStatus.FAILED),
+            CaseResult('LedDriver', 'LedOn', 0.002, CaseStatus.PASSED),
+            CaseResult('LedDriver', 'Ignored', 0.0, CaseStatus.SKIPPED)
+            ])
+
+    def test_basic_001_broken_report(self):
+        with open(self.report_path, 'w', encoding = 'UTF-8') as report_file:
+            report_file.write(REPORT[:REPORT.index('<testcase classname="LedDriver" name="LedOn"')])
+        results = parse_junit_report(self.report_path)
+        self.assertEqual([result.get_full_name() for result in results], ['LedDriver.LedOff'])
+
+    def test_basic_002_parse_directory(self):
+        with open(os.path.join(self.temp_dir.name, 'cpputest_Timer.xml'), 'w',
+                  encoding = 'UTF-8') as report_file:
+            report_file.write(REPORT.replace('LedDriver', 'Timer'))
+        self.assertEqual(len(parse_junit_reports(self.temp_dir.name)), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import tempfile
+from py_module.make_config import MakeConfigCache
+from py_module import jsonc
+
+class BasicTest(unittest.TestCase):
+    __CONFIG = '''{
+    "target" : "./Obj/Test.exe",
+    /* Options of all the sources */
+    "global_option": ["-MMD"],
+    "source_file":
+    [
+        { "path": "./Test.c", "opt": ["-O0"], "obj_dir": "./Obj" }
+    ],
+    "include_path": ["../Include/"]
+}
+'''
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = f'{self.temp_dir.name}/MakeConfig.jsonc'
+        self.cache_path = f'{self.temp_dir.name}/cache/config_cache.json'
+        with open(self.config_path, 'w', encoding='utf-8') as config_file:
+            config_file.write(self.__CONFIG)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_resolved(self):
+        config = MakeConfigCache().load(self.config_path)
+        self.assertEqual(config.target, f'{self.temp_dir.name}/Obj/Test.exe')
+        self.assertEqual(config.include_path, (f'{self.temp_dir.name}/../Include/',))
+        self.assertEqual(config.source_file[0].path, f'{self.temp_dir.name}/Test.c')
+        self.assertEqual(config.source_file[0].opt, ('-MMD', '-O0'))
+        self.assertIsNone(config.compiler)
+
+    def test_basic_001_cached(self):
+        config_cache = MakeConfigCache()
+        config = config_cache.load(self.config_path)
+        self.assertIs(config_cache.load(self.config_path), config)
+        self.assertEqual(config_cache.get_parse_count(), 1)
+
+    def test_basic_002_modified(self):
+        config_cache = MakeConfigCache()
+        config_cache.load(self.config_path)
+        with open(self.config_path, 'w', encoding='utf-8') as config_file:
+            config_file.write(self.__CONFIG.replace('Test.exe', 'Other.exe'))
+        config = config_cache.load(self.config_path)
+        self.assertEqual(config.target, f'{self.temp_dir.name}/Obj/Other.exe')
+        self.assertEqual(config_cache.get_parse_count(), 2)
+
+    def test_basic_003_cache_file(self):
+        config_cache = MakeConfigCache(self.cache_path)
+        config = config_cache.load(self.config_path)
+        config_cache.save()
+
+        next_cache = MakeConfigCache(self.cache_path)
+        self.assertEqual(next_cache.load(self.config_path), config)
+        self.assertEqual(next_cache.get_parse_count(), 0)
+
+    def test_basic_004_broken_file(self):
+        with open(self.config_path, 'w', encoding='utf-8') as config_file:
+            config_file.write('{ "target" : }')
+        with self.assertRaises(jsonc.JsonWithCommentsDecodeError):
+            MakeConfigCache().load(self.config_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,24 @@
 import unittest
 import sys
 import os
+import glob
+import shutil
 from py_module.make import MakeFile
 from py_module.make import ExecutableStatus
+from py_module.make import RebuildDetection
 from py_module.timestamp_comp import TimestampComp
+from py_module.object_cache import ObjectCache
+from py_module.make_config import UnityBuildConfig
+
+def remove_outputs(path_list):
+    """
+    This function removes the files and the folders made by a test.
+    """
+    for path in path_list:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
 
 class BasicTest(unittest.TestCase):
     __BASE_DIR = './py_test/make_test'
@@ -44,6 +59,489 @@ class BasicTest(unittest.TestCase):
         result = self.ext_instance.make()
         self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
 
+    def test_basic_004_clear_only_artifacts(self):
+        print('\n\n*********** Start Clear artifacts Test ************\n')
+        self.ext_instance.make()
+        coverage_data = f'{self.__EXT_OBJ_PATH}/main.gcda'
+        other_file = f'{self.__EXT_OBJ_PATH}/keep.txt'
+        for file_path in (coverage_data, other_file):
+            with open(file_path, 'w', encoding='utf-8'):
+                pass
+        self.ext_instance.clear()
+        self.assertFalse(os.path.exists(f'{self.__EXT_OBJ_PATH}/main.o'))
+        self.assertFalse(os.path.exists(f'{self.__EXT_OBJ_PATH}/math.d'))
+        self.assertFalse(os.path.exists(coverage_data))
+        self.assertFalse(os.path.exists(self.__EXT_TARGET))
+        self.assertTrue(os.path.exists(other_file))
+        os.remove(other_file)
+
+class ParallelCompileTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test'
+    __EXT_TARGET = f'{__BASE_DIR}/test.exe'
+    __EXT_COMPILER = 'gcc'
+    __EXT_INCLUDE_PATH = [f'{__BASE_DIR}/math']
+    __EXT_LINKER_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_OBJ_PATH = f'{__BASE_DIR}/Obj'
+    __EXT_SOURCE_1 = f'{__BASE_DIR}/main.c'
+    __EXT_SOURCE_2 = f'{__BASE_DIR}/math/math.c'
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('******** Start Parallel Test ************')
+        print('*****************************************')
+        cls.messages = []
+        cls.ext_instance = MakeFile(cls.__EXT_TARGET, cls.__EXT_COMPILER, cls.__EXT_INCLUDE_PATH,
+                                    cls.__EXT_LINKER_OPTION, string_out = cls.messages.append,
+                                    jobs = 2)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_1, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_2, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+
+    def test_parallel_000_build(self):
+        print('\n\n*********** Start parallel build Test ************\n')
+        result = self.ext_instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        build_times = self.ext_instance.get_build_times()
+        self.assertGreater(build_times.compile_time, 0.0)
+        self.assertGreater(build_times.link_time, 0.0)
+
+    def test_parallel_002_dependency_list(self):
+        print('\n\n*********** Start dependency list Test ************\n')
+        self.ext_instance.build()
+        dependency_list = [os.path.normpath(path)
+                                for path in self.ext_instance.get_dependency_list()]
+        self.assertIn(os.path.normpath(self.__EXT_SOURCE_1), dependency_list)
+        self.assertIn(os.path.normpath(f'{self.__BASE_DIR}/math/math.h'), dependency_list)
+        self.assertEqual(len(dependency_list), len(set(dependency_list)))
+
+        # The dependencies of the objects not made yet are not known.
+        instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, self.__EXT_INCLUDE_PATH,
+                            self.__EXT_LINKER_OPTION, string_out = self.messages.append)
+        instance.add_src(self.__EXT_SOURCE_1, self.__EXT_COMPILE_OPTION,
+                         f'{self.__BASE_DIR}/NotMadeObj')
+        self.assertIsNone(instance.get_dependency_list())
+
+    def test_parallel_001_messages_are_ordered(self):
+        print('\n\n*********** Start message order Test ************\n')
+        self.messages.clear()
+        self.ext_instance.build()
+        compile_messages = [msg for msg in self.messages
+                                if ' -c ' in msg or msg.startswith('skip compiling')]
+        main_idx = [idx for idx, msg in enumerate(compile_messages) if 'main.' in msg]
+        math_idx = [idx for idx, msg in enumerate(compile_messages) if 'math.' in msg]
+        self.assertLess(max(main_idx), min(math_idx))
+
+class LibraryTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test'
+    __EXT_LIBRARY = f'{__BASE_DIR}/Lib/libmath.a'
+    __EXT_TARGET = f'{__BASE_DIR}/test_lib.exe'
+    __EXT_COMPILER = 'gcc'
+    __EXT_INCLUDE_PATH = [f'{__BASE_DIR}/math']
+    __EXT_LINKER_OPTION = ['-Wall', '-O2']
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_SOURCE_1 = f'{__BASE_DIR}/main.c'
+    __EXT_SOURCE_2 = f'{__BASE_DIR}/math/math.c'
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('********* Start Library Test ************')
+        print('*****************************************')
+        cls.lib_instance = MakeFile(cls.__EXT_LIBRARY, cls.__EXT_COMPILER)
+        cls.lib_instance.add_src(cls.__EXT_SOURCE_2, cls.__EXT_COMPILE_OPTION,
+                                 f'{cls.__BASE_DIR}/Lib')
+        cls.ext_instance = MakeFile(cls.__EXT_TARGET, cls.__EXT_COMPILER, cls.__EXT_INCLUDE_PATH,
+                                    cls.__EXT_LINKER_OPTION)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_1, cls.__EXT_COMPILE_OPTION,
+                                 f'{cls.__BASE_DIR}/LibObj')
+        cls.ext_instance.add_library(cls.__EXT_LIBRARY)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([f'{cls.__BASE_DIR}/Lib', f'{cls.__BASE_DIR}/LibObj', cls.__EXT_TARGET])
+
+    def test_library_000_build_library(self):
+        print('\n\n*********** Start library build Test ************\n')
+        result = self.lib_instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertTrue(os.path.exists(self.__EXT_LIBRARY))
+
+    def test_library_001_link_library(self):
+        print('\n\n*********** Start library link Test ************\n')
+        result = self.ext_instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+
+    def test_library_002_coverage_instrumented(self):
+        print('\n\n*********** Start coverage instrumented Test ************\n')
+        self.assertFalse(self.ext_instance.is_coverage_instrumented())
+        linked_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, [], ['--coverage'])
+        self.assertTrue(linked_instance.is_coverage_instrumented())
+        compiled_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER)
+        compiled_instance.add_src(self.__EXT_SOURCE_1, ['-fprofile-arcs', '-ftest-coverage'],
+                                  f'{self.__BASE_DIR}/LibObj')
+        self.assertTrue(compiled_instance.is_coverage_instrumented())
+
+class ContentHashTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test'
+    __EXT_TARGET = f'{__BASE_DIR}/test_hash.exe'
+    __EXT_COMPILER = 'gcc'
+    __EXT_INCLUDE_PATH = [f'{__BASE_DIR}/math']
+    __EXT_LINKER_OPTION = ['-Wall', '-O2']
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_OBJ_PATH = f'{__BASE_DIR}/HashObj'
+    __EXT_SOURCE_1 = f'{__BASE_DIR}/main.c'
+    __EXT_SOURCE_2 = f'{__BASE_DIR}/math/math.c'
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('****** Start Content Hash Test **********')
+        print('*****************************************')
+        cls.messages = []
+        cls.ext_instance = MakeFile(cls.__EXT_TARGET, cls.__EXT_COMPILER, cls.__EXT_INCLUDE_PATH,
+                                    cls.__EXT_LINKER_OPTION, string_out = cls.messages.append,
+                                    rebuild_detection = RebuildDetection.CONTENT_HASH)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_1, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_2, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([cls.__EXT_OBJ_PATH, cls.__EXT_TARGET])
+
+    def test_hash_000_make(self):
+        print('\n\n*********** Start content hash make Test ************\n')
+        result = self.ext_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+
+    def test_hash_001_touch_only_make(self):
+        print('\n\n*********** Start touch only make Test ************\n')
+        TimestampComp.clear_time_stamp_dict()
+        os.utime(path='./py_test/make_test/math/math.h', times=None)
+        self.messages.clear()
+        result = self.ext_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual([msg for msg in self.messages if ' -c ' in msg], [])
+
+class BuildDatabaseTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test'
+    __EXT_TARGET = f'{__BASE_DIR}/test_db.exe'
+    __EXT_COMPILER = 'gcc'
+    __EXT_INCLUDE_PATH = [f'{__BASE_DIR}/math']
+    __EXT_LINKER_OPTION = ['-Wall', '-O2']
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_OBJ_PATH = f'{__BASE_DIR}/DbObj'
+    __EXT_SOURCE_1 = f'{__BASE_DIR}/main.c'
+    __EXT_SOURCE_2 = f'{__BASE_DIR}/math/math.c'
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('***** Start Build Database Test *********')
+        print('*****************************************')
+        cls.messages = []
+        cls.ext_instance = MakeFile(cls.__EXT_TARGET, cls.__EXT_COMPILER, cls.__EXT_INCLUDE_PATH,
+                                    cls.__EXT_LINKER_OPTION, string_out = cls.messages.append)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_1, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+        cls.ext_instance.add_src(cls.__EXT_SOURCE_2, cls.__EXT_COMPILE_OPTION, cls.__EXT_OBJ_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([cls.__EXT_OBJ_PATH, cls.__EXT_TARGET])
+
+    def test_database_000_make(self):
+        print('\n\n*********** Start build database make Test ************\n')
+        result = self.ext_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+
+    def test_database_001_make_without_dependency_files(self):
+        print('\n\n*********** Start make without .d files Test ************\n')
+        os.remove(f'{self.__EXT_OBJ_PATH}/main.d')
+        os.remove(f'{self.__EXT_OBJ_PATH}/math.d')
+        other_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, self.__EXT_INCLUDE_PATH,
+                                  self.__EXT_LINKER_OPTION, string_out = self.messages.append)
+        other_instance.add_src(self.__EXT_SOURCE_1, self.__EXT_COMPILE_OPTION, self.__EXT_OBJ_PATH)
+        other_instance.add_src(self.__EXT_SOURCE_2, self.__EXT_COMPILE_OPTION, self.__EXT_OBJ_PATH)
+        self.messages.clear()
+        result = other_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual([msg for msg in self.messages if ' -c ' in msg], [])
+
+    def test_database_002_option_changed(self):
+        print('\n\n*********** Start option changed make Test ************\n')
+        other_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, self.__EXT_INCLUDE_PATH,
+                                  ['-Wall', '-O0'], string_out = self.messages.append)
+        other_instance.add_src(self.__EXT_SOURCE_1, ['-MMD', '-Wall', '-O0'], self.__EXT_OBJ_PATH)
+        other_instance.add_src(self.__EXT_SOURCE_2, self.__EXT_COMPILE_OPTION, self.__EXT_OBJ_PATH)
+        self.messages.clear()
+        result = other_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        compile_messages = [msg for msg in self.messages if ' -c ' in msg]
+        self.assertEqual(len(compile_messages), 1)
+        self.assertIn('main.c', compile_messages[0])
+
+    def test_database_003_linker_option_changed(self):
+        print('\n\n*********** Start linker option changed make Test ************\n')
+        other_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, self.__EXT_INCLUDE_PATH,
+                                  ['-Wall', '-O1'], string_out = self.messages.append)
+        other_instance.add_src(self.__EXT_SOURCE_1, ['-MMD', '-Wall', '-O0'], self.__EXT_OBJ_PATH)
+        other_instance.add_src(self.__EXT_SOURCE_2, self.__EXT_COMPILE_OPTION, self.__EXT_OBJ_PATH)
+        self.messages.clear()
+        result = other_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual([msg for msg in self.messages if ' -c ' in msg], [])
+        self.assertEqual(len([msg for msg in self.messages if ' -o ' in msg]), 1)
+
+    def test_database_004_same_objects_not_linked(self):
+        print('\n\n*********** Start same objects make Test ************\n')
+        other_instance = MakeFile(self.__EXT_TARGET, self.__EXT_COMPILER, self.__EXT_INCLUDE_PATH,
+                                  ['-Wall', '-O1'], string_out = self.messages.append)
+        other_instance.add_src(self.__EXT_SOURCE_1, ['-MMD', '-Wall', '-O0'], self.__EXT_OBJ_PATH)
+        other_instance.add_src(self.__EXT_SOURCE_2, self.__EXT_COMPILE_OPTION, self.__EXT_OBJ_PATH)
+        # The source is compiled again, but the object file is the same as before.
+        os.utime(path=self.__EXT_SOURCE_1, times=None)
+        self.messages.clear()
+        result = other_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(len([msg for msg in self.messages if ' -c ' in msg]), 1)
+        self.assertIn('Skip linking, because the objects and the libraries have not changed.',
+                      self.messages)
+
+class ObjectCacheTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test'
+    __EXT_COMPILER = 'gcc'
+    __EXT_INCLUDE_PATH = [f'{__BASE_DIR}/math']
+    __EXT_LINKER_OPTION = ['-Wall', '-O2']
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+    __EXT_CACHE_PATH = f'{__BASE_DIR}/ObjCache'
+    __EXT_SOURCE_1 = f'{__BASE_DIR}/main.c'
+    __EXT_SOURCE_2 = f'{__BASE_DIR}/math/math.c'
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('****** Start Object Cache Test **********')
+        print('*****************************************')
+        cls.messages = []
+        cls.object_cache = ObjectCache(cls.__EXT_CACHE_PATH, 1024 * 1024)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([cls.__EXT_CACHE_PATH] +
+                       [f'{cls.__BASE_DIR}/{name}{extension}'
+                            for name in ('CacheObj1', 'CacheObj2') for extension in ('', '.exe')])
+
+    def __create_instance(self, name):
+        instance = MakeFile(f'{self.__BASE_DIR}/{name}.exe', self.__EXT_COMPILER,
+                            self.__EXT_INCLUDE_PATH, self.__EXT_LINKER_OPTION,
+                            string_out = self.messages.append)
+        instance.add_src(self.__EXT_SOURCE_1, self.__EXT_COMPILE_OPTION,
+                         f'{self.__BASE_DIR}/{name}')
+        instance.add_src(self.__EXT_SOURCE_2, self.__EXT_COMPILE_OPTION,
+                         f'{self.__BASE_DIR}/{name}')
+        instance.set_object_cache(self.object_cache)
+        return instance
+
+    def test_cache_000_build(self):
+        print('\n\n*********** Start object cache build Test ************\n')
+        result = self.__create_instance('CacheObj1').build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+
+    def test_cache_001_build_other_directory(self):
+        print('\n\n*********** Start object cache hit Test ************\n')
+        self.messages.clear()
+        result = self.__create_instance('CacheObj2').build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(len([msg for msg in self.messages
+                                if msg.startswith('Served from the object cache')]), 2)
+        self.assertTrue(os.path.exists(f'{self.__BASE_DIR}/CacheObj2/main.d'))
+
+class PrecompiledHeaderTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test/pch'
+    __EXT_OBJ_PATH = f'{__BASE_DIR}/PchObj'
+    __EXT_HEADER = f'{__BASE_DIR}/pch.h'
+    __EXT_COMPILER = 'g++'
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('**** Start Precompiled Header Test ******')
+        print('*****************************************')
+        cls.messages = []
+        # The library declaring the precompiled header, and the executable using it
+        cls.owner_instance = MakeFile(string_out = cls.messages.append)
+        cls.owner_instance.load_json_makefile(f'{cls.__BASE_DIR}/makefile.jsonc')
+        cls.ext_instance = MakeFile(f'{cls.__EXT_OBJ_PATH}/test_pch.exe', cls.__EXT_COMPILER,
+                                    cls.owner_instance.get_include_path_list(),
+                                    string_out = cls.messages.append)
+        cls.ext_instance.add_src(f'{cls.__BASE_DIR}/main.cpp', cls.__EXT_COMPILE_OPTION,
+                                 cls.__EXT_OBJ_PATH, use_precompiled_header = True)
+        cls.ext_instance.add_library(cls.owner_instance.get_target_path())
+        cls.ext_instance.set_precompiled_header(cls.owner_instance.get_precompiled_header(),
+                                                cls.owner_instance.get_include_path_list())
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([cls.__EXT_OBJ_PATH])
+
+    def __get_precompiled_header_list(self):
+        return glob.glob(f'{self.__EXT_OBJ_PATH}/Pch/*/pch.h.gch')
+
+    def __get_compile_messages(self):
+        return [msg for msg in self.messages if ' -c ' in msg]
+
+    def test_pch_000_build(self):
+        print('\n\n*********** Start precompiled header build Test ************\n')
+        self.messages.clear()
+        result = self.owner_instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        # The source which does not opt in is compiled without the precompiled header.
+        self.assertEqual(self.__get_precompiled_header_list(), [])
+        compile_messages = self.__get_compile_messages()
+        self.assertEqual(len(compile_messages), 1)
+        self.assertNotIn('-include', compile_messages[0])
+
+        self.messages.clear()
+        result = self.ext_instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(len(self.__get_precompiled_header_list()), 1)
+        compile_messages = self.__get_compile_messages()
+        self.assertEqual(len(compile_messages), 2)
+        self.assertIn('-x c++-header', compile_messages[0])
+        self.assertIn('-include', compile_messages[1])
+
+    def test_pch_001_make_up_to_date(self):
+        print('\n\n*********** Start precompiled header make Test ************\n')
+        self.messages.clear()
+        result = self.ext_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(self.__get_compile_messages(), [])
+
+    def test_pch_002_header_touched(self):
+        print('\n\n*********** Start precompiled header touched Test ************\n')
+        os.utime(path=self.__EXT_HEADER, times=None)
+        self.messages.clear()
+        result = self.ext_instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        # Both the precompiled header and the source using it are made again.
+        self.assertEqual(len(self.__get_compile_messages()), 2)
+
+    def test_pch_003_clear(self):
+        print('\n\n*********** Start precompiled header clear Test ************\n')
+        # The make file sharing the precompiled header does not remove it.
+        self.ext_instance.clear()
+        self.assertEqual(len(self.__get_precompiled_header_list()), 1)
+        # The owner removes it.
+        self.owner_instance.clear()
+        self.assertEqual(self.__get_precompiled_header_list(), [])
+        self.assertEqual(glob.glob(f'{self.__EXT_OBJ_PATH}/Pch/*/pch.h'), [])
+        # The folders made for the precompiled headers are removed as well.
+        self.assertFalse(os.path.exists(f'{self.__EXT_OBJ_PATH}/Pch'))
+
+    def test_pch_004_standard_headers_before_harness(self):
+        print('\n\n*********** Start precompiled harness header Test ************\n')
+        instance = MakeFile(string_out = self.messages.append)
+        instance.load_json_makefile(f'{self.__BASE_DIR}/harness_order.jsonc')
+        self.messages.clear()
+        result = instance.build()
+        instance.clear()
+        # The precompiled header does not define 'new' before the standard headers.
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        compile_messages = self.__get_compile_messages()
+        self.assertEqual(len(compile_messages), 2)
+        self.assertIn('-include', compile_messages[1])
+        self.assertFalse(os.path.exists(f'{self.__EXT_OBJ_PATH}/HarnessPch'))
+
+class UnityBuildTest(unittest.TestCase):
+    __BASE_DIR = './py_test/make_test/unity'
+    __EXT_COMPILER = 'g++'
+    __EXT_COMPILE_OPTION = ['-MMD', '-Wall', '-O2']
+
+    @classmethod
+    def setUpClass(cls):
+        print('\n\n')
+        print('*****************************************')
+        print('******* Start Unity Build Test **********')
+        print('*****************************************')
+        cls.messages = []
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_outputs([f'{cls.__BASE_DIR}/{name}'
+                            for name in ('UnityObj', 'UnityFallbackObj', 'UnityCoverageObj')])
+
+    def __create_instance(self, name, source_list, compile_option, linker_option = None):
+        obj_path = f'{self.__BASE_DIR}/{name}'
+        instance = MakeFile(f'{obj_path}/test.exe', self.__EXT_COMPILER, [], linker_option,
+                            string_out = self.messages.append)
+        for source in source_list:
+            instance.add_src(f'{self.__BASE_DIR}/{source}', compile_option, obj_path)
+        instance.set_unity_build(UnityBuildConfig(batch_size = 8))
+        return instance
+
+    def __get_compile_messages(self):
+        return [msg for msg in self.messages if ' -c ' in msg]
+
+    def test_unity_000_build(self):
+        print('\n\n*********** Start unity build Test ************\n')
+        instance = self.__create_instance('UnityObj', ['main.cpp', 'first.cpp', 'second.cpp'],
+                                          self.__EXT_COMPILE_OPTION)
+        self.messages.clear()
+        result = instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        compile_messages = self.__get_compile_messages()
+        self.assertEqual(len(compile_messages), 1)
+        self.assertIn('/Unity_', compile_messages[0])
+
+        # Up-to-date
+        self.messages.clear()
+        result = instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(self.__get_compile_messages(), [])
+
+        # The batch is compiled again if one of the members is modified.
+        os.utime(path=f'{self.__BASE_DIR}/second.cpp', times=None)
+        self.messages.clear()
+        result = instance.make()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(len(self.__get_compile_messages()), 1)
+
+        instance.clear()
+        self.assertEqual(glob.glob(f'{self.__BASE_DIR}/UnityObj/Unity_*'), [])
+
+    def test_unity_001_fallback(self):
+        print('\n\n*********** Start unity build fallback Test ************\n')
+        instance = self.__create_instance('UnityFallbackObj',
+                                          ['main.cpp', 'first.cpp', 'second_conflict.cpp'],
+                                          self.__EXT_COMPILE_OPTION)
+        self.messages.clear()
+        result = instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        self.assertEqual(len([msg for msg in self.messages
+                                if msg.startswith('The unity build of')]), 1)
+        # The batch, then its members one by one
+        self.assertEqual(len(self.__get_compile_messages()), 4)
+
+    def test_unity_002_coverage_excluded(self):
+        print('\n\n*********** Start unity build coverage Test ************\n')
+        instance = self.__create_instance('UnityCoverageObj',
+                                          ['main.cpp', 'first.cpp', 'second.cpp'],
+                                          self.__EXT_COMPILE_OPTION + ['--coverage'],
+                                          ['--coverage'])
+        self.messages.clear()
+        result = instance.build()
+        self.assertEqual(result, ExecutableStatus.EXECUTABLE_VALID)
+        compile_messages = self.__get_compile_messages()
+        self.assertEqual(len(compile_messages), 3)
+        self.assertEqual([msg for msg in compile_messages if '/Unity_' in msg], [])
+
 class JsonReadTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
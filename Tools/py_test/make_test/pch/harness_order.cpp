@@ -0,0 +1,15 @@
+/* The standard headers are included before the test harness, which defines 'new'. */
+#include <map>
+#include <vector>
+#include "CppUTest/TestHarness.h"
+
+TEST_GROUP(HarnessOrder)
+{
+};
+
+TEST(HarnessOrder, StandardHeadersFirst)
+{
+    std::map<int, std::vector<int>> values;
+    values[1].push_back(2);
+    LONGS_EQUAL(1, values.size());
+}
@@ -0,0 +1,9 @@
+#include <cstdio>
+#include "pch.h"
+
+int main(void)
+{
+    std::vector<std::string> words = {"precompiled", "header"};
+    std::printf("%d", count_words(words));
+    return 0;
+}
@@ -0,0 +1,12 @@
+#ifndef PCH_H
+#define PCH_H
+
+#include <string>
+#include <vector>
+
+inline int count_words(const std::vector<std::string>& words)
+{
+    return static_cast<int>(words.size());
+}
+
+#endif /* PCH_H */
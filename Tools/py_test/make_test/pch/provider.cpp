@@ -0,0 +1,6 @@
+#include "pch.h"
+
+int count_default_words(void)
+{
+    return count_words({"provider"});
+}
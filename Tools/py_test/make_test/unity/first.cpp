@@ -0,0 +1,9 @@
+static int value(void)
+{
+    return 1;
+}
+
+int first(void)
+{
+    return value();
+}
@@ -0,0 +1,10 @@
+#include <cstdio>
+
+extern int first(void);
+extern int second(void);
+
+int main(void)
+{
+    std::printf("%d", first() + second());
+    return 0;
+}
@@ -0,0 +1,9 @@
+static int twice(int number)
+{
+    return number * 2;
+}
+
+int second(void)
+{
+    return twice(2);
+}
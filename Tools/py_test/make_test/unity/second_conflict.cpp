@@ -0,0 +1,10 @@
+/* 'value' is also defined in first.cpp. So, they can't be compiled together. */
+static int value(void)
+{
+    return 2;
+}
+
+int second(void)
+{
+    return value();
+}
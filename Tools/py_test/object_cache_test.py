@@ -0,0 +1,102 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+from py_module.object_cache import ObjectCache, CacheStatistics, get_shared_object_cache
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        self.obj1 = os.path.join(self.temp_dir.name, 'obj1.o')
+        self.obj2 = os.path.join(self.temp_dir.name, 'obj2.o')
+        with open(self.obj1, 'wb') as out_file:
+            out_file.write(b'\x7fELF' + b'\x00' * 100)
+        self.object_cache = ObjectCache(self.cache_dir, 1024 * 1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_miss(self):
+        key = self.object_cache.compute_key('gcc', '-O2', b'int x;', 'b.c', self.obj1)
+        self.assertFalse(self.object_cache.fetch(key, self.obj2))
+        self.assertEqual(self.object_cache.get_statistics(), CacheStatistics(misses = 1))
+
+    def test_basic_001_store_and_fetch(self):
+        key = self.object_cache.compute_key('gcc', '-O2', b'int x;', 'b.c', self.obj1)
+        self.object_cache.store(key, self.obj1)
+        self.assertTrue(self.object_cache.fetch(key, self.obj2))
+        with open(self.obj2, 'rb') as in_file:
+            self.assertEqual(in_file.read(), b'\x7fELF' + b'\x00' * 100)
+        self.assertEqual(self.object_cache.get_statistics(), CacheStatistics(hits = 1))
+
+    def test_basic_002_key(self):
+        key = self.object_cache.compute_key('gcc', '-O2', b'# 1 "a/../b.c"\nint x;', 'b.c',
+                                            self.obj1)
+        self.assertEqual(key, self.object_cache.compute_key('gcc', '-O2',
+                                                            b'# 1 "b.c"\nint x;', 'b.c',
+                                                            self.obj2))
+        self.assertNotEqual(key, self.object_cache.compute_key('gcc', '-O0',
+                                                               b'# 1 "b.c"\nint x;', 'b.c',
+                                                               self.obj1))
+        self.assertNotEqual(key, self.object_cache.compute_key('gcc', '-O2',
+                                                               b'# 1 "b.c"\nint y;', 'b.c',
+                                                               self.obj1))
+
+    def test_basic_003_coverage_key_depends_on_object_path(self):
+        key1 = self.object_cache.compute_key('gcc', '-fprofile-arcs', b'int x;', 'b.c',
+                                             self.obj1)
+        key2 = self.object_cache.compute_key('gcc', '-fprofile-arcs', b'int x;', 'b.c',
+                                             self.obj2)
+        self.assertNotEqual(key1, key2)
+
+    def test_basic_004_eviction(self):
+        object_cache = ObjectCache(self.cache_dir, 150)
+        key1 = object_cache.compute_key('gcc', '-O2', b'int x;', 'b.c', self.obj1)
+        key2 = object_cache.compute_key('gcc', '-O2', b'int y;', 'b.c', self.obj1)
+        object_cache.store(key1, self.obj1)
+        object_cache.store(key2, self.obj1)
+        self.assertEqual(object_cache.get_statistics().evictions, 1)
+        self.assertFalse(object_cache.fetch(key1, self.obj2))
+        self.assertTrue(object_cache.fetch(key2, self.obj2))
+
+    def test_basic_005_save_statistics(self):
+        key = self.object_cache.compute_key('gcc', '-O2', b'int x;', 'b.c', self.obj1)
+        self.object_cache.fetch(key, self.obj2)
+        self.object_cache.save_statistics()
+        self.object_cache.save_statistics()
+        other_cache = ObjectCache(self.cache_dir, 1024 * 1024)
+        self.assertEqual(other_cache.get_total_statistics(), CacheStatistics(misses = 1))
+        # Only the statistics file is left. i.e. No temporary file
+        self.assertEqual(os.listdir(self.cache_dir), ['stats.json'])
+
+    def test_basic_006_shared(self):
+        shared_cache = get_shared_object_cache(self.cache_dir, 1024 * 1024)
+        # The same directory given by another path
+        self.assertIs(get_shared_object_cache(f'{self.cache_dir}/../cache', 1024 * 1024),
+                      shared_cache)
+        self.assertIsNot(get_shared_object_cache(self.temp_dir.name, 1024 * 1024), shared_cache)
+
+    def test_basic_007_debug_key_depends_on_source_path(self):
+        key = self.object_cache.compute_key('gcc', '-g -O0', b'int x;', 'b.c', self.obj1)
+        self.assertNotEqual(key, self.object_cache.compute_key('gcc', '-g -O0', b'int x;',
+                                                               'a/../b.c', self.obj1))
+        with mock.patch('os.getcwd', return_value = self.temp_dir.name):
+            self.assertNotEqual(key, self.object_cache.compute_key('gcc', '-g -O0', b'int x;',
+                                                                   'b.c', self.obj1))
+        # The source path does not matter without the debug information.
+        self.assertEqual(self.object_cache.compute_key('gcc', '-g0', b'int x;', 'b.c', self.obj1),
+                         self.object_cache.compute_key('gcc', '-g0', b'int x;', 'a/../b.c',
+                                                       self.obj1))
+
+    def test_basic_008_evicted_while_fetched(self):
+        key = self.object_cache.compute_key('gcc', '-O2', b'int x;', 'b.c', self.obj1)
+        self.object_cache.store(key, self.obj1)
+        # The entry is removed by another thread while it is copied.
+        with mock.patch('shutil.copyfile', side_effect = FileNotFoundError):
+            self.assertFalse(self.object_cache.fetch(key, self.obj2))
+        self.assertEqual(self.object_cache.get_statistics(), CacheStatistics(misses = 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from py_module.process_runner import run_command
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # A path including spaces, which the shell would split
+        self.source_dir = os.path.join(self.temp_dir.name, 'dir with "spaces"')
+        os.mkdir(self.source_dir)
+        self.source = os.path.join(self.source_dir, 'a b.c')
+        self.obj = os.path.join(self.source_dir, 'a b.o')
+        with open(self.source, 'w', encoding='utf-8') as out_file:
+            out_file.write('int x;\n')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_output(self):
+        result = run_command([sys.executable, '-c', 'import sys; print(sys.argv[1])',
+                              'arg with space'])
+        self.assertEqual(result.return_code, 0)
+        self.assertEqual(result.output.decode().strip(), 'arg with space')
+
+    def test_basic_001_error(self):
+        result = run_command([sys.executable, '-c', 'import sys; sys.exit(3)'])
+        self.assertEqual(result.return_code, 3)
+
+    def test_basic_002_command_not_found(self):
+        result = run_command([os.path.join(self.temp_dir.name, 'not_existing_compiler')])
+        self.assertNotEqual(result.return_code, 0)
+        self.assertIn('not_existing_compiler', result.output.decode())
+
+    @unittest.skipIf(shutil.which('gcc') is None, 'gcc is not available')
+    def test_basic_003_response_file(self):
+        result = run_command(['gcc', '-c', self.source, '-o', self.obj],
+                             use_response_file = True)
+        self.assertEqual(result.return_code, 0, result.output.decode())
+        self.assertTrue(os.path.exists(self.obj))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import os
+import tempfile
+from py_module.junit_report import CaseResult, CaseStatus
+from py_module.result_history import ResultHistory, TimingRegression
+
+def create_results(led_on_duration:float):
+    return [CaseResult('LedDriver', 'LedOff', 0.1, CaseStatus.FAILED),
+            CaseResult('LedDriver', 'LedOn', led_on_duration, CaseStatus.PASSED),
+            CaseResult('LedDriver', 'Ignored', 0.0, CaseStatus.SKIPPED)]
+
+class BasicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = ResultHistory(os.path.join(self.temp_dir.name,
+                                                  ResultHistory.DATABASE_FILE_NAME))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_basic_000_empty(self):
+        self.assertEqual(self.history.get_case_durations('LedDriver'), {})
+        self.assertIsNone(self.history.get_module_duration('LedDriver'))
+        self.assertEqual(self.history.find_regressions('LedDriver'), [])
+        self.assertEqual(self.history.get_latest_summaries(), [])
+
+    def test_basic_001_durations(self):
+        self.history.record_run('LedDriver', create_results(0.2))
+        self.history.record_run('LedDriver', create_results(0.4))
+        durations = self.history.get_case_durations('LedDriver')
+        self.assertAlmostEqual(durations['LedDriver.LedOn'], 0.3)
+        self.assertNotIn('LedDriver.Ignored', durations)
+        self.assertAlmostEqual(self.history.get_module_duration('LedDriver'), 0.5)
+
+    def test_basic_002_regressions(self):
+        self.history.record_run('LedDriver', create_results(0.2))
+        self.history.record_run('LedDriver', create_results(0.2))
+        self.history.record_run('LedDriver', create_results(0.5))
+        self.assertEqual(self.history.find_regressions('LedDriver'),
+                         [TimingRegression('LedDriver.LedOn', 0.2, 0.5)])
+
+    def test_basic_003_latest_summaries(self):
+        self.history.record_run('Timer', create_results(0.2), started = 100.0)
+        self.history.record_run('LedDriver', create_results(0.2), started = 100.0)
+        self.history.record_run('LedDriver', create_results(0.3), started = 200.0)
+        summaries = self.history.get_latest_summaries()
+        self.assertEqual([summary.module for summary in summaries], ['LedDriver', 'Timer'])
+        self.assertEqual(summaries[0].started, 200.0)
+        self.assertEqual((summaries[0].tests, summaries[0].failures, summaries[0].skipped),
+                         (3, 1, 1))
+        self.assertAlmostEqual(summaries[0].duration, 0.4)
+
+if __name__ == '__main__':
+    unittest.main()
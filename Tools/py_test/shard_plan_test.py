@@ -0,0 +1,40 @@
+import unittest
+from py_module.shard_plan import parse_test_list, plan_shards, Shard
+
+class BasicTest(unittest.TestCase):
+
+    def test_basic_000_parse_test_list(self):
+        tests = parse_test_list('LedDriver.LedOff LedDriver.LedOn\nTimer.Start\n')
+        self.assertEqual(tests, [('LedDriver', 'LedOff'), ('LedDriver', 'LedOn'),
+                                 ('Timer', 'Start')])
+
+    def test_basic_001_no_split(self):
+        shards = plan_shards(parse_test_list('A.a A.b B.c'), 1)
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(shards[0].get_arguments(), [])
+
+    def test_basic_002_pack_groups(self):
+        shards = plan_shards(parse_test_list('A.a A.b B.c B.d C.e'), 2)
+        self.assertEqual(sorted(shard.get_arguments() for shard in shards),
+                         [['-sg', 'A', '-sg', 'C'], ['-sg', 'B']])
+
+    def test_basic_003_split_group(self):
+        shards = plan_shards(parse_test_list('A.a A.b A.c A.d'), 2)
+        self.assertEqual(len(shards), 2)
+        for shard in shards:
+            self.assertEqual(shard.groups, ['A'])
+            self.assertEqual(len(shard.names), 2)
+        self.assertEqual(sorted(shards[0].names + shards[1].names), ['a', 'b', 'c', 'd'])
+
+    def test_basic_004_durations(self):
+        shards = plan_shards(parse_test_list('A.a A.b A.c A.d'), 2, {'A.a': 3.0})
+        self.assertIn(Shard(groups = ['A'], names = ['a'], weight = 3.0), shards)
+
+    def test_basic_005_shard_count_is_not_exceeded(self):
+        shards = plan_shards(parse_test_list('A.a A.b B.c B.d C.e'), 4)
+        self.assertLessEqual(len(shards), 4)
+        self.assertEqual(sorted(name for shard in shards for name in shard.names),
+                         ['c', 'd'])
+
+if __name__ == '__main__':
+    unittest.main()
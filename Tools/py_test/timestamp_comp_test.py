@@ -1,5 +1,9 @@
 import unittest
-from py_module.timestamp_comp import TimestampComp, CompResult
+import os
+import tempfile
+import threading
+from unittest import mock
+from py_module.timestamp_comp import TimestampComp, TimestampCache, CompResult
 
 class BasicTest(unittest.TestCase):
 
@@ -23,3 +27,105 @@ class BasicTest(unittest.TestCase):
     def test_basic_003_file2_is_the_oldest(self):
         file_list = [self.__EXT_FILE1, self.__EXT_FILE2]
         self.assertTrue(TimestampComp.is_the_file_oldest(self.__EXT_FILE2, file_list))
+
+class CollectTest(unittest.TestCase):
+
+    def setUp(self):
+        TimestampComp.clear_time_stamp_dict()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_list = [os.path.join(self.temp_dir.name, f'file{index}.h') for index in range(3)]
+        for index, file in enumerate(self.file_list):
+            with open(file, 'w', encoding='utf-8'):
+                pass
+            # 1 ns apart, which a float of seconds can not tell
+            os.utime(file, ns = (1_700_000_000_000_000_000 + index,) * 2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        TimestampComp.clear_time_stamp_dict()
+
+    def test_collect_000_nanoseconds(self):
+        not_existing = os.path.join(self.temp_dir.name, 'none.h')
+        time_stamp_dict = TimestampComp.collect_timestamps(self.file_list + [not_existing])
+        self.assertEqual([time_stamp_dict[file] for file in self.file_list],
+                         [1_700_000_000_000_000_000 + index for index in range(3)])
+        self.assertIsNone(time_stamp_dict[not_existing])
+
+    def test_collect_001_compare(self):
+        self.assertTrue(TimestampComp.is_the_file_latest(self.file_list[2], self.file_list))
+        self.assertFalse(TimestampComp.is_the_file_latest(self.file_list[1], self.file_list))
+        self.assertEqual(TimestampComp.compare_timestamps(self.file_list[0], self.file_list[1]),
+                         CompResult.FILE2_IS_NEWER)
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.temp_dir.name, 'main.o')
+        with open(self.file, 'w', encoding='utf-8'):
+            pass
+        os.utime(self.file, ns = (1_000_000_000, 1_000_000_000))
+        self.timestamp_cache = TimestampCache()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache_000_statistics(self):
+        self.timestamp_cache.collect_timestamps([self.file])
+        self.timestamp_cache.collect_timestamps([self.file, self.file])
+        statistics = self.timestamp_cache.get_statistics()
+        self.assertEqual((statistics.hits, statistics.misses), (1, 1))
+
+    def test_cache_001_invalidate(self):
+        self.timestamp_cache.collect_timestamps([self.file])
+        os.utime(self.file, ns = (2_000_000_000, 2_000_000_000))
+        self.assertEqual(self.timestamp_cache.collect_timestamps([self.file])[self.file],
+                         1_000_000_000)
+        self.timestamp_cache.invalidate([self.file])
+        self.assertEqual(self.timestamp_cache.collect_timestamps([self.file])[self.file],
+                         2_000_000_000)
+        self.assertEqual(self.timestamp_cache.get_statistics().invalidations, 1)
+
+    def test_cache_002_not_shared_with_the_default(self):
+        self.timestamp_cache.collect_timestamps([self.file])
+        TimestampComp.clear_time_stamp_dict()
+        self.assertEqual(self.timestamp_cache.get_statistics().misses, 1)
+        self.timestamp_cache.collect_timestamps([self.file])
+        self.assertEqual(self.timestamp_cache.get_statistics().hits, 1)
+
+    def test_cache_003_threads(self):
+        def collect():
+            for _ in range(100):
+                self.timestamp_cache.collect_timestamps([self.file])
+                self.timestamp_cache.invalidate([self.file])
+        threads = [threading.Thread(target = collect) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        statistics = self.timestamp_cache.get_statistics()
+        self.assertEqual(statistics.hits + statistics.misses, 400)
+
+    def test_cache_004_invalidated_while_read(self):
+        other_file = os.path.join(self.temp_dir.name, 'other.o')
+        original_stat = os.stat
+        def stat_while_invalidated(invalidated_file):
+            def stat(path, *args, **kwargs):
+                # Another thread writes the file while the time stamp is read.
+                self.timestamp_cache.invalidate([invalidated_file])
+                return original_stat(path, *args, **kwargs)
+            return mock.patch('os.stat', side_effect = stat)
+
+        # The time stamp is saved, since another file has been invalidated.
+        with stat_while_invalidated(other_file):
+            self.timestamp_cache.collect_timestamps([self.file])
+        self.timestamp_cache.collect_timestamps([self.file])
+        self.assertEqual(self.timestamp_cache.get_statistics().hits, 1)
+
+        # The time stamp is not saved, since the file itself has been invalidated.
+        self.timestamp_cache.invalidate([self.file])
+        with stat_while_invalidated(self.file):
+            self.timestamp_cache.collect_timestamps([self.file])
+        self.timestamp_cache.collect_timestamps([self.file])
+        statistics = self.timestamp_cache.get_statistics()
+        self.assertEqual((statistics.hits, statistics.misses), (1, 3))